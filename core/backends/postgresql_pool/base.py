@@ -0,0 +1,180 @@
+"""
+Django's PostgreSQL backend with an in-process connection pool.
+
+CONN_MAX_AGE keeps one connection per thread open between requests, which
+does nothing for threads that come and go (the ASGI thread pool, sync views
+run by uvicorn workers) and holds a connection for every idle thread. Here
+closing a connection hands it back to a per-process pool instead, and
+opening one takes an idle connection from it, so a request pays for a
+TCP/TLS/auth handshake only when the pool has to grow. Use it with
+CONN_MAX_AGE=0 so connections go back to the pool after every request.
+
+POOL settings: at most MAX_SIZE connections are open at once, up to MAX_IDLE
+of them are kept for reuse, and a caller waits up to TIMEOUT seconds for one
+to come free before getting an OperationalError. Connections older than
+MAX_LIFETIME seconds are closed instead of reused, so none outlives a
+failover or a server-side idle timeout for long. With CONN_HEALTH_CHECKS an
+idle connection is also pinged before it's handed out; one that fails is
+closed and the next (or a new one) is tried.
+"""
+
+import os
+import threading
+import time
+
+from django.db.backends.postgresql import base, creation
+from psycopg2 import extensions
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """Idle psycopg2 connections plus a cap on how many are checked out."""
+
+    def __init__(self, max_size, max_idle, max_lifetime=None, health_checks=False):
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.health_checks = health_checks
+        self.isolation_level = None
+        self._idle = []
+        self._opened = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    def checkout(self, connect, timeout):
+        """An idle connection, or a new one from ``connect()``; None if the pool stays full."""
+        if not self._slots.acquire(timeout=timeout):
+            return None
+        try:
+            while True:
+                with self._lock:
+                    connection = self._idle.pop() if self._idle else None
+                if connection is None:
+                    connection = connect()
+                    with self._lock:
+                        self._opened[connection] = time.monotonic()
+                    return connection
+                if self.usable(connection):
+                    return connection
+                # Dropped while idle (server restart, idle timeout) or too old;
+                # try the next
+                self._discard(connection)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def checkin(self, connection, discard=False):
+        try:
+            if not discard and not connection.closed:
+                status = connection.info.transaction_status
+                if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                    discard = True
+                elif status != extensions.TRANSACTION_STATUS_IDLE:
+                    try:
+                        connection.rollback()
+                    except Exception:
+                        discard = True
+            with self._lock:
+                if not discard and not self._expired(connection) and len(self._idle) < self.max_idle:
+                    self._idle.append(connection)
+                    return
+            self._discard(connection)
+        finally:
+            self._slots.release()
+
+    def usable(self, connection):
+        if connection.closed or self._expired(connection):
+            return False
+        if not self.health_checks:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if connection.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                # Not in autocommit mode; don't leave the ping's transaction open
+                connection.rollback()
+        except Exception:
+            return False
+        return True
+
+    def _expired(self, connection):
+        if connection.closed:
+            return True
+        if self.max_lifetime is None:
+            return False
+        opened = self._opened.get(connection)
+        return opened is None or time.monotonic() - opened > self.max_lifetime
+
+    def _discard(self, connection):
+        with self._lock:
+            self._opened.pop(connection, None)
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._discard(connection)
+
+
+def close_pools(name):
+    """Close this process's idle connections to database ``name``."""
+    with _pools_lock:
+        keys = [key for key in _pools if key[0] == os.getpid() and key[2] == name]
+        closing = [_pools.pop(key) for key in keys]
+    for connection_pool in closing:
+        connection_pool.close()
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # DROP DATABASE fails while pooled connections are still open
+        close_pools(test_database_name)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def get_pool(self):
+        # Per process (gunicorn forks workers) and per database (the test
+        # runner switches NAME to the test database).
+        key = (os.getpid(), self.alias, self.settings_dict['NAME'])
+        with _pools_lock:
+            connection_pool = _pools.get(key)
+            if connection_pool is None:
+                options = self.settings_dict.get('POOL') or {}
+                connection_pool = _pools[key] = ConnectionPool(
+                    options.get('MAX_SIZE', 20), options.get('MAX_IDLE', 5),
+                    max_lifetime=options.get('MAX_LIFETIME'),
+                    health_checks=self.settings_dict.get('CONN_HEALTH_CHECKS', False),
+                )
+        return connection_pool
+
+    def get_new_connection(self, conn_params):
+        connection_pool = self.get_pool()
+
+        def connect():
+            connection = super(DatabaseWrapper, self).get_new_connection(conn_params)
+            connection_pool.isolation_level = self.isolation_level
+            return connection
+
+        timeout = (self.settings_dict.get('POOL') or {}).get('TIMEOUT', 30)
+        connection = connection_pool.checkout(connect, timeout)
+        if connection is None:
+            raise self.Database.OperationalError(
+                'No database connection came free in %s seconds (pool is full)' % timeout
+            )
+        # The parent sets this when it connects; a reused connection skips that
+        self.isolation_level = connection_pool.isolation_level
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                # After an error the connection may be in any state; don't reuse it
+                self.get_pool().checkin(self.connection, discard=self.errors_occurred)
@@ -0,0 +1,35 @@
+"""
+Django's SQLite backend, tuned for several gunicorn workers writing at once.
+
+Every new connection runs the PRAGMAS from its settings (synchronous=NORMAL,
+which is safe under WAL, and a busy_timeout so a writer waits for the lock
+instead of failing with "database is locked"). The WAL journal, so readers
+never block the writer, is stored in the database file and switched on once
+by a migration (jobs 0018) rather than on every connect, which would rewrite
+the file's header.
+
+With TRANSACTION_MODE='IMMEDIATE', atomic blocks start with BEGIN IMMEDIATE
+and take the write lock up front. A deferred transaction that has already
+read can't wait for the lock when it later writes and another writer got
+there first: SQLite fails it at once, busy_timeout or not.
+"""
+
+from django.db.backends.sqlite3 import base
+
+DEFAULT_PRAGMAS = {
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        pragmas = self.settings_dict.get('PRAGMAS') or DEFAULT_PRAGMAS
+        for name, value in pragmas.items():
+            connection.execute('PRAGMA %s = %s' % (name, value))
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict.get('TRANSACTION_MODE') or ''
+        self.cursor().execute(('BEGIN %s' % mode).strip())
@@ -0,0 +1,296 @@
+"""
+Per-route request metrics.
+
+RequestMetricsMiddleware times every request and, per resolved URL name,
+records wall time, number of DB queries, total DB time, template render time
+and SQL statements executed more than once in the same request (the usual
+sign of an N+1). Everything is kept in process in fixed-bucket histograms, so
+recording is a handful of integer increments and safe to leave on in
+production.
+
+Each gunicorn worker keeps its own numbers; scrape every worker (or sum the
+Prometheus output) for a site-wide view.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Upper bounds, in milliseconds for times and plain counts for queries.
+TIME_BUCKETS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf'))
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, float('inf'))
+
+# Distinct duplicated statements remembered per route
+MAX_FINGERPRINTS = 50
+
+
+class RollingHistogram:
+    """
+    Bucketed histogram over a sliding time window (for percentiles) plus
+    lifetime totals (for Prometheus, which wants monotonic counters).
+    """
+
+    def __init__(self, buckets, window, slots=10):
+        self.buckets = buckets
+        self.slot_seconds = window / slots
+        self.slots = [[None, [0] * len(buckets)] for _ in range(slots)]
+        self.total_counts = [0] * len(buckets)
+        self.total_sum = 0.0
+
+    def observe(self, value, now):
+        index = bisect_left(self.buckets, value)
+        epoch = int(now // self.slot_seconds)
+        slot = self.slots[epoch % len(self.slots)]
+        if slot[0] != epoch:
+            slot[0] = epoch
+            slot[1] = [0] * len(self.buckets)
+        slot[1][index] += 1
+        self.total_counts[index] += 1
+        self.total_sum += value
+
+    def window_counts(self, now):
+        epoch = int(now // self.slot_seconds)
+        oldest = epoch - len(self.slots) + 1
+        counts = [0] * len(self.buckets)
+        for slot_epoch, slot_counts in self.slots:
+            if slot_epoch is not None and slot_epoch >= oldest:
+                for i, n in enumerate(slot_counts):
+                    counts[i] += n
+        return counts
+
+    def percentile(self, pct, now):
+        """Upper bound of the bucket holding the pct-th value in the window."""
+        counts = self.window_counts(now)
+        total = sum(counts)
+        if not total:
+            return None
+        rank = pct / 100 * total
+        seen = 0
+        for bound, n in zip(self.buckets, counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return self.buckets[-1]
+
+
+class RouteStats:
+    def __init__(self, window):
+        self.wall_ms = RollingHistogram(TIME_BUCKETS, window)
+        self.db_ms = RollingHistogram(TIME_BUCKETS, window)
+        self.render_ms = RollingHistogram(TIME_BUCKETS, window)
+        self.queries = RollingHistogram(COUNT_BUCKETS, window)
+        self.duplicates = Counter()
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+
+    def record(self, route, wall_ms, queries, db_ms, render_ms, duplicates):
+        now = time.time()
+        with self.lock:
+            stats = self.routes.get(route)
+            if stats is None:
+                stats = self.routes[route] = RouteStats(settings.METRICS_WINDOW_SECONDS)
+            stats.wall_ms.observe(wall_ms, now)
+            stats.db_ms.observe(db_ms, now)
+            stats.queries.observe(queries, now)
+            if render_ms is not None:
+                stats.render_ms.observe(render_ms, now)
+            if duplicates:
+                stats.duplicates.update(duplicates)
+                if len(stats.duplicates) > MAX_FINGERPRINTS:
+                    stats.duplicates = Counter(dict(stats.duplicates.most_common(MAX_FINGERPRINTS)))
+
+    def reset(self):
+        with self.lock:
+            self.routes = {}
+
+    def report(self):
+        """Windowed percentiles per route, slowest p99 first."""
+        now = time.time()
+        rows = []
+        with self.lock:
+            for route, stats in self.routes.items():
+                rows.append({
+                    'route': route,
+                    'requests': sum(stats.wall_ms.window_counts(now)),
+                    'wall_ms': {p: stats.wall_ms.percentile(p, now) for p in (50, 95, 99)},
+                    'db_ms': {p: stats.db_ms.percentile(p, now) for p in (50, 95, 99)},
+                    'render_ms': {p: stats.render_ms.percentile(p, now) for p in (50, 95, 99)},
+                    'queries': {p: stats.queries.percentile(p, now) for p in (50, 95, 99)},
+                    'duplicated_sql': [
+                        {'sql': sql, 'extra_executions': n}
+                        for sql, n in stats.duplicates.most_common(5)
+                    ],
+                })
+        rows.sort(key=lambda row: row['wall_ms'][99] or 0, reverse=True)
+        return rows
+
+    def prometheus(self):
+        """Lifetime histograms in the Prometheus text exposition format."""
+        metrics = (
+            ('wall_ms', 'jobboard_request_duration_ms', 'Request wall time in milliseconds.'),
+            ('db_ms', 'jobboard_request_db_duration_ms', 'Time spent in DB queries per request, ms.'),
+            ('render_ms', 'jobboard_template_render_ms', 'Template render time per request, ms.'),
+            ('queries', 'jobboard_request_db_queries', 'DB queries per request.'),
+        )
+        lines = []
+        with self.lock:
+            for attr, name, help_text in metrics:
+                lines.append('# HELP %s %s' % (name, help_text))
+                lines.append('# TYPE %s histogram' % name)
+                for route, stats in sorted(self.routes.items(), key=lambda item: str(item[0])):
+                    histogram = getattr(stats, attr)
+                    label = 'route="%s"' % route
+                    cumulative = 0
+                    for bound, n in zip(histogram.buckets, histogram.total_counts):
+                        cumulative += n
+                        le = '+Inf' if bound == float('inf') else ('%g' % bound)
+                        lines.append('%s_bucket{%s,le="%s"} %d' % (name, label, le, cumulative))
+                    lines.append('%s_sum{%s} %g' % (name, label, histogram.total_sum))
+                    lines.append('%s_count{%s} %d' % (name, label, cumulative))
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+class QueryRecorder:
+    """execute_wrapper that counts and times queries and spots repeats."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+            # Parameters are kept out of the SQL text, so the statement itself
+            # is the fingerprint.
+            self.statements[sql] += 1
+
+    def duplicates(self):
+        return {sql: n - 1 for sql, n in self.statements.items() if n > 1}
+
+
+# The QueryRecorders of the request being served (outermost first)
+_recorders = ContextVar('metrics_query_recorders', default=())
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    execute_wrapper installed on every connection that feeds the active
+    recorders. Connections are per thread, and an ASGI request's queries run
+    in sync_to_async threads, but those threads get a copy of the request's
+    context, so the ContextVar reaches them where a per-request
+    execute_wrapper on the event loop's connections would not.
+    """
+    for recorder in reversed(_recorders.get()):
+        execute = partial(recorder, execute)
+    return execute(sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_wrapper(sender, connection, **kwargs):
+    # First in the list, so execute_wrapper() blocks, which pop the last
+    # wrapper, never remove it.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+@contextmanager
+def recording(recorder):
+    """Feed every query on every database inside the block to ``recorder``."""
+    # Connections opened before this module was loaded
+    for connection in connections.all(initialized_only=True):
+        install_query_wrapper(None, connection)
+    token = _recorders.set(_recorders.get() + (recorder,))
+    try:
+        yield
+    finally:
+        _recorders.reset(token)
+
+
+@contextmanager
+def render_timer(request):
+    """Report a template render done inside the view as the request's render time."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        request._metrics_render_ms = (time.perf_counter() - started) * 1000
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        request._metrics_render_ms = None
+        started = time.perf_counter()
+        with recording(recorder):
+            response = self.get_response(request)
+        self.record(request, recorder, started)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+
+        recorder = QueryRecorder()
+        request._metrics_render_ms = None
+        started = time.perf_counter()
+        with recording(recorder):
+            response = await self.get_response(request)
+        self.record(request, recorder, started)
+        return response
+
+    def record(self, request, recorder, started):
+        wall_ms = (time.perf_counter() - started) * 1000
+        match = getattr(request, 'resolver_match', None)
+        route = (match.view_name if match else None) or 'unresolved'
+        registry.record(
+            route, wall_ms, recorder.count, recorder.seconds * 1000,
+            request._metrics_render_ms, recorder.duplicates(),
+        )
+
+    def process_template_response(self, request, response):
+        # Responses the view already rendered (the page cache renders to
+        # store the page) were timed with render_timer() instead.
+        if settings.METRICS_ENABLED and not response.is_rendered:
+            render_started = time.perf_counter()
+
+            def rendered(response):
+                request._metrics_render_ms = (time.perf_counter() - render_started) * 1000
+
+            response.add_post_render_callback(rendered)
+        return response
@@ -0,0 +1,129 @@
+"""
+Primary/replica database routing.
+
+DATABASE_REPLICA_URLS (see settings) adds read replicas, whose aliases are
+listed in DATABASE_REPLICAS. Writes always go to the primary ('default').
+Reads go to a random replica only while ReplicaRoutingMiddleware is
+serving a read-only (GET/HEAD/OPTIONS) request: the job list, detail,
+search, homepage and dashboards. Everything else reads from the primary:
+form posts, the task worker, management commands and migrations. They read
+and then write, so they must not see a lagging copy.
+
+Read-your-writes: a request that writes sets a cookie for
+DATABASE_PIN_SECONDS. While a browser has it, its requests read from the
+primary too. A seeker redirected to their dashboard after applying
+therefore sees the new application even if the replicas haven't caught up.
+
+Reads whose results outlive the request (page and stats cache fills, the
+recommendation index) run inside primary_reads(): a replica's lagging copy
+would otherwise be stored and served long after the replica caught up.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+PIN_COOKIE = 'db_pin'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# The RoutingState of the request being served, if any
+_state = ContextVar('db_routing_state', default=None)
+
+
+class RoutingState:
+    def __init__(self, replica_reads):
+        self.replica_reads = replica_reads
+        self.wrote = False
+
+
+@contextmanager
+def primary_reads():
+    """Send the current request's reads to the primary inside the block."""
+    state = _state.get()
+    if state is None or not state.replica_reads:
+        yield
+        return
+    state.replica_reads = False
+    try:
+        yield
+    finally:
+        state.replica_reads = True
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is not None and state.replica_reads and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every alias holds the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema from the primary
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        state = self.routing_state(request)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.pin(request, state, response)
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        # Views' sync_to_async threads copy this context, so they see the state
+        state = self.routing_state(request)
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.pin(request, state, response)
+
+    def routing_state(self, request):
+        return RoutingState(
+            replica_reads=request.method in SAFE_METHODS and PIN_COOKIE not in request.COOKIES,
+        )
+
+    def pin(self, request, state, response):
+        # Only form posts pin: a GET that happens to write (a queued task,
+        # a session refresh) shouldn't put cookies on cacheable pages.
+        if state.wrote and request.method not in SAFE_METHODS:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.DATABASE_PIN_SECONDS, httponly=True, samesite='Lax',
+            )
+        return response
@@ -50,13 +50,19 @@ INSTALLED_APPS = [
     # Other custom apps
     'jobs.apps.JobsConfig',
     'applications.apps.ApplicationsConfig',
+    'tasks.apps.TasksConfig',
 ]
 
     
 
 MIDDLEWARE = [
+    # First, so its timings and query counts cover the whole stack
+    'core.metrics.RequestMetricsMiddleware',
+    # Before anything that reads the database (sessions, auth)
+    'core.routers.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    # WhiteNoise with an async path, so ASGI requests stay async (see core/staticfiles.py)
+    'core.staticfiles.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -85,17 +91,185 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'core.wsgi.application'
 
+# 'wsgi' (sync gunicorn workers) or 'asgi' (uvicorn workers); see gunicorn.conf.py.
+# ASGI mode also switches the read-heavy views to their async versions.
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi')
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', '1' if SERVER_MODE == 'asgi' else '0') == '1'
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
+#
+# DATABASE_URL (see core/db.py) defaults to the SQLite file next to
+# manage.py. Connections stay open for CONN_MAX_AGE seconds and are
+# health-checked before reuse, so a request doesn't pay for connecting.
+# For Postgres, DATABASE_POOL=1 shares connections through an in-process
+# pool instead (core/backends/postgresql_pool), which also covers the ASGI
+# thread pool; connections then go back to the pool after each request.
+# SQLite databases are switched to WAL mode by a migration; connections get
+# DATABASE_BUSY_TIMEOUT (ms) and synchronous=NORMAL, and atomic blocks take
+# the write lock up front.
+#
+# DATABASE_REPLICA_URLS (comma-separated, same format) adds read replicas as
+# replica1, replica2, ...; core/routers.py sends the reads of GET requests to
+# them and everything else to 'default'. After a request that writes, that
+# browser reads from the primary for DATABASE_PIN_SECONDS, which should cover
+# the replicas' lag. A second SQLite file can stand in for a replica locally;
+# `manage.py sync_replicas` copies the primary into it.
+
+from core.db import POSTGRES_POOL_ENGINE, SQLITE_ENGINE, parse_database_url
 
 DATABASES = {
+    'default': parse_database_url(os.environ.get('DATABASE_URL', 'sqlite:///db.sqlite3'), BASE_DIR),
+}
+DATABASE_REPLICAS = []
+for number, url in enumerate(filter(None, os.environ.get('DATABASE_REPLICA_URLS', '').split(',')), 1):
+    DATABASES['replica%d' % number] = parse_database_url(url.strip(), BASE_DIR)
+    # Tests read the test database through the replica aliases
+    DATABASES['replica%d' % number]['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICAS.append('replica%d' % number)
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+DATABASE_PIN_SECONDS = int(os.environ.get('DATABASE_PIN_SECONDS', 5))
+
+for database in DATABASES.values():
+    database.update(
+        # Async views run on a pool of short-lived threads; don't keep one
+        # connection per thread there
+        CONN_MAX_AGE=int(os.environ.get('CONN_MAX_AGE', 0 if SERVER_MODE == 'asgi' else 600)),
+        CONN_HEALTH_CHECKS=os.environ.get('CONN_HEALTH_CHECKS', '1') == '1',
+    )
+    if database['ENGINE'] == SQLITE_ENGINE:
+        database.update(
+            PRAGMAS={
+                'synchronous': 'NORMAL',
+                'busy_timeout': int(os.environ.get('DATABASE_BUSY_TIMEOUT', 5000)),
+            },
+            TRANSACTION_MODE='IMMEDIATE',
+        )
+    elif os.environ.get('DATABASE_POOL', '0') == '1':
+        database.update(
+            ENGINE=POSTGRES_POOL_ENGINE,
+            CONN_MAX_AGE=0,
+            POOL={
+                'MAX_SIZE': int(os.environ.get('DATABASE_POOL_MAX_SIZE', 20)),
+                'MAX_IDLE': int(os.environ.get('DATABASE_POOL_MAX_IDLE', 5)),
+                'TIMEOUT': float(os.environ.get('DATABASE_POOL_TIMEOUT', 30)),
+                'MAX_LIFETIME': float(os.environ.get('DATABASE_POOL_MAX_LIFETIME', 1800)),
+            },
+        )
+if DATABASES['default']['ENGINE'] == SQLITE_ENGINE:
+    # File-backed (not in-memory) so the concurrency tests can open real
+    # parallel connections from threads and processes.
+    DATABASES['default']['TEST'] = {'NAME': BASE_DIR / 'test_db.sqlite3'}
+
+
+# Cache
+# LocMem is per process; point CACHE_BACKEND/CACHE_LOCATION at a file-based or
+# redis cache to share entries (and invalidations) between gunicorn workers
+# and with the task worker. On LocMem, pages its tasks change stay cached
+# until PAGE_CACHE_TTL.
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
     }
 }
 
+# Upper bound on how stale the homepage counters can get (seconds)
+HOMEPAGE_STATS_TTL = int(os.environ.get('HOMEPAGE_STATS_TTL', 600))
+
+# Lifetime of anonymous job list/detail pages (seconds). Edits invalidate
+# them immediately through version keys; this only bounds memory use.
+PAGE_CACHE_TTL = int(os.environ.get('PAGE_CACHE_TTL', 300))
+
+
+# Request metrics (core/metrics.py). Percentiles cover the last
+# METRICS_WINDOW_SECONDS; /metrics/prometheus/ also accepts
+# "Authorization: Bearer <METRICS_TOKEN>" so a scraper needs no staff login.
+
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+METRICS_WINDOW_SECONDS = int(os.environ.get('METRICS_WINDOW_SECONDS', 300))
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+
+# Background tasks (tasks/queue.py), run by `manage.py run_tasks`. Failed
+# tasks are retried after TASKS_BACKOFF_SECONDS * 2**(attempt - 1), capped at
+# TASKS_BACKOFF_MAX_SECONDS. A worker renews its claims while it runs them, so
+# a claim not renewed for TASKS_LOCK_TIMEOUT belongs to a dead worker and the
+# task runs again. Handlers invalidate cached pages, which only reaches the
+# web processes through a shared cache (not LocMem).
+
+TASKS_MAX_ATTEMPTS = int(os.environ.get('TASKS_MAX_ATTEMPTS', 5))
+TASKS_BACKOFF_SECONDS = int(os.environ.get('TASKS_BACKOFF_SECONDS', 10))
+TASKS_BACKOFF_MAX_SECONDS = int(os.environ.get('TASKS_BACKOFF_MAX_SECONDS', 3600))
+TASKS_LOCK_TIMEOUT = int(os.environ.get('TASKS_LOCK_TIMEOUT', 300))
+
+
+# Email (employer notifications are sent by the task worker)
+
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 25))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', '0') == '1'
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'Job Board <noreply@localhost>')
+# Absolute links in emails
+SITE_URL = os.environ.get('SITE_URL', 'http://localhost:8000')
+
+
+# Job recommendations (jobs/recommend.py). Each process re-reads changed job
+# vectors at most every RECOMMEND_REFRESH_SECONDS and rebuilds its matrix
+# once more than RECOMMEND_DELTA_LIMIT jobs changed since the last build.
+
+RECOMMEND_REFRESH_SECONDS = int(os.environ.get('RECOMMEND_REFRESH_SECONDS', 10))
+RECOMMEND_DELTA_LIMIT = int(os.environ.get('RECOMMEND_DELTA_LIMIT', 5000))
+
+
+# Archiving (jobs/archive.py): postings inactive for ARCHIVE_INACTIVE_DAYS or
+# created more than ARCHIVE_MAX_AGE_DAYS ago move to the archive tables,
+# ARCHIVE_BATCH_SIZE per transaction with ARCHIVE_BATCH_PAUSE seconds in
+# between. The scheduled run (`archive_jobs --schedule`) repeats every
+# ARCHIVE_INTERVAL_SECONDS.
+
+ARCHIVE_INACTIVE_DAYS = int(os.environ.get('ARCHIVE_INACTIVE_DAYS', 90))
+ARCHIVE_MAX_AGE_DAYS = int(os.environ.get('ARCHIVE_MAX_AGE_DAYS', 365))
+ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', 500))
+ARCHIVE_BATCH_PAUSE = float(os.environ.get('ARCHIVE_BATCH_PAUSE', 0.05))
+ARCHIVE_INTERVAL_SECONDS = int(os.environ.get('ARCHIVE_INTERVAL_SECONDS', 86400))
+
+
+# Applicant tracking (jobs/tracking.py): bulk status changes are written
+# APPLICATION_STATUS_BATCH_SIZE applications per UPDATE/transaction.
+
+APPLICATION_STATUS_BATCH_SIZE = int(os.environ.get('APPLICATION_STATUS_BATCH_SIZE', 500))
+
+
+# Saved-search alerts (jobs/alerts.py). Each seeker keeps up to
+# SAVED_SEARCH_LIMIT searches. The scheduled digest run (`send_alert_digests
+# --schedule`) repeats every ALERT_DIGEST_INTERVAL_SECONDS, mails
+# ALERT_DIGEST_BATCH_SIZE users per transaction and lists up to
+# ALERT_DIGEST_MAX_JOBS postings per saved search.
+
+SAVED_SEARCH_LIMIT = int(os.environ.get('SAVED_SEARCH_LIMIT', 20))
+ALERT_DIGEST_INTERVAL_SECONDS = int(os.environ.get('ALERT_DIGEST_INTERVAL_SECONDS', 3600))
+ALERT_DIGEST_BATCH_SIZE = int(os.environ.get('ALERT_DIGEST_BATCH_SIZE', 200))
+ALERT_DIGEST_MAX_JOBS = int(os.environ.get('ALERT_DIGEST_MAX_JOBS', 10))
+
+
+# Sessions and authentication. cached_db reads sessions from the cache and
+# only falls back to (and always writes through to) the database;
+# SESSION_ENGINE=django.contrib.sessions.backends.signed_cookies needs no
+# server-side storage at all. CachedModelBackend (users/backends.py) keeps
+# up to AUTH_USER_CACHE_SIZE users per process for AUTH_USER_CACHE_TTL
+# seconds, so a logged-in request normally runs no auth queries.
+
+SESSION_ENGINE = os.environ.get('SESSION_ENGINE', 'django.contrib.sessions.backends.cached_db')
+AUTHENTICATION_BACKENDS = ['users.backends.CachedModelBackend']
+AUTH_USER_CACHE_SIZE = int(os.environ.get('AUTH_USER_CACHE_SIZE', 1000))
+AUTH_USER_CACHE_TTL = int(os.environ.get('AUTH_USER_CACHE_TTL', 60))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -140,6 +314,9 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Ensure this is at the bottom of settings.py
 AUTH_USER_MODEL = 'users.User'
 
+# The users app's login view (django.contrib.auth.urls has no templates here)
+LOGIN_URL = 'login'
+
 # File: settings.py (Add to the bottom)
 
 # Required for WhiteNoise to compress and cache static files
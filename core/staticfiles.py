@@ -0,0 +1,54 @@
+"""
+Static files for both serving modes.
+
+WhiteNoiseMiddleware (6.x) is sync-only. Under ASGI, one sync-only
+middleware makes Django run the whole middleware chain, and every view,
+through sync_to_async. StaticFilesMiddleware keeps WhiteNoise's file index
+and response headers but adds an async path. Requests that aren't for a
+static file pass straight through. Static files are read in a worker
+thread and returned in one piece, which suits the small admin assets this
+site serves.
+"""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.http import HttpResponse
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            # Development only: looks the file up on disk
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is None:
+            return await self.get_response(request)
+        return await sync_to_async(self.serve_content)(static_file, request)
+
+    @staticmethod
+    def serve_content(static_file, request):
+        response = static_file.get_response(request.method, request.META)
+        content = b''
+        if response.file is not None:
+            with response.file:
+                content = response.file.read()
+        http_response = HttpResponse(content, status=int(response.status))
+        del http_response['Content-Type']
+        for key, value in response.headers:
+            http_response[key] = value
+        return http_response
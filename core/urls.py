@@ -1,11 +1,19 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
+from core.views import metrics_prometheus, metrics_report
+from jobs.async_views import AsyncHomepageView
 from jobs.views import HomepageView
 
+if settings.ASYNC_VIEWS:
+    HomepageView = AsyncHomepageView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', HomepageView.as_view(), name='homepage'),
     path('jobs/', include('jobs.urls')),
-    path('users/', include('users.urls')),
     path('accounts/', include('django.contrib.auth.urls')),
+    path('users/', include('users.urls')),
+    path('metrics/', metrics_report, name='metrics_report'),
+    path('metrics/prometheus/', metrics_prometheus, name='metrics_prometheus'),
 ]
@@ -0,0 +1,31 @@
+import hmac
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+from django.views.decorators.http import require_GET
+
+from .metrics import registry
+
+
+@require_GET
+@staff_member_required
+def metrics_report(request):
+    """Per-route p50/p95/p99 over the recent window, slowest first."""
+    return JsonResponse({
+        'window_seconds': settings.METRICS_WINDOW_SECONDS,
+        'routes': registry.report(),
+    })
+
+
+@require_GET
+def metrics_prometheus(request):
+    token = settings.METRICS_TOKEN
+    header = request.headers.get('Authorization', '')
+    authorized = (
+        (token and hmac.compare_digest(header, 'Bearer ' + token))
+        or (request.user.is_active and request.user.is_staff)
+    )
+    if not authorized:
+        return HttpResponseForbidden()
+    return HttpResponse(registry.prometheus(), content_type='text/plain; version=0.0.4')
@@ -0,0 +1,14 @@
+# Gunicorn settings (picked up automatically from the working directory).
+#
+#   SERVER_MODE=wsgi  sync workers running core.wsgi (default)
+#   SERVER_MODE=asgi  uvicorn workers running core.asgi, with async views
+#
+# Worker count and port come from WEB_CONCURRENCY / PORT as usual.
+
+import os
+
+if os.environ.get('SERVER_MODE', 'wsgi') == 'asgi':
+    wsgi_app = 'core.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'core.wsgi:application'
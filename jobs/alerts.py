@@ -0,0 +1,240 @@
+# File: job_board_project_final/jobs/alerts.py
+#
+# Saved-search alerts: seekers save a job list query, new postings are
+# matched against every saved query, and the matches go out in digests.
+#
+# Matching runs the other way round from a search (a "percolator"): instead
+# of evaluating each saved query against the new posting, every saved query
+# is indexed under one term it requires, its anchor:
+#
+#   w:<keyword>   the longest of its keywords (longer words are rarer)
+#   c:<company>   else its company prefix
+#   l:<city>      else its location's city key (gazetteer.py)
+#   t:<category>  else its category
+#   *             else nothing at all (salary-only or empty queries)
+#
+# A posting expands into every term it could satisfy (its words, each
+# prefix of its company key, its city key and category, and *), and one
+# indexed `anchor IN (...)` lookup returns the only saved queries that can
+# match. The same index scan checks their other single-value criteria, and
+# only multi-keyword and salary-range criteria are left to Python, so the
+# cost per posting follows the number of candidates, not the number of
+# saved searches.
+#
+# Keywords must all appear as whole words in the title, description or
+# location. Unlike the search box, the last keyword is not a prefix match.
+#
+# The 'jobs.match_alerts' task (tasks.py) matches new and newly published
+# postings and records AlertMatch rows; send_digests() mails each user their
+# unsent matches in one email, every ALERT_DIGEST_INTERVAL_SECONDS when
+# scheduled.
+
+from collections import defaultdict, namedtuple
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.queue import enqueue
+from .filters import JobFilter
+from .models import AlertMatch, JobPost, SavedSearch, normalize_company_name
+from .search import tokenize
+from . import gazetteer, salary_range
+
+KEYWORD, COMPANY, LOCATION, CATEGORY, ANY = 'w:', 'c:', 'l:', 't:', '*'
+
+CRITERIA_FIELDS = (
+    'keywords', 'category', 'company_key', 'city_key',
+    'salary_min', 'salary_from', 'salary_to', 'salary_mode',
+)
+Criteria = namedtuple('Criteria', CRITERIA_FIELDS)
+
+# What matching reads of a posting
+JOB_FIELDS = (
+    'id', 'title', 'description', 'location', 'city_key', 'category', 'company_key', 'salary_min', 'salary_max',
+)
+
+
+def _salary(value):
+    return None if value is None else max(0, int(value))
+
+
+def criteria(params):
+    """
+    SavedSearch criteria (and anchor) for job list filter ``params``, or
+    None if they don't validate, the keywords are too long to store or they
+    search around a place.
+    """
+    filterset = JobFilter(params, queryset=JobPost.objects.none())
+    if not filterset.is_valid():
+        return None
+    data = filterset.form.cleaned_data
+    if data.get('near'):
+        # Radius searches have no anchor term to be indexed under
+        return None
+    fields = {
+        'keywords': ' '.join(dict.fromkeys(tokenize(data.get('search_query')))),
+        'category': data.get('category') or '',
+        'company_key': normalize_company_name(data.get('company')),
+        'city_key': gazetteer.location_key(data.get('location')),
+        'salary_min': _salary(data.get('salary_min')),
+        'salary_from': _salary(data.get('salary_from')),
+        'salary_to': _salary(data.get('salary_to')),
+        'salary_mode': '',
+    }
+    if fields['salary_from'] is not None or fields['salary_to'] is not None:
+        fields['salary_mode'] = data.get('salary_mode') or 'overlap'
+    if len(fields['keywords']) > SavedSearch._meta.get_field('keywords').max_length:
+        return None
+    fields['anchor'] = anchor_term(Criteria(**{name: fields[name] for name in CRITERIA_FIELDS}))
+    return fields
+
+
+def anchor_term(search):
+    """The term ``search`` is indexed under; see the top of this module."""
+    if search.keywords:
+        return KEYWORD + max(search.keywords.split(), key=len)
+    if search.company_key:
+        return COMPANY + search.company_key
+    if search.city_key:
+        return LOCATION + search.city_key
+    if search.category:
+        return CATEGORY + search.category
+    return ANY
+
+
+def job_terms(job, words):
+    """Every anchor a saved search matching ``job`` could have."""
+    terms = {ANY, CATEGORY + job.category, LOCATION + job.city_key}
+    terms.update(KEYWORD + word for word in words)
+    terms.update(COMPANY + prefix for prefix in company_prefixes(job))
+    return terms
+
+
+def company_prefixes(job):
+    return [job.company_key[:end] for end in range(1, len(job.company_key) + 1)]
+
+
+def matching_searches(job):
+    """Ids of the saved searches ``job`` matches."""
+    words = set(tokenize(' '.join((job.title, job.description, job.location))))
+    candidates = (
+        SavedSearch.objects.filter(anchor__in=job_terms(job, words))
+        # Checked in the database, from the covering index alone (models.py)
+        .filter(Q(category='') | Q(category=job.category))
+        .filter(Q(city_key='') | Q(city_key=job.city_key))
+        .filter(Q(company_key='') | Q(company_key__in=company_prefixes(job)))
+        .filter(Q(salary_min__isnull=True) | Q(salary_min__lte=job.salary_min))
+        .values_list('id', 'keywords', 'salary_from', 'salary_to', 'salary_mode')
+    )
+    found = []
+    for pk, keywords, salary_from, salary_to, salary_mode in candidates.iterator(chunk_size=2000):
+        # A single keyword is the anchor itself
+        if ' ' in keywords and not words.issuperset(keywords.split()):
+            continue
+        if salary_mode and not salary_range.in_range(
+            job.salary_min, job.salary_max, salary_from, salary_to, salary_mode,
+        ):
+            continue
+        found.append(pk)
+    return found
+
+
+def match_jobs(job_ids):
+    """Record AlertMatch rows for the active postings among ``job_ids``; returns how many matched."""
+    found = [
+        AlertMatch(saved_search_id=search_id, job_id=job.pk)
+        for job in JobPost.objects.filter(pk__in=job_ids, is_active=True).only(*JOB_FIELDS)
+        for search_id in matching_searches(job)
+    ]
+    # A posting published, unpublished and published again matches only once
+    AlertMatch.objects.bulk_create(found, batch_size=1000, ignore_conflicts=True)
+    return len(found)
+
+
+def digest_message(user, matches, max_jobs):
+    """One user's digest email for their unsent ``matches``."""
+    by_search = defaultdict(list)
+    for match in matches:
+        by_search[match.saved_search].append(match.job)
+    sections = []
+    for search, jobs in by_search.items():
+        lines = ['%s (%d new)' % (search.name, len(jobs))]
+        for job in jobs[:max_jobs]:
+            lines.append('  - %s, %s (%s): %s' % (
+                job.title, job.company_name or 'A Great Company', job.location,
+                settings.SITE_URL + reverse('job_detail', kwargs={'pk': job.pk}),
+            ))
+        if len(jobs) > max_jobs:
+            lines.append('  ...and %d more: %s' % (
+                len(jobs) - max_jobs, settings.SITE_URL + reverse('job_list') + '?' + search.query,
+            ))
+        sections.append('\n'.join(lines))
+    total = sum(len(jobs) for jobs in by_search.values())
+    return EmailMessage(
+        subject='%d new job%s for your saved searches' % (total, '' if total == 1 else 's'),
+        body='\n\n'.join(sections) + '\n\nManage your alerts at %s\n' % (
+            settings.SITE_URL + reverse('saved_searches')),
+        to=[user.email],
+    )
+
+
+def send_digests(batch_size=None, max_jobs=None):
+    """
+    Mail every user with unsent matches a digest, ``batch_size`` users per
+    transaction. Returns (emails, matches) sent. Users without an email
+    address only see their matches on the saved searches page.
+    """
+    batch_size = batch_size or settings.ALERT_DIGEST_BATCH_SIZE
+    max_jobs = max_jobs or settings.ALERT_DIGEST_MAX_JOBS
+    pending = AlertMatch.objects.filter(notified_at__isnull=True)
+    emails = sent = 0
+    while True:
+        user_ids = list(
+            pending.order_by('saved_search__user_id').values_list('saved_search__user_id', flat=True)
+            .distinct()[:batch_size]
+        )
+        if not user_ids:
+            return emails, sent
+        with transaction.atomic():
+            batch = list(
+                pending.filter(saved_search__user_id__in=user_ids)
+                .select_related('saved_search__user', 'job').select_for_update(of=('self',))
+                .order_by('saved_search_id', '-job__created_at')
+            )
+            # Marked first: if sending fails the transaction rolls back and
+            # the next run tries again.
+            AlertMatch.objects.filter(pk__in=[match.pk for match in batch]).update(notified_at=timezone.now())
+            by_user = defaultdict(list)
+            for match in batch:
+                # Postings taken down since they matched are left out
+                if match.job.is_active:
+                    by_user[match.saved_search.user].append(match)
+            messages = [
+                digest_message(user, matches, max_jobs) for user, matches in by_user.items() if user.email
+            ]
+            if messages:
+                # One SMTP connection per batch
+                get_connection().send_messages(messages)
+        emails += len(messages)
+        sent += len(batch)
+
+
+def run_scheduled():
+    """The 'jobs.send_alert_digests' task (tasks.py): send what is due, then queue the next run."""
+    try:
+        return send_digests()
+    finally:
+        enqueue('jobs.send_alert_digests', delay=settings.ALERT_DIGEST_INTERVAL_SECONDS)
+
+
+def schedule():
+    """Queue the periodic digest run unless it is already queued; returns whether it queued one."""
+    if Task.objects.filter(name='jobs.send_alert_digests', status__in=[Task.PENDING, Task.RUNNING]).exists():
+        return False
+    enqueue('jobs.send_alert_digests')
+    return True
@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobs'
+
+    def ready(self):
+        from . import geo, salary_range, search, signals  # noqa: F401
+        post_migrate.connect(search.install_after_migrate, sender=self)
+        post_migrate.connect(salary_range.install_after_migrate, sender=self)
+        post_migrate.connect(geo.install_after_migrate, sender=self)
@@ -0,0 +1,123 @@
+# File: job_board_project_final/jobs/archive.py
+#
+# Moves dead postings out of jobs_jobpost so the listing, search and filter
+# indexes only cover rows that can still be shown. A posting is archived
+# when it has been inactive for ARCHIVE_INACTIVE_DAYS, or is older than
+# ARCHIVE_MAX_AGE_DAYS whatever its state. Its applications go with it.
+#
+# Rows are copied into ArchivedJobPost/ArchivedApplication (same ids) and
+# deleted from the live tables in batches of ``batch_size`` postings, one
+# short transaction per batch, so the write lock is never held for long.
+# Deletes are raw (no per-row signals); the summary tables and caches the
+# signals would have updated are adjusted per batch instead. The FTS and
+# salary-range triggers still fire, since they live in the database.
+#
+# The archive_jobs command runs it by hand; schedule() queues it as a task
+# that re-queues itself every ARCHIVE_INTERVAL_SECONDS.
+
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.queue import enqueue
+from .db import delete_rows
+from .models import AlertMatch, Application, ArchivedApplication, ArchivedJobPost, JobPost
+from . import facets, page_cache, stats
+
+JOB_FIELDS = [
+    'id', 'employer_id', 'title', 'category', 'description', 'location', 'salary_min', 'salary_max',
+    'is_active', 'created_at', 'updated_at', 'applications_count', 'company_name',
+]
+APPLICATION_FIELDS = ['id', 'job_id', 'applicant_id', 'applied_at', 'status', 'cover_letter']
+
+
+def archivable(inactive_days=None, max_age_days=None, now=None):
+    """Postings due for the archive."""
+    now = now or timezone.now()
+    inactive_days = settings.ARCHIVE_INACTIVE_DAYS if inactive_days is None else inactive_days
+    max_age_days = settings.ARCHIVE_MAX_AGE_DAYS if max_age_days is None else max_age_days
+    return JobPost.objects.filter(
+        Q(is_active=False, updated_at__lt=now - timedelta(days=inactive_days))
+        | Q(created_at__lt=now - timedelta(days=max_age_days))
+    )
+
+
+def archive_batch(job_ids, due=None):
+    """
+    Move the given postings and their applications; returns (jobs,
+    applications) moved. With ``due`` (an archivable() queryset), postings
+    that stopped matching it since they were picked stay put.
+    """
+    queryset = JobPost.objects.all() if due is None else due
+    with transaction.atomic():
+        # city_key only for the facet deltas below
+        jobs = list(queryset.filter(pk__in=job_ids).select_for_update().values(*JOB_FIELDS, 'city_key'))
+        job_ids = [job['id'] for job in jobs]
+        applications = list(Application.objects.filter(job_id__in=job_ids).values(*APPLICATION_FIELDS))
+        ArchivedJobPost.objects.bulk_create([
+            ArchivedJobPost(**{name: job[name] for name in JOB_FIELDS}) for job in jobs
+        ])
+        ArchivedApplication.objects.bulk_create([ArchivedApplication(**app) for app in applications])
+        delete_rows(Application.objects.filter(job_id__in=job_ids))
+        # Saved-search matches are not archived; the digests only list live postings
+        delete_rows(AlertMatch.objects.filter(job_id__in=job_ids))
+        delete_rows(JobPost.objects.filter(pk__in=job_ids))
+
+        # What the post_delete signals would have done
+        deltas = Counter()
+        for job in jobs:
+            deltas[JobPost(**job).facet_key()] -= 1
+        facets.adjust(deltas)
+        if job_ids:
+            enqueue('jobs.update_job_vectors', {'job_ids': job_ids})
+    if job_ids:
+        stats.invalidate(stats.TOTAL_JOBS)
+        page_cache.bump(page_cache.LIST_VERSION)
+        page_cache.bump_many(page_cache.job_version_key(pk) for pk in job_ids)
+    return len(job_ids), len(applications)
+
+
+def archive_jobs(inactive_days=None, max_age_days=None, batch_size=None, pause=0.0, limit=None):
+    """
+    Archive everything due, ``batch_size`` postings per transaction with
+    ``pause`` seconds between batches. Returns (jobs, applications) moved.
+    """
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    now = timezone.now()
+    moved_jobs = moved_applications = 0
+    last_pk = 0
+    while limit is None or moved_jobs < limit:
+        size = batch_size if limit is None else min(batch_size, limit - moved_jobs)
+        due = archivable(inactive_days, max_age_days, now=now)
+        job_ids = list(due.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:size])
+        if not job_ids:
+            break
+        last_pk = job_ids[-1]
+        jobs, applications = archive_batch(job_ids, due=due)
+        moved_jobs += jobs
+        moved_applications += applications
+        if pause:
+            time.sleep(pause)
+    return moved_jobs, moved_applications
+
+
+def run_scheduled():
+    """The 'jobs.archive_jobs' task (tasks.py): archive what is due, then queue the next run."""
+    try:
+        return archive_jobs(pause=settings.ARCHIVE_BATCH_PAUSE)
+    finally:
+        enqueue('jobs.archive_jobs', delay=settings.ARCHIVE_INTERVAL_SECONDS)
+
+
+def schedule():
+    """Queue the periodic archive run unless it is already queued; returns whether it queued one."""
+    if Task.objects.filter(name='jobs.archive_jobs', status__in=[Task.PENDING, Task.RUNNING]).exists():
+        return False
+    enqueue('jobs.archive_jobs')
+    return True
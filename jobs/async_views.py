@@ -0,0 +1,104 @@
+# File: job_board_project_final/jobs/async_views.py
+#
+# Async versions of the read-heavy pages, used when settings.ASYNC_VIEWS is on
+# (the ASGI deployment, see gunicorn.conf.py). They share templates, caching
+# and filters with the sync views in views.py and only swap the DB access for
+# the async ORM, so a worker can keep serving while queries are in flight.
+#
+# request.user is lazy and loading it is a sync DB call, so it is always
+# resolved through sync_to_async before use.
+
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from django.template.response import TemplateResponse
+from django.views.generic import View
+
+from .filters import JobFilter
+from .models import JobPost
+from .pagination import CursorPaginator, InvalidCursor, querystring_without_cursor
+from .views import (
+    HomepageView, JobDetailView, JobListView, SeekerDashboardView, archived_applications, include_archived,
+)
+from . import facets, recommend, stats
+
+
+async def is_authenticated(request):
+    return await sync_to_async(lambda: request.user.is_authenticated)()
+
+
+# --- Homepage ---
+class AsyncHomepageView(HomepageView):
+    async def get(self, request, *args, **kwargs):
+        context = super(HomepageView, self).get_context_data(**kwargs)
+        try:
+            context.update(await stats.ahomepage_stats())
+        except Exception:
+            context['total_jobs'] = 0
+            context['total_employers'] = 0
+        return TemplateResponse(request, self.template_name, context)
+
+
+# --- Job List & Detail ---
+class AsyncJobListView(JobListView):
+    async def get(self, request, *args, **kwargs):
+        queryset = JobPost.objects.filter(is_active=True)
+        self.filter = JobFilter(request.GET, queryset=queryset)
+        # Building .qs probes the search backend on first use
+        self.object_list = await sync_to_async(lambda: self.filter.qs)()
+
+        paginator = CursorPaginator(self.object_list, self.paginate_by, ordering=self.filter.get_ordering())
+        try:
+            page = await paginator.apage(request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404('Invalid cursor')
+
+        context = {
+            'view': self,
+            'filter': self.filter,
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': page.has_other_pages(),
+            'object_list': page.object_list,
+            self.context_object_name: page.object_list,
+            'facets': await sync_to_async(facets.facet_counts)(self.filter),
+            'querystring': querystring_without_cursor(request.GET),
+        }
+        return TemplateResponse(request, self.template_name, context)
+
+
+class AsyncJobDetailView(JobDetailView):
+    async def get(self, request, *args, **kwargs):
+        try:
+            self.object = await JobPost.objects.aget(pk=kwargs['pk'])
+        except JobPost.DoesNotExist:
+            raise Http404('No JobPost matches the given query.')
+        context = {
+            'view': self,
+            'object': self.object,
+            self.get_context_object_name(self.object): self.object,
+        }
+        return TemplateResponse(request, self.template_name, context)
+
+
+# --- SEEKER ---
+class AsyncSeekerDashboardView(SeekerDashboardView):
+    async def dispatch(self, request, *args, **kwargs):
+        # Replaces LoginRequiredMixin.dispatch, which reads request.user synchronously
+        if not await is_authenticated(request):
+            return self.handle_no_permission()
+        return await View.dispatch(self, request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        applications = [app async for app in self.get_queryset()]
+        context = {
+            'view': self,
+            'object_list': applications,
+            self.context_object_name: applications,
+            'is_paginated': False,
+            'recommended_jobs': await sync_to_async(recommend.recommended_jobs)(request.user),
+            'include_archived': include_archived(request),
+        }
+        if context['include_archived']:
+            # request.user was loaded by dispatch()
+            context['archived_applications'] = [app async for app in archived_applications(request.user)]
+        return TemplateResponse(request, self.template_name, context)
@@ -0,0 +1,198 @@
+# File: job_board_project_final/jobs/benchmark.py
+#
+# Route benchmark used by the run_benchmark command. Every named URL in
+# jobs/urls.py, users/urls.py and the homepage is requested either in-process
+# through the test Client (latency plus DB query counts) or over HTTP against
+# a running server with loadgen (throughput and tail latency). Results can be
+# saved as a baseline JSON and compared against on later runs.
+
+import time
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models import Count
+from django.test import Client
+from django.urls import reverse
+
+from core.metrics import QueryRecorder, recording
+from users.models import User
+from . import loadgen
+from .models import Application, JobPost
+
+# label, url name, method, who ('seeker'/'employer'/None), query string
+ROUTES = [
+    ('homepage', 'homepage', 'GET', None, ''),
+    ('job_list', 'job_list', 'GET', None, ''),
+    ('job_list_search', 'job_list', 'GET', None, 'search_query=developer'),
+    ('job_list_filtered', 'job_list', 'GET', None, 'category=tech&salary_min=60'),
+    ('job_list_salary_range', 'job_list', 'GET', None, 'salary_from=60&salary_to=90&salary_mode=within'),
+    ('job_list_near', 'job_list', 'GET', None, 'near=Pune&radius_km=200'),
+    ('job_detail', 'job_detail', 'GET', None, ''),
+    ('job_api', 'job_api', 'GET', None, 'limit=100'),
+    ('seeker_dashboard', 'seeker_dashboard', 'GET', 'seeker', ''),
+    ('seeker_dashboard_archived', 'seeker_dashboard', 'GET', 'seeker', 'include_archived=1'),
+    # Re-applies to a job the seeker already applied to, so repeated runs
+    # measure the same (duplicate) path and never add rows.
+    ('apply_to_job', 'apply_to_job', 'POST', 'seeker', ''),
+    ('saved_searches', 'saved_searches', 'GET', 'seeker', ''),
+    # No name: validation only, nothing is saved.
+    ('saved_search_create', 'saved_search_create', 'POST', 'seeker', ''),
+    # pk 0 never exists: the lookup only, nothing is deleted.
+    ('saved_search_delete', 'saved_search_delete', 'POST', 'seeker', ''),
+    ('employer_dashboard', 'employer_dashboard', 'GET', 'employer', ''),
+    ('job_create', 'job_create', 'GET', 'employer', ''),
+    ('job_update', 'job_update', 'GET', 'employer', ''),
+    ('applicant_tracking', 'applicant_tracking', 'GET', 'employer', ''),
+    ('applicant_tracking_status', 'applicant_tracking', 'GET', 'employer', 'status=APPLIED'),
+    # No action: validation only, no status changes.
+    ('application_bulk_status', 'application_bulk_status', 'POST', 'employer', ''),
+    # pk 0 never exists: the lookup only, nothing is toggled.
+    ('job_toggle_active', 'job_toggle_active', 'POST', 'employer', ''),
+    # Rows without a title: parsing and validation only, nothing is written.
+    ('job_import', 'job_import', 'POST', 'employer', ''),
+    ('job_export', 'job_export', 'GET', 'employer', 'format=csv'),
+    ('signup', 'signup', 'GET', None, ''),
+    ('employer_signup', 'employer_signup', 'GET', None, ''),
+    ('login', 'login', 'GET', None, ''),
+    ('profile', 'profile', 'GET', 'seeker', ''),
+    ('logout', 'logout', 'POST', 'seeker', ''),
+]
+
+IMPORT_BODY = 'title,category,description,location,salary_min,salary_max\n' + (
+    ',tech,Benchmark row,Pune,10,20\n' * 100
+)
+
+
+def uncovered_routes():
+    """Named URLs in the benchmarked urlconfs that ROUTES does not request."""
+    from jobs.urls import urlpatterns as job_urls
+    from users.urls import urlpatterns as user_urls
+
+    names = {pattern.name for pattern in job_urls + user_urls if pattern.name}
+    return names - {url_name for _, url_name, _, _, _ in ROUTES}
+
+
+class Fixtures:
+    """The users and jobs the routes are requested for, picked from the current data."""
+
+    def __init__(self):
+        application = Application.objects.select_related('applicant').order_by('-pk').first()
+        busiest = (
+            JobPost.objects.values('employer').annotate(n=Count('id')).order_by('-n').first()
+        )
+        job = JobPost.objects.filter(is_active=True).order_by('-created_at', '-id').first()
+        if not (application and busiest and job):
+            raise LookupError('No data to benchmark; run seed_data first.')
+        self.seeker = application.applicant
+        self.applied_job_id = application.job_id
+        self.employer = User.objects.get(pk=busiest['employer'])
+        self.employer_job_id = (
+            JobPost.objects.filter(employer=self.employer).order_by('-created_at').values_list('pk', flat=True)[0]
+        )
+        self.job_id = job.pk
+
+    def user(self, who):
+        return {'seeker': self.seeker, 'employer': self.employer}.get(who)
+
+    def path(self, label, url_name, query):
+        kwargs = {
+            'job_detail': {'pk': self.job_id},
+            'apply_to_job': {'pk': self.applied_job_id},
+            'job_update': {'pk': self.employer_job_id},
+            'saved_search_delete': {'pk': 0},
+            'applicant_tracking': {'pk': self.employer_job_id},
+            'application_bulk_status': {'pk': self.employer_job_id},
+            'job_toggle_active': {'pk': 0},
+        }.get(url_name, {})
+        path = reverse(url_name, kwargs=kwargs)
+        return path + '?' + query if query else path
+
+
+def _request(client, method, path, label):
+    if method == 'GET':
+        return client.get(path)
+    if label == 'job_import':
+        upload = SimpleUploadedFile('jobs.csv', IMPORT_BODY.encode(), content_type='text/csv')
+        return client.post(path, {'file': upload})
+    return client.post(path)
+
+
+def run_client(fixtures, labels=None, iterations=50, warmup=3):
+    """In-process run through the full middleware stack; adds per-request query counts."""
+    results = {}
+    for label, url_name, method, who, query in ROUTES:
+        if labels and label not in labels:
+            continue
+        path = fixtures.path(label, url_name, query)
+        user = fixtures.user(who)
+        client = Client(raise_request_exception=False)
+        latencies, statuses, queries = [], {}, []
+        for i in range(warmup + iterations):
+            if user is not None and (i == 0 or label == 'logout'):
+                client.force_login(user)
+            recorder = QueryRecorder()
+            # Every alias, so reads routed to a replica count too
+            with recording(recorder):
+                started = time.perf_counter()
+                response = _request(client, method, path, label)
+                elapsed = time.perf_counter() - started
+            if i < warmup:
+                continue
+            latencies.append(elapsed)
+            queries.append(recorder.count)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        result = loadgen.summarize(latencies, sum(latencies), statuses)
+        result['queries'] = max(queries) if queries else None
+        results[label] = result
+    return results
+
+
+def session_cookie(user):
+    client = Client()
+    client.force_login(user)
+    return '%s=%s' % (settings.SESSION_COOKIE_NAME, client.cookies[settings.SESSION_COOKIE_NAME].value)
+
+
+def run_http(base_url, fixtures, labels=None, concurrency=8, duration=5.0, processes=0):
+    """GET routes only: POSTs would need CSRF handling and change data."""
+    cookies = {}
+    results = {}
+    for label, url_name, method, who, query in ROUTES:
+        if method != 'GET' or (labels and label not in labels):
+            continue
+        headers = {}
+        if who:
+            if who not in cookies:
+                cookies[who] = session_cookie(fixtures.user(who))
+            headers['Cookie'] = cookies[who]
+        result = loadgen.run_load(
+            base_url, [fixtures.path(label, url_name, query)], concurrency=concurrency,
+            duration=duration, headers=headers, processes=processes,
+        )
+        result['queries'] = None
+        results[label] = result
+    return results
+
+
+def compare(results, baseline, tolerance=0.2, noise_ms=1.0):
+    """
+    Human-readable regressions of ``results`` against a saved baseline: more
+    queries than before, p95 more than ``tolerance`` (and ``noise_ms``) slower,
+    or throughput more than ``tolerance`` lower.
+    """
+    regressions = []
+    for label, current in sorted(results.items()):
+        before = baseline.get('routes', {}).get(label)
+        if not before:
+            continue
+        if current['queries'] is not None and before.get('queries') is not None \
+                and current['queries'] > before['queries']:
+            regressions.append('%s: %d queries per request (baseline %d)' % (
+                label, current['queries'], before['queries']))
+        if current['p95_ms'] > before['p95_ms'] * (1 + tolerance) \
+                and current['p95_ms'] - before['p95_ms'] > noise_ms:
+            regressions.append('%s: p95 %.1fms (baseline %.1fms)' % (
+                label, current['p95_ms'], before['p95_ms']))
+        if before['rps'] and current['rps'] < before['rps'] * (1 - tolerance):
+            regressions.append('%s: %.1f req/s (baseline %.1f)' % (label, current['rps'], before['rps']))
+    return regressions
@@ -0,0 +1,120 @@
+# File: job_board_project_final/jobs/bulk.py
+#
+# Bulk import/export of an employer's postings as CSV or JSON Lines.
+#
+# Imports are stream-parsed row by row, validated with JobPostForm (so the
+# rules match the web form exactly) and written with bulk_create in batches,
+# one transaction per batch. Exports read with iterator() so neither side
+# holds the whole file or result set in memory.
+
+import csv
+import io
+import json
+from collections import Counter
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from tasks.queue import enqueue_many
+from .forms import JobPostForm
+from .models import JobPost
+from . import facets, page_cache, stats
+
+FORMATS = ('csv', 'jsonl')
+EXPORT_FIELDS = ['id'] + JobPostForm._meta.fields + ['created_at']
+DEFAULT_BATCH_SIZE = 500
+
+
+def read_rows(stream, fmt):
+    """Yield (line number, dict) from a text stream."""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == 'jsonl':
+        for line_num, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                row = exc
+            yield line_num, row
+    else:
+        raise ValueError('Unknown format %r' % fmt)
+
+
+def import_jobs(employer, stream, fmt, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Create a JobPost for every valid row in ``stream``.
+
+    Returns ``{'created': n, 'errors': [{'line': ..., 'errors': {...}}, ...]}``.
+    Invalid rows are reported and skipped; they never block the valid ones.
+    """
+    created, errors, batch = 0, [], []
+
+    def flush():
+        nonlocal created
+        if batch:
+            with transaction.atomic():
+                JobPost.objects.bulk_create(batch)
+                facets.adjust(Counter(job.facet_key() for job in batch))
+                enqueue_many([
+                    ('jobs.update_job_vectors', {'job_ids': [job.pk for job in batch]}),
+                    # Saved-search alerts, as post_save would have queued
+                    ('jobs.match_alerts', {'job_ids': [job.pk for job in batch if job.is_active]}),
+                ])
+            created += len(batch)
+            batch.clear()
+
+    for line_num, row in read_rows(stream, fmt):
+        if not isinstance(row, dict):
+            errors.append({'line': line_num, 'errors': {'__all__': ['Not a JSON object.']}})
+            continue
+        # A missing is_active column means "publish", as on the web form.
+        row.setdefault('is_active', True)
+        form = JobPostForm(data=row)
+        if not form.is_valid():
+            errors.append({'line': line_num, 'errors': form.errors.get_json_data()})
+            continue
+        job = form.save(commit=False)
+        job.employer = employer
+        job.set_company_name(employer.company_name)
+        job.set_location(job.location)
+        batch.append(job)
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+
+    if created:
+        # bulk_create skips the post_save signals these normally hang off.
+        stats.invalidate(stats.TOTAL_JOBS)
+        page_cache.bump(page_cache.LIST_VERSION)
+    return {'created': created, 'errors': errors}
+
+
+def export_jobs(employer, fmt, chunk_size=DEFAULT_BATCH_SIZE):
+    """Yield the employer's postings as CSV or JSONL text chunks."""
+    rows = (
+        JobPost.objects.filter(employer=employer)
+        .order_by('-created_at')
+        .values_list(*EXPORT_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_FIELDS)
+        for row in rows:
+            writer.writerow(row)
+            if buffer.tell() > 64 * 1024:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    elif fmt == 'jsonl':
+        for row in rows:
+            yield json.dumps(dict(zip(EXPORT_FIELDS, row)), cls=DjangoJSONEncoder) + '\n'
+    else:
+        raise ValueError('Unknown format %r' % fmt)
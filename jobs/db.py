@@ -0,0 +1,25 @@
+# File: job_board_project_final/jobs/db.py
+#
+# Bulk row removal for code that handles the side effects itself: the
+# archive (which moves rows instead of deleting them) and the seeding and
+# benchmark commands (which clean up the rows they generated).
+
+from django.db import connections, router
+
+
+def delete_rows(queryset):
+    """
+    DELETE the rows of ``queryset`` in one statement, skipping the per-row
+    signals and cascades a queryset delete() would run. Returns the count.
+    """
+    model = queryset.model
+    using = router.db_for_write(model)
+    connection = connections[using]
+    subquery, params = queryset.values('pk').query.get_compiler(using).as_sql()
+    with connection.cursor() as cursor:
+        cursor.execute('DELETE FROM %s WHERE %s IN (%s)' % (
+            connection.ops.quote_name(model._meta.db_table),
+            connection.ops.quote_name(model._meta.pk.column),
+            subquery,
+        ), params)
+        return cursor.rowcount
@@ -0,0 +1,196 @@
+# File: job_board_project_final/jobs/facets.py
+#
+# Facet counts for the job search sidebar: how many active jobs there are per
+# category, per salary band and per location under the current filters.
+# Locations are grouped by city key (gazetteer.py), so "Bangalore" and
+# "Bengaluru" postings count as one city.
+#
+# Counts come from JobFacetCount, a small summary table with one row per
+# (category, salary band, city key). Every JobPost save/delete queues an
+# adjustment (signals.py) that the task worker applies in batches, so a
+# sidebar costs three GROUP BYs over a few hundred rows instead of three
+# over JobPost. Each facet ignores its own filter
+# (disjunctive faceting), so the other categories still show their counts
+# after one is picked. Filters the summary can't express (keyword search,
+# company, a salary that isn't a band edge) fall back to one GROUP BY over
+# the matching JobPost rows. So do a salary range (salary_range.py) and a
+# radius search (geo.py).
+
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import BooleanField, Case, Count, F, IntegerField, Sum, Value, When
+from django.http import QueryDict
+
+from .models import JobFacetCount, JobPost, SALARY_BANDS
+from . import gazetteer
+
+LOCATION_LIMIT = 10
+
+
+def band_expression(field='salary_min'):
+    """SQL for models.salary_band()"""
+    return Case(
+        *[When(**{field + '__gte': edge}, then=Value(edge)) for edge in reversed(SALARY_BANDS)],
+        output_field=IntegerField(),
+    )
+
+
+def adjust(deltas):
+    """Apply ``{facet key: delta}``; None keys (inactive jobs) are skipped."""
+    for key, delta in deltas.items():
+        if key is None or not delta:
+            continue
+        category, band, city_key = key
+        rows = JobFacetCount.objects.filter(category=category, salary_band=band, city_key=city_key)
+        if rows.update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                JobFacetCount.objects.create(
+                    category=category, salary_band=band, city_key=city_key, count=delta,
+                )
+        except IntegrityError:
+            # Another request created the row first
+            rows.update(count=F('count') + delta)
+
+
+def move(old_key, new_key):
+    if old_key != new_key:
+        adjust({old_key: -1, new_key: 1})
+
+
+def rebuild():
+    """Recount from JobPost, after changes that bypass the signals. Returns the row count."""
+    grouped = (
+        JobPost.objects.filter(is_active=True).order_by()
+        .annotate(band=band_expression())
+        .values_list('category', 'band', 'city_key')
+        .annotate(n=Count('id'))
+    )
+    rows = [
+        JobFacetCount(category=category, salary_band=band, city_key=city_key, count=n)
+        for category, band, city_key, n in grouped.iterator()
+    ]
+    with transaction.atomic():
+        JobFacetCount.objects.all().delete()
+        JobFacetCount.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def _summary_counts(category, band, location):
+    def grouped(skip, field):
+        rows = JobFacetCount.objects.filter(count__gt=0)
+        if category and skip != 'category':
+            rows = rows.filter(category=category)
+        if band is not None and skip != 'salary_min':
+            rows = rows.filter(salary_band__gte=band)
+        if location and skip != 'location':
+            rows = rows.filter(city_key=location)
+        return dict(rows.order_by().values_list(field).annotate(n=Sum('count')))
+
+    return (
+        grouped('category', 'category'),
+        grouped('salary_min', 'salary_band'),
+        grouped('location', 'city_key'),
+    )
+
+
+def _job_counts(job_filter, category, salary, location):
+    """
+    Facet counts straight from JobPost, for filters the summary can't
+    express. The jobs matching every filter except the three facets (for a
+    keyword search, the FTS matches joined to their rows) are grouped once by
+    category, band, city key and whether they meet ``salary``. Each facet
+    then sums the groups that pass the other two facets' filters.
+    """
+    from .filters import JobFilter
+
+    params = job_filter.data.copy()
+    for name in ('category', 'salary_min', 'location'):
+        params.pop(name, None)
+    queryset = JobFilter(params, queryset=job_filter.queryset).qs.order_by().annotate(
+        band=band_expression(),
+        meets_salary=Value(True) if salary is None else Case(
+            When(salary_min__gte=salary, then=Value(True)), default=Value(False), output_field=BooleanField(),
+        ),
+    )
+    groups = queryset.values_list('category', 'band', 'city_key', 'meets_salary').annotate(n=Count('id'))
+
+    by_category, by_band, by_location = Counter(), Counter(), Counter()
+    for row_category, row_band, row_location, meets_salary, n in groups.order_by():
+        in_category = not category or row_category == category
+        in_location = not location or row_location == location
+        if in_location and meets_salary:
+            by_category[row_category] += n
+        if in_category and in_location:
+            by_band[row_band] += n
+        if in_category and meets_salary:
+            by_location[row_location] += n
+    return by_category, by_band, by_location
+
+
+def _link(params, name, value, selected):
+    """Querystring that selects ``value`` for ``name``, or clears it if already selected."""
+    params = params.copy()
+    params.pop('cursor', None)
+    if selected:
+        params.pop(name, None)
+    else:
+        params[name] = str(value)
+    return params.urlencode()
+
+
+def facet_counts(job_filter):
+    """
+    Sidebar data for a bound JobFilter:
+    ``{'total': n, 'category': [...], 'salary_min': [...], 'location': [...]}``,
+    each entry a dict with value, label, count, selected and querystring.
+    """
+    data = job_filter.form.cleaned_data if job_filter.is_valid() else {}
+    category = data.get('category') or None
+    location = gazetteer.location_key(data.get('location')) or None
+    salary = data.get('salary_min')
+    band = int(salary) if salary is not None and salary in SALARY_BANDS else None
+
+    ranged = data.get('salary_from') is not None or data.get('salary_to') is not None
+    if (data.get('search_query') or data.get('company') or data.get('near') or ranged
+            or (salary is not None and band is None)):
+        by_category, by_band, by_location = _job_counts(job_filter, category, salary, location)
+    else:
+        by_category, by_band, by_location = _summary_counts(category, band, location)
+
+    # FilterSet swaps an empty QueryDict for a plain {}
+    params = QueryDict(mutable=True)
+    params.update(job_filter.data)
+    result = {
+        'total': by_category.get(category, 0) if category else sum(by_category.values()),
+        'category': [],
+        'salary_min': [],
+        'location': [],
+    }
+    for value, label in JobPost.CATEGORY_CHOICES:
+        selected = value == category
+        result['category'].append({
+            'value': value, 'label': label, 'count': by_category.get(value, 0),
+            'selected': selected, 'querystring': _link(params, 'category', value, selected),
+        })
+    # salary_min filters "at least", so each band shows the jobs in it and above
+    running = 0
+    for edge in reversed(SALARY_BANDS[1:]):
+        running += by_band.get(edge, 0)
+        selected = edge == band
+        result['salary_min'].insert(0, {
+            'value': edge, 'label': '$%dK+' % edge, 'count': running,
+            'selected': selected, 'querystring': _link(params, 'salary_min', edge, selected),
+        })
+    top = sorted(by_location.items(), key=lambda item: (-item[1], item[0]))[:LOCATION_LIMIT]
+    if location and location not in dict(top):
+        top.append((location, by_location.get(location, 0)))
+    for key, count in top:
+        name, selected = gazetteer.display_name(key), key == location
+        result['location'].append({
+            'value': name, 'label': name, 'count': count,
+            'selected': selected, 'querystring': _link(params, 'location', name, selected),
+        })
+    return result
@@ -1,10 +1,35 @@
 # File: job_board_project_final/jobs/filters.py
 
 import django_filters
+from django import forms
 from django.forms import TextInput
-from .models import JobPost
+from .models import JobPost, normalize_company_name
+from . import gazetteer, geo, salary_range, search
+
+
+class PlaceField(forms.CharField):
+    """A place name from the gazetteer, cleaned to its Place."""
+
+    def clean(self, value):
+        value = super().clean(value)
+        if not value:
+            return None
+        place = gazetteer.lookup(value)
+        if place is None:
+            raise forms.ValidationError('Unknown place: %(value)s', code='unknown_place', params={'value': value})
+        return place
+
+
+class PlaceFilter(django_filters.CharFilter):
+    field_class = PlaceField
+
 
 class JobFilter(django_filters.FilterSet):
+    # Orderings end in 'id' so they can drive keyset pagination (see pagination.py)
+    DEFAULT_ORDERING = ('-created_at', '-id')
+    SEARCH_ORDERING = ('search_rank', '-created_at', '-id')
+    NEAR_ORDERING = ('distance_km', '-created_at', '-id')
+
     # Text search across multiple fields
     search_query = django_filters.CharFilter(
         method='filter_search',
@@ -13,13 +38,12 @@ class JobFilter(django_filters.FilterSet):
         widget=TextInput(attrs={'placeholder': 'Search keywords...'}) 
     )
     
-    # Filtering by Company (Employer) Name
-    company = django_filters.CharFilter(
-        field_name='employer__company_name', 
-        lookup_expr='icontains', 
-        label='Company'
-    )
+    # Filtering by Company (Employer) Name: prefix match on the denormalized key
+    company = django_filters.CharFilter(method='filter_company', label='Company')
     
+    # One city (any of its names), as listed in the sidebar's location facet
+    location = django_filters.CharFilter(method='filter_location', label='Location')
+
     # Salary Range Filtering (Search jobs where the MIN salary is AT LEAST the input value)
     salary_min = django_filters.NumberFilter(
         field_name='salary_min', 
@@ -27,6 +51,29 @@ class JobFilter(django_filters.FilterSet):
         label='Min Salary (K)'
     )
 
+    # Salary range matching; all three are applied together in filter_queryset
+    salary_from = django_filters.NumberFilter(method='filter_salary_range', label='Salary From (K)')
+    salary_to = django_filters.NumberFilter(method='filter_salary_range', label='Salary To (K)')
+    salary_mode = django_filters.ChoiceFilter(
+        method='filter_salary_range',
+        choices=salary_range.MODES,
+        empty_label=None,
+        label='Salary Match',
+    )
+
+    # Radius search around a known city, nearest first (see geo.py)
+    near = PlaceFilter(
+        method='filter_near',
+        label='Near',
+        widget=TextInput(attrs={'placeholder': 'City, e.g. Pune'}),
+    )
+    radius_km = django_filters.NumberFilter(
+        method='filter_near',
+        label='Within (km)',
+        min_value=1,
+        max_value=geo.MAX_RADIUS_KM,
+    )
+
     class Meta:
         model = JobPost
         # We only define fields that use the standard exact/choice filters
@@ -36,11 +83,53 @@ class JobFilter(django_filters.FilterSet):
     def filter_search(self, queryset, name, value):
         if not value:
             return queryset
-        
-        # Q objects allow OR lookups (Title OR Description OR Location)
-        from django.db.models import Q 
-        return queryset.filter(
-            Q(title__icontains=value) | 
-            Q(description__icontains=value) | 
-            Q(location__icontains=value)
-        )
\ No newline at end of file
+
+        # Uses the FTS5 / Postgres full-text index when available (see search.py)
+        # and orders the matches best-first, unless a radius search orders
+        # them by distance instead.
+        if self.form.cleaned_data.get('near'):
+            return search.search(queryset, value, rank=False)
+        return search.search(queryset, value).order_by(*self.SEARCH_ORDERING)
+
+    def filter_company(self, queryset, name, value):
+        key = normalize_company_name(value)
+        if not key:
+            return queryset
+        # A range rather than LIKE/ILIKE, so a plain b-tree index serves it
+        return queryset.filter(company_key__gte=key, company_key__lt=key + '\uffff')
+
+    def filter_location(self, queryset, name, value):
+        key = gazetteer.location_key(value)
+        if not key:
+            return queryset
+        return queryset.filter(city_key=key)
+
+    def filter_salary_range(self, queryset, name, value):
+        return queryset
+
+    def filter_near(self, queryset, name, value):
+        return queryset
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        place = self.form.cleaned_data.get('near')
+        if place is not None:
+            radius = self.form.cleaned_data.get('radius_km') or geo.DEFAULT_RADIUS_KM
+            queryset = geo.filter_near(queryset, place, radius).order_by(*self.NEAR_ORDERING)
+        low = self.form.cleaned_data.get('salary_from')
+        high = self.form.cleaned_data.get('salary_to')
+        if low is None and high is None:
+            return queryset
+        mode = self.form.cleaned_data.get('salary_mode') or 'overlap'
+        return salary_range.filter_range(queryset, low, high, mode)
+
+    def get_ordering(self):
+        """
+        Ordering of ``self.qs``: nearest first around a place, else relevance
+        when searching, else newest first.
+        """
+        if self.is_valid() and self.form.cleaned_data.get('near'):
+            return self.NEAR_ORDERING
+        if self.is_valid() and self.form.cleaned_data.get('search_query'):
+            return self.SEARCH_ORDERING
+        return self.DEFAULT_ORDERING
@@ -0,0 +1,69 @@
+# File: job_board_project_final/jobs/gazetteer.py
+#
+# Offline gazetteer: resolves the free-text location of a posting to a
+# canonical city with coordinates, so postings can be filtered by distance
+# (geo.py) and "Bangalore", "bengaluru " and "Bengaluru, Karnataka" all end
+# up under the same city key. The text itself is kept as typed.
+#
+# Places come from gazetteer.csv next to this module (name, |-separated
+# aliases, ISO country code, latitude, longitude) and are loaded once per
+# process. Locations that aren't a known city (e.g. "Remote") are keyed by
+# their normalized text and get no coordinates.
+
+import csv
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+
+DATA_FILE = Path(__file__).resolve().with_name('gazetteer.csv')
+
+Place = namedtuple('Place', ('key', 'name', 'country', 'latitude', 'longitude'))
+
+
+def normalize(text):
+    """Lookup key for a place name: case-folded, whitespace collapsed."""
+    return ' '.join((text or '').split()).casefold()
+
+
+@lru_cache(maxsize=None)
+def places():
+    """``{key or alias key: Place}`` for every bundled place."""
+    found = {}
+    with DATA_FILE.open(encoding='utf-8', newline='') as data:
+        for row in csv.DictReader(data):
+            place = Place(
+                key=normalize(row['name']), name=row['name'], country=row['country'],
+                latitude=float(row['latitude']), longitude=float(row['longitude']),
+            )
+            for name in [row['name']] + row['aliases'].split('|'):
+                if name:
+                    found.setdefault(normalize(name), place)
+    return found
+
+
+def lookup(text):
+    """
+    The Place ``text`` names, or None. Comma-separated parts are tried in
+    order, so "Thane, Maharashtra" is Thane and "Hinjewadi, Pune" is Pune.
+    """
+    known = places()
+    key = normalize(text)
+    if key in known:
+        return known[key]
+    for part in key.split(','):
+        place = known.get(normalize(part))
+        if place is not None:
+            return place
+    return None
+
+
+def location_key(text):
+    """City key of ``text``: its Place's key, else the text normalized."""
+    place = lookup(text)
+    return normalize(text) if place is None else place.key
+
+
+def display_name(key):
+    """Name to show for a location_key()."""
+    place = places().get(key)
+    return key.title() if place is None else place.name
@@ -0,0 +1,202 @@
+# File: job_board_project_final/jobs/geo.py
+#
+# Radius search: postings within ``radius_km`` of a place, nearest first.
+#
+# A job's coordinates (set from the gazetteer, see JobPost.set_location)
+# are indexed as a point, and a search first takes the bounding box of the
+# circle from the index, then keeps the jobs whose great-circle distance is
+# within the radius and orders them by it:
+#
+# SQLite:   an R*Tree virtual table (jobs_jobpost_geo_rtree) kept in sync by
+#           triggers on jobs_jobpost, like the salary index in salary_range.py.
+# Postgres: a GiST index on point(longitude, latitude).
+# Anything else falls back to comparing the latitude/longitude columns.
+#
+# Jobs without coordinates (unknown or remote locations) never match.
+
+import math
+
+from django.db import OperationalError, connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import ACos, Cos, Greatest, Least, Radians, Sin
+
+RTREE_TABLE = 'jobs_jobpost_geo_rtree'
+PG_INDEX = 'jobs_jobpost_geo_gist'
+
+EARTH_RADIUS_KM = 6371.0088
+DEFAULT_RADIUS_KM = 50
+MAX_RADIUS_KM = 1000
+
+# Must stay the same expression as the indexed one, otherwise Postgres will
+# not use the GiST index.
+PG_POINT = 'point("jobs_jobpost"."longitude", "jobs_jobpost"."latitude")'
+
+RTREE_INSERT = (
+    "INSERT INTO jobs_jobpost_geo_rtree(id, min_lat, max_lat, min_lon, max_lon) "
+    "SELECT new.id, new.latitude, new.latitude, new.longitude, new.longitude "
+    "WHERE new.latitude IS NOT NULL AND new.longitude IS NOT NULL; "
+)
+RTREE_TRIGGERS = {
+    'jobs_jobpost_geo_ai': (
+        "CREATE TRIGGER IF NOT EXISTS jobs_jobpost_geo_ai AFTER INSERT ON jobs_jobpost BEGIN "
+        + RTREE_INSERT + "END"
+    ),
+    'jobs_jobpost_geo_ad': (
+        "CREATE TRIGGER IF NOT EXISTS jobs_jobpost_geo_ad AFTER DELETE ON jobs_jobpost BEGIN "
+        "DELETE FROM jobs_jobpost_geo_rtree WHERE id = old.id; END"
+    ),
+    'jobs_jobpost_geo_au': (
+        "CREATE TRIGGER IF NOT EXISTS jobs_jobpost_geo_au "
+        "AFTER UPDATE OF latitude, longitude ON jobs_jobpost BEGIN "
+        "DELETE FROM jobs_jobpost_geo_rtree WHERE id = old.id; " + RTREE_INSERT + "END"
+    ),
+}
+
+# alias -> 'rtree' | 'postgres' | None, resolved once per process
+_backends = {}
+
+
+def geo_backend(using='default'):
+    """Return which point index is available on the given database."""
+    if using not in _backends:
+        connection = connections[using]
+        backend = None
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                    [RTREE_TABLE],
+                )
+                if cursor.fetchone():
+                    backend = 'rtree'
+        elif connection.vendor == 'postgresql':
+            backend = 'postgres'
+        _backends[using] = backend
+    return _backends[using]
+
+
+def install(connection):
+    """
+    Create the point index for ``connection`` if it is missing. Safe to run
+    repeatedly; see search.install() for why it also runs after migrate.
+    """
+    _backends.pop(connection.alias, None)
+
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            try:
+                cursor.execute(
+                    'CREATE VIRTUAL TABLE IF NOT EXISTS %s USING rtree(id, min_lat, max_lat, min_lon, max_lon)'
+                    % RTREE_TABLE
+                )
+            except OperationalError:
+                # SQLite built without R*Tree: stay on the column fallback.
+                return
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'jobs_jobpost'"
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            if existing.issuperset(RTREE_TRIGGERS):
+                return
+            for sql in RTREE_TRIGGERS.values():
+                cursor.execute(sql)
+            # Rows written while the triggers were missing are not indexed.
+            cursor.execute('DELETE FROM %s' % RTREE_TABLE)
+            cursor.execute(
+                'INSERT INTO %s(id, min_lat, max_lat, min_lon, max_lon) '
+                'SELECT id, latitude, latitude, longitude, longitude FROM jobs_jobpost '
+                'WHERE latitude IS NOT NULL AND longitude IS NOT NULL' % RTREE_TABLE
+            )
+
+    elif connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE INDEX IF NOT EXISTS %s ON jobs_jobpost USING GIST ((%s))'
+                % (PG_INDEX, PG_POINT.replace('"jobs_jobpost".', ''))
+            )
+
+
+def uninstall(connection):
+    _backends.pop(connection.alias, None)
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for name in RTREE_TRIGGERS:
+                cursor.execute('DROP TRIGGER IF EXISTS %s' % name)
+            cursor.execute('DROP TABLE IF EXISTS %s' % RTREE_TABLE)
+        elif connection.vendor == 'postgresql':
+            cursor.execute('DROP INDEX IF EXISTS %s' % PG_INDEX)
+
+
+def install_after_migrate(sender, using='default', **kwargs):
+    connection = connections[using]
+    # Not after migrating back past the migration that adds the index
+    if ('jobs', '0014_jobpost_geo') in MigrationRecorder(connection).applied_migrations():
+        install(connection)
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    (min_lat, max_lat, min_lon, max_lon) of every point within ``radius_km``.
+    Circles that reach a pole or the antimeridian get the full longitude range.
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    min_lat = latitude - math.degrees(angle)
+    max_lat = latitude + math.degrees(angle)
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+    spread = math.degrees(math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(latitude)))))
+    if longitude - spread < -180 or longitude + spread > 180:
+        return min_lat, max_lat, -180.0, 180.0
+    return min_lat, max_lat, longitude - spread, longitude + spread
+
+
+def distance_expression(latitude, longitude):
+    """Great-circle distance in km from (latitude, longitude) to each job."""
+    lat, lon = math.radians(latitude), math.radians(longitude)
+    cosine = (
+        math.sin(lat) * Sin(Radians('latitude'))
+        + math.cos(lat) * Cos(Radians('latitude')) * Cos(Radians('longitude') - lon)
+    )
+    # Rounding can push the cosine of (nearly) identical points past 1
+    return EARTH_RADIUS_KM * ACos(Least(Greatest(cosine, -1.0), 1.0))
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """distance_expression() between two points, in Python."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    cosine = math.sin(lat1) * math.sin(lat2) + math.cos(lat1) * math.cos(lat2) * math.cos(lon2 - lon1)
+    return EARTH_RADIUS_KM * math.acos(max(-1.0, min(1.0, cosine)))
+
+
+def filter_near(queryset, place, radius_km=DEFAULT_RADIUS_KM):
+    """
+    Jobs within ``radius_km`` of ``place`` (anything with latitude and
+    longitude), annotated with ``distance_km``.
+    """
+    radius_km = min(float(radius_km), MAX_RADIUS_KM)
+    min_lat, max_lat, min_lon, max_lon = bounding_box(place.latitude, place.longitude, radius_km)
+    backend = geo_backend(queryset.db)
+
+    if backend == 'rtree':
+        boxed_ids = RawSQL(
+            'SELECT id FROM %s WHERE max_lat >= %%s AND min_lat <= %%s AND max_lon >= %%s AND min_lon <= %%s'
+            % RTREE_TABLE,
+            (min_lat, max_lat, min_lon, max_lon),
+        )
+        queryset = queryset.filter(id__in=boxed_ids)
+    elif backend == 'postgres':
+        boxed = RawSQL(
+            '%s <@ box(point(%%s, %%s), point(%%s, %%s))' % PG_POINT,
+            (min_lon, min_lat, max_lon, max_lat),
+            output_field=BooleanField(),
+        )
+        queryset = queryset.filter(boxed)
+    else:
+        queryset = queryset.filter(latitude__range=(min_lat, max_lat), longitude__range=(min_lon, max_lon))
+
+    return queryset.annotate(
+        distance_km=distance_expression(place.latitude, place.longitude),
+    ).filter(distance_km__lte=radius_km)
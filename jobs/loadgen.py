@@ -0,0 +1,158 @@
+# File: job_board_project_final/jobs/loadgen.py
+#
+# A small closed-loop HTTP load generator for the benchmark commands: N
+# threads, each with its own keep-alive connection, request the given paths
+# round-robin for a fixed duration and record per-request latency.
+
+import http.client
+import itertools
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies, wall, statuses=None, errors=0):
+    """Latencies in seconds -> throughput and percentile summary in ms."""
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / wall if wall else 0.0,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': max(latencies) * 1000 if latencies else 0.0,
+        'statuses': dict(statuses or {}),
+    }
+
+
+def _collect(base_url, paths, concurrency, duration, timeout, headers=None):
+    """Raw (latencies, statuses, errors, wall) from ``concurrency`` threads."""
+    parts = urlsplit(base_url)
+    headers = headers or {}
+    deadline = time.perf_counter() + duration
+    lock = threading.Lock()
+    latencies, statuses, errors = [], {}, [0]
+
+    def worker(offset):
+        connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+        local_latencies, local_statuses, local_errors = [], {}, 0
+        for path in itertools.islice(itertools.cycle(paths), offset, None):
+            if time.perf_counter() >= deadline:
+                break
+            started = time.perf_counter()
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                connection.close()
+                connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+                continue
+            local_latencies.append(time.perf_counter() - started)
+            local_statuses[response.status] = local_statuses.get(response.status, 0) + 1
+        connection.close()
+        with lock:
+            latencies.extend(local_latencies)
+            errors[0] += local_errors
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, statuses, errors[0], time.perf_counter() - started
+
+
+def _collect_process(args):
+    return _collect(*args)
+
+
+def run_load(base_url, paths, concurrency=8, duration=10.0, timeout=30.0, headers=None, processes=0):
+    """
+    Hammer ``base_url`` + ``paths`` from ``concurrency`` threads for ``duration`` seconds.
+
+    With ``processes`` the threads are spread over that many client processes,
+    so the generator itself isn't limited to one core by the GIL.
+    """
+    if not processes:
+        latencies, statuses, errors, wall = _collect(base_url, paths, concurrency, duration, timeout, headers)
+        return summarize(latencies, wall, statuses, errors)
+
+    per_process = max(1, concurrency // processes)
+    args = [(base_url, paths, per_process, duration, timeout, headers)] * processes
+    with multiprocessing.get_context('spawn').Pool(processes) as pool:
+        results = pool.map(_collect_process, args)
+    latencies, statuses, errors = [], {}, 0
+    for local_latencies, local_statuses, local_errors, _ in results:
+        latencies.extend(local_latencies)
+        errors += local_errors
+        for status, count in local_statuses.items():
+            statuses[status] = statuses.get(status, 0) + count
+    return summarize(latencies, max(result[3] for result in results), statuses, errors)
+
+
+def wait_for_server(base_url, timeout=30.0):
+    parts = urlsplit(base_url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=1)
+            connection.request('GET', '/')
+            connection.getresponse().read()
+            connection.close()
+            return True
+        except (OSError, http.client.HTTPException):
+            time.sleep(0.2)
+    return False
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def gunicorn_server(base_dir, mode='wsgi', workers=2, threads=4, env=None):
+    """Run gunicorn.conf.py on a free local port; yields the base URL. ``env`` adds environment variables."""
+    port = free_port()
+    extra_env = env or {}
+    env = dict(os.environ)
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    env['SERVER_MODE'] = mode
+    # Plain update, so ``env`` may also override the variables above
+    env.update(extra_env)
+    command = [
+        sys.executable, '-m', 'gunicorn', '-c', str(base_dir / 'gunicorn.conf.py'),
+        '--bind', '127.0.0.1:%d' % port, '--workers', str(workers), '--log-level', 'warning',
+    ]
+    if mode == 'wsgi':
+        command += ['--threads', str(threads)]
+    server = subprocess.Popen(command, cwd=base_dir, env=env)
+    try:
+        base_url = 'http://127.0.0.1:%d' % port
+        if not wait_for_server(base_url):
+            raise RuntimeError('gunicorn (%s) did not start' % mode)
+        yield base_url
+    finally:
+        server.terminate()
+        server.wait()
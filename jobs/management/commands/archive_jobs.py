@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs import archive
+
+
+class Command(BaseCommand):
+    help = (
+        'Move postings that are long inactive or past the maximum age, with '
+        'their applications, into the archive tables in small batches.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--inactive-days', type=int,
+                            help='Archive postings inactive this long (default ARCHIVE_INACTIVE_DAYS).')
+        parser.add_argument('--max-age-days', type=int,
+                            help='Archive postings created this long ago (default ARCHIVE_MAX_AGE_DAYS).')
+        parser.add_argument('--batch-size', type=int, help='Postings per transaction.')
+        parser.add_argument('--pause', type=float, default=0.0, help='Seconds to wait between batches.')
+        parser.add_argument('--limit', type=int, help='Stop after this many postings.')
+        parser.add_argument('--dry-run', action='store_true', help='Only count what is due.')
+        parser.add_argument('--schedule', action='store_true',
+                            help='Queue the recurring archive task for the run_tasks worker instead.')
+
+    def handle(self, *args, **options):
+        if options['schedule']:
+            queued = archive.schedule()
+            self.stdout.write('Scheduled the archive task' if queued else 'The archive task is already queued')
+            return
+        if options['dry_run']:
+            due = archive.archivable(options['inactive_days'], options['max_age_days'])
+            self.stdout.write('%d postings are due for the archive' % due.count())
+            return
+
+        started = time.perf_counter()
+        jobs, applications = archive.archive_jobs(
+            inactive_days=options['inactive_days'], max_age_days=options['max_age_days'],
+            batch_size=options['batch_size'], pause=options['pause'], limit=options['limit'],
+        )
+        self.stdout.write('Archived %d postings and %d applications in %.1fs' % (
+            jobs, applications, time.perf_counter() - started))
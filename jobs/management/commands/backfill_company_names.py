@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from jobs.models import JobPost
+from jobs.signals import sync_company_name
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy every employer's company_name onto their job posts. Signals keep "
+        'these in sync; run this after bulk edits to users that bypass them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Employers read per query.')
+
+    def handle(self, *args, **options):
+        employers = (
+            User.objects.filter(pk__in=JobPost.objects.values('employer'))
+            .values_list('pk', 'company_name')
+        )
+        updated = employers_changed = 0
+        for pk, name in employers.iterator(chunk_size=options['batch_size']):
+            changed = sync_company_name(pk, name)
+            if changed:
+                updated += changed
+                employers_changed += 1
+        self.stdout.write('Updated %d job posts of %d employers' % (updated, employers_changed))
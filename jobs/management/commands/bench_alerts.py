@@ -0,0 +1,101 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs import alerts, gazetteer
+from jobs.db import delete_rows
+from jobs.loadgen import percentile
+from jobs.management.commands.seed_data import CATEGORIES, CITIES, CITY_WEIGHTS, ROLES, Seeder
+from jobs.models import AlertMatch, JobPost, SavedSearch
+from jobs.search import tokenize
+from users.models import User
+
+PREFIX = 'bench-alerts-'
+WORDS = sorted({word.lower() for titles in ROLES.values() for title in titles for word in title.split()})
+
+
+def random_criteria(rnd, company_names):
+    """Criteria of one made-up saved search; most have keywords, as on the search form."""
+    fields = dict.fromkeys(alerts.CRITERIA_FIELDS, '')
+    fields.update(salary_min=None, salary_from=None, salary_to=None)
+    kind = rnd.random()
+    if kind < 0.6:
+        fields['keywords'] = ' '.join(rnd.sample(WORDS, rnd.randint(1, 2)))
+        if rnd.random() < 0.3:
+            fields['city_key'] = gazetteer.location_key(rnd.choices(CITIES, weights=CITY_WEIGHTS)[0])
+    elif kind < 0.8:
+        fields['city_key'] = gazetteer.location_key(rnd.choices(CITIES, weights=CITY_WEIGHTS)[0])
+        fields['category'] = rnd.choice(list(CATEGORIES))
+    elif kind < 0.9:
+        fields['company_key'] = rnd.choice(company_names)
+    elif kind < 0.99:
+        fields['category'] = rnd.choice(list(CATEGORIES))
+        fields['salary_min'] = rnd.choice([25, 50, 75, 100])
+    else:
+        fields['salary_from'], fields['salary_to'], fields['salary_mode'] = 50, 90, 'overlap'
+    if rnd.random() < 0.2 and fields['salary_min'] is None and not fields['salary_mode']:
+        fields['salary_min'] = rnd.choice([25, 50, 75])
+    return alerts.Criteria(**fields)
+
+
+class Command(BaseCommand):
+    help = (
+        'Add --searches saved searches with made-up criteria and time matching '
+        'existing postings against all of them, as the alert task does for new ones.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--searches', type=int, default=100000)
+        parser.add_argument('--users', type=int, default=1000, help='Seekers the searches belong to.')
+        parser.add_argument('--jobs', type=int, default=500, help='Postings to match.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--keep', action='store_true', help='Keep the generated rows.')
+
+    def handle(self, *args, **options):
+        rnd = random.Random(options['seed'])
+        job_ids = list(JobPost.objects.filter(is_active=True).values_list('pk', flat=True))
+        if not job_ids:
+            raise CommandError('No active postings; run seed_data first.')
+        company_names = sorted(set(JobPost.objects.exclude(company_key='').values_list('company_key', flat=True)))
+        company_names = company_names or ['seed company']
+
+        seeder = Seeder(prefix=PREFIX, seed=options['seed'])
+        try:
+            started = time.perf_counter()
+            user_ids = seeder.create_users(options['users'], User.IS_JOB_SEEKER, 'seeker')
+
+            def generate():
+                for i in range(options['searches']):
+                    search = random_criteria(rnd, company_names)
+                    yield SavedSearch(
+                        user_id=rnd.choice(user_ids), name='Bench search %d' % i,
+                        anchor=alerts.anchor_term(search), **search._asdict(),
+                    )
+
+            seeder.bulk_create(SavedSearch, generate())
+            self.stdout.write('Saved %d searches in %.1fs' % (options['searches'], time.perf_counter() - started))
+
+            latencies, candidates, matched = [], [], []
+            for pk in rnd.sample(job_ids, min(options['jobs'], len(job_ids))):
+                job = JobPost.objects.only(*alerts.JOB_FIELDS).get(pk=pk)
+                words = set(tokenize(' '.join((job.title, job.description, job.location))))
+                candidates.append(SavedSearch.objects.filter(anchor__in=alerts.job_terms(job, words)).count())
+                started = time.perf_counter()
+                matched.append(len(alerts.matching_searches(job)))
+                latencies.append(time.perf_counter() - started)
+
+            total = SavedSearch.objects.count()
+            self.stdout.write('Matching %d postings against %d saved searches:' % (len(latencies), total))
+            self.stdout.write('  candidates per posting: p50 %d  p95 %d' % (
+                percentile(candidates, 50), percentile(candidates, 95)))
+            self.stdout.write('  matches per posting:    p50 %d  p95 %d' % (
+                percentile(matched, 50), percentile(matched, 95)))
+            self.stdout.write('  latency: p50 %.2fms  p95 %.2fms  max %.2fms' % (
+                percentile(latencies, 50) * 1000, percentile(latencies, 95) * 1000, max(latencies) * 1000))
+        finally:
+            if not options['keep']:
+                bench_searches = SavedSearch.objects.filter(user__username__startswith=PREFIX)
+                delete_rows(AlertMatch.objects.filter(saved_search__in=bench_searches))
+                delete_rows(SavedSearch.objects.filter(pk__in=bench_searches.values('pk')))
+                User.objects.filter(username__startswith=PREFIX).delete()
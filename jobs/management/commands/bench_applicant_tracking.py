@@ -0,0 +1,79 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from jobs import tracking
+from jobs.loadgen import percentile
+from jobs.management.commands.seed_data import Seeder
+from jobs.models import Application
+from jobs.pagination import CursorPaginator
+from jobs.views import ApplicantTrackingView
+from users.models import User
+
+PREFIX = 'bench-ats-'
+
+
+class Command(BaseCommand):
+    help = (
+        'Create one posting with --applications applicants and time the applicant '
+        'tracking pages (first, filtered and deep pages) and bulk status changes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--applications', type=int, default=50000)
+        parser.add_argument('--rounds', type=int, default=20, help='Requests per page timed.')
+        parser.add_argument('--depth', type=int, default=100, help='Pages to walk for the deep page.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--keep', action='store_true', help='Keep the generated rows.')
+
+    def handle(self, *args, **options):
+        seeder = Seeder(prefix=PREFIX, seed=options['seed'])
+        try:
+            started = time.perf_counter()
+            employer_id = seeder.create_users(1, User.IS_EMPLOYER, 'employer')[0]
+            seeker_ids = seeder.create_users(options['applications'], User.IS_JOB_SEEKER, 'seeker')
+            job = seeder.make_job(employer_id, 'Bench Company')
+            job.save()
+            rnd = seeder.random
+            seeder.bulk_create(Application, (
+                Application(
+                    job_id=job.pk, applicant_id=seeker_id,
+                    applied_at=seeder.now - timedelta(seconds=rnd.randrange(30 * 86400)),
+                    status=rnd.choices([Application.APPLIED, Application.REVIEWED], weights=[90, 10])[0],
+                )
+                for seeker_id in seeker_ids
+            ))
+            self.stdout.write('Created %d applications in %.1fs' % (len(seeker_ids), time.perf_counter() - started))
+
+            client = Client()
+            client.force_login(User.objects.get(pk=employer_id))
+            url = reverse('applicant_tracking', kwargs={'pk': job.pk})
+            ordering = ('-applied_at', '-id')
+            applications = Application.objects.filter(job=job)
+            deep = applications.order_by(*ordering)[options['depth'] * ApplicantTrackingView.paginate_by - 1]
+            cursor = CursorPaginator(applications, ApplicantTrackingView.paginate_by, ordering=ordering).encode(deep)
+            pages = {
+                'first page': url,
+                'status tab': url + '?status=' + Application.REVIEWED,
+                'page %d' % options['depth']: url + '?cursor=' + cursor,
+            }
+            self.stdout.write('%-14s %9s %9s' % ('', 'p50 ms', 'p95 ms'))
+            for label, path in pages.items():
+                latencies = []
+                for _ in range(options['rounds']):
+                    started = time.perf_counter()
+                    response = client.get(path)
+                    latencies.append(time.perf_counter() - started)
+                    assert response.status_code == 200, response.status_code
+                self.stdout.write('%-14s %9.2f %9.2f' % (
+                    label, percentile(latencies, 50) * 1000, percentile(latencies, 95) * 1000))
+
+            started = time.perf_counter()
+            changed = tracking.transition(job, 'reject', status=Application.APPLIED)
+            self.stdout.write('Rejected %d applications in %.2fs' % (changed, time.perf_counter() - started))
+        finally:
+            if not options['keep']:
+                seeder.clear()
@@ -0,0 +1,108 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.db import POSTGRES_ENGINE, POSTGRES_POOL_ENGINE
+from jobs.loadgen import gunicorn_server, percentile, run_load
+
+# Environment for each way of handling connections, on top of the current one
+SETUPS = {
+    'per-request': {'CONN_MAX_AGE': '0', 'DATABASE_POOL': '0'},
+    'persistent': {'CONN_MAX_AGE': '600', 'DATABASE_POOL': '0'},
+    'pool': {'CONN_MAX_AGE': '0', 'DATABASE_POOL': '1'},
+}
+
+
+def time_connects(alias, rounds):
+    """Seconds per open + SELECT 1 + close on a fresh connection, ``rounds`` times."""
+    latencies = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        connection = connections.create_connection(alias)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        connection.close()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def time_queries(alias, rounds):
+    """Seconds per SELECT 1 on an already open connection."""
+    connection = connections.create_connection(alias)
+    connection.ensure_connection()
+    latencies = []
+    try:
+        for _ in range(rounds):
+            started = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            latencies.append(time.perf_counter() - started)
+    finally:
+        connection.close()
+    return latencies
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure what opening a database connection costs, then serve a '
+        'DB-backed page through gunicorn with a new connection per request, '
+        'persistent connections and (on Postgres) the connection pool.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=200, help='Connects/queries to time directly.')
+        parser.add_argument('--setups', help='Comma-separated: %s.' % ', '.join(SETUPS))
+        parser.add_argument('--mode', default='wsgi', choices=['wsgi', 'asgi'])
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds per setup.')
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument('--threads', type=int, default=4, help='Threads per sync (WSGI) worker.')
+        parser.add_argument('--path', default='/jobs/api/?fields=id&limit=1',
+                            help='A page that always queries the database.')
+
+    def handle(self, *args, **options):
+        engine = connections['default'].settings_dict['ENGINE']
+        postgres = engine in (POSTGRES_ENGINE, POSTGRES_POOL_ENGINE)
+        self.stdout.write('Database: %s' % engine)
+
+        connects = time_connects('default', options['rounds'])
+        queries = time_queries('default', options['rounds'])
+        self.stdout.write('%-28s %9s %9s' % ('', 'p50 ms', 'p95 ms'))
+        for label, latencies in (('connect + SELECT 1 + close', connects), ('SELECT 1 (open connection)', queries)):
+            self.stdout.write('%-28s %9.3f %9.3f' % (
+                label, statistics.median(latencies) * 1000, percentile(latencies, 95) * 1000))
+        self.stdout.write('Connection setup: ~%.3f ms per request without reuse\n' % (
+            (statistics.median(connects) - statistics.median(queries)) * 1000))
+
+        names = options['setups'].split(',') if options['setups'] else [
+            name for name in SETUPS if postgres or name != 'pool'
+        ]
+        for name in names:
+            if name not in SETUPS:
+                raise CommandError('Unknown setup %r' % name)
+            if name == 'pool' and not postgres:
+                raise CommandError('The pool setup needs a Postgres DATABASE_URL')
+
+        self.stdout.write('%s %s, concurrency %d' % (options['mode'], options['path'], options['concurrency']))
+        self.stdout.write('%-12s %9s %9s %9s %9s %7s' % ('setup', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'errors'))
+        for name in names:
+            try:
+                server = gunicorn_server(
+                    settings.BASE_DIR, options['mode'], options['workers'], options['threads'],
+                    env=SETUPS[name],
+                )
+                with server as base_url:
+                    # Warm up workers (imports, first connections) before timing
+                    run_load(base_url, [options['path']], concurrency=options['concurrency'], duration=1.0)
+                    result = run_load(base_url, [options['path']], concurrency=options['concurrency'],
+                                      duration=options['duration'])
+            except RuntimeError as exc:
+                raise CommandError(str(exc))
+            self.stdout.write('%-12s %9.1f %9.2f %9.2f %9.2f %7d' % (
+                name, result['rps'], result['p50_ms'], result['p95_ms'], result['p99_ms'], result['errors']))
+            bad = {status: n for status, n in result['statuses'].items() if status >= 400}
+            if bad:
+                self.stderr.write('  non-2xx/3xx responses: %s' % bad)
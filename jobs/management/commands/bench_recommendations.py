@@ -0,0 +1,72 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs import page_cache, recommend
+from jobs.db import delete_rows
+from jobs.loadgen import percentile
+from jobs.management.commands.seed_data import Seeder
+from jobs.models import JobPost, JobVector
+from users.models import User
+
+PREFIX = 'bench-recommend-'
+
+
+class Command(BaseCommand):
+    help = (
+        'Grow the catalogue to --jobs active postings and time top-K '
+        'recommendations for seekers with random application histories.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=100000)
+        parser.add_argument('--seekers', type=int, default=200, help='Profiles to time.')
+        parser.add_argument('--k', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--keep', action='store_true', help='Keep the generated rows.')
+
+    def handle(self, *args, **options):
+        rnd = random.Random(options['seed'])
+        seeder = Seeder(prefix=PREFIX, seed=options['seed'])
+        employer, _ = User.objects.get_or_create(
+            username=PREFIX + 'employer', defaults={'role': User.IS_EMPLOYER, 'company_name': 'Bench'},
+        )
+        try:
+            missing = options['jobs'] - JobPost.objects.filter(is_active=True).count()
+            if missing > 0:
+                started = time.perf_counter()
+                seeder.bulk_create(JobPost, (
+                    seeder.make_job(employer.pk, employer.company_name) for _ in range(missing)
+                ))
+                count = recommend.rebuild_vectors()
+                self.stdout.write('Added %d jobs, %d vectors in %.1fs' % (
+                    missing, count, time.perf_counter() - started))
+
+            recommend.index.reset()
+            started = time.perf_counter()
+            snapshot = recommend.index.refresh()
+            self.stdout.write('Index of %d vectors (%d active) loaded in %.2fs' % (
+                len(snapshot), snapshot.active.sum(), time.perf_counter() - started))
+
+            job_ids = list(JobVector.objects.filter(is_active=True).values_list('job_id', flat=True))
+            latencies = []
+            for _ in range(options['seekers']):
+                applied = rnd.sample(job_ids, min(len(job_ids), rnd.randint(1, 20)))
+                profile = list(JobVector.objects.filter(job_id__in=applied).values(
+                    'job_id', 'terms', 'counts', 'category', 'location', 'salary_min',
+                ))
+                started = time.perf_counter()
+                recommend.index.recommend(profile, k=options['k'])
+                latencies.append(time.perf_counter() - started)
+            self.stdout.write('top-%d scoring over %d jobs: p50 %.2fms  p95 %.2fms  max %.2fms' % (
+                options['k'], len(snapshot), percentile(latencies, 50) * 1000,
+                percentile(latencies, 95) * 1000, max(latencies) * 1000,
+            ))
+        finally:
+            if not options['keep']:
+                # The rows never went through the signals, so skip them on the way out too
+                delete_rows(JobPost.objects.filter(employer=employer))
+                employer.delete()
+                recommend.rebuild_vectors()
+                page_cache.bump(page_cache.LIST_VERSION)
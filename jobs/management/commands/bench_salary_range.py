@@ -0,0 +1,99 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from jobs import page_cache, salary_range
+from jobs.db import delete_rows
+from jobs.filters import JobFilter
+from jobs.loadgen import percentile
+from jobs.management.commands.seed_data import Seeder
+from jobs.models import JobPost
+from users.models import User
+
+PREFIX = 'bench-salary-'
+
+
+def full_scans(queryset):
+    """Plan lines that read all of jobs_jobpost."""
+    plan = queryset.explain()
+    if connection.vendor == 'postgresql':
+        return [line for line in plan.splitlines() if 'Seq Scan on jobs_jobpost ' in line]
+    return [
+        line for line in plan.splitlines()
+        if 'SCAN jobs_jobpost' in line and 'USING' not in line and 'VIRTUAL TABLE' not in line
+    ]
+
+
+def time_queries(params_list, naive=False):
+    """Latencies (seconds) of fetching the first page for each set of filter params."""
+    saved = salary_range._backends.get(connection.alias)
+    if naive:
+        salary_range._backends[connection.alias] = None
+    try:
+        latencies = []
+        for params in params_list:
+            queryset = JobFilter(params, queryset=JobPost.objects.filter(is_active=True)).qs
+            started = time.perf_counter()
+            list(queryset.order_by('-created_at', '-id').values_list('id', flat=True)[:20])
+            latencies.append(time.perf_counter() - started)
+        return latencies
+    finally:
+        salary_range._backends.pop(connection.alias, None)
+        if saved is not None:
+            salary_range._backends[connection.alias] = saved
+
+
+class Command(BaseCommand):
+    help = (
+        'Grow jobs_jobpost in steps and time salary range queries (overlap, '
+        'within, contains) through the range index and through plain column '
+        'comparisons, checking the indexed plans never scan the table.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10000,50000,200000',
+                            help='Comma-separated numbers of benchmark rows to grow to.')
+        parser.add_argument('--queries', type=int, default=50, help='Queries per mode and size.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--keep', action='store_true', help='Keep the generated rows.')
+
+    def handle(self, *args, **options):
+        rnd = random.Random(options['seed'])
+        seeder = Seeder(prefix=PREFIX, seed=options['seed'])
+        employer, _ = User.objects.get_or_create(
+            username=PREFIX + 'employer', defaults={'role': User.IS_EMPLOYER, 'company_name': 'Bench'},
+        )
+        self.stdout.write('range index: %s' % (salary_range.range_backend() or 'none'))
+        self.stdout.write('%9s %-9s %10s %10s %10s %10s  %s' % (
+            'rows', 'mode', 'idx p50', 'idx p95', 'naive p50', 'naive p95', 'plan'))
+        try:
+            created = 0
+            for size in [int(size) for size in options['sizes'].split(',')]:
+                seeder.bulk_create(JobPost, (
+                    seeder.make_job(employer.pk, employer.company_name) for _ in range(size - created)
+                ))
+                created = max(created, size)
+                for mode, _ in salary_range.MODES:
+                    params_list = []
+                    for _ in range(options['queries']):
+                        low = rnd.randint(20, 150)
+                        params_list.append({
+                            'salary_from': low, 'salary_to': low + rnd.randint(5, 60), 'salary_mode': mode,
+                        })
+                    indexed = time_queries(params_list)
+                    naive = time_queries(params_list, naive=True)
+                    scans = full_scans(JobFilter(params_list[0], queryset=JobPost.objects.all()).qs)
+                    self.stdout.write('%9d %-9s %10.2f %10.2f %10.2f %10.2f  %s' % (
+                        JobPost.objects.count(), mode,
+                        percentile(indexed, 50) * 1000, percentile(indexed, 95) * 1000,
+                        percentile(naive, 50) * 1000, percentile(naive, 95) * 1000,
+                        'FULL SCAN' if scans else 'indexed',
+                    ))
+        finally:
+            if not options['keep']:
+                # The rows never went through the signals, so skip them on the way out too
+                delete_rows(JobPost.objects.filter(employer=employer))
+                employer.delete()
+                page_cache.bump(page_cache.LIST_VERSION)
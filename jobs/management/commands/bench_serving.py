@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.loadgen import gunicorn_server, run_load
+from jobs.models import JobPost
+
+
+class Command(BaseCommand):
+    help = (
+        'Start gunicorn in WSGI and in ASGI (uvicorn worker) mode and compare '
+        'requests/sec and tail latency of the read-heavy pages at rising concurrency.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modes', default='wsgi,asgi')
+        parser.add_argument('--concurrency', default='1,8,32,64',
+                            help='Comma-separated client concurrency levels.')
+        parser.add_argument('--duration', type=float, default=10.0,
+                            help='Seconds per concurrency level.')
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument('--threads', type=int, default=4,
+                            help='Threads per sync (WSGI) worker.')
+        parser.add_argument('--paths', help='Comma-separated paths (default: homepage, list, detail).')
+
+    def default_paths(self):
+        paths = ['/', '/jobs/']
+        job = JobPost.objects.filter(is_active=True).order_by('-created_at').first()
+        if job:
+            paths.append('/jobs/job/%d/' % job.pk)
+        return paths
+
+    def handle(self, *args, **options):
+        paths = options['paths'].split(',') if options['paths'] else self.default_paths()
+        levels = [int(level) for level in options['concurrency'].split(',')]
+
+        self.stdout.write('Paths: %s' % ', '.join(paths))
+        self.stdout.write('%-5s %6s %9s %9s %9s %9s %7s' % (
+            'mode', 'conc', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'errors'))
+
+        for mode in options['modes'].split(','):
+            if mode not in ('wsgi', 'asgi'):
+                raise CommandError('Unknown mode %r' % mode)
+            try:
+                server = gunicorn_server(settings.BASE_DIR, mode, options['workers'], options['threads'])
+                with server as base_url:
+                    for level in levels:
+                        result = run_load(base_url, paths, concurrency=level, duration=options['duration'])
+                        self.stdout.write('%-5s %6d %9.1f %9.1f %9.1f %9.1f %7d' % (
+                            mode, level, result['rps'], result['p50_ms'], result['p95_ms'],
+                            result['p99_ms'], result['errors']))
+                        bad = {status: n for status, n in result['statuses'].items() if status >= 400}
+                        if bad:
+                            self.stderr.write('  non-2xx/3xx responses: %s' % bad)
+            except RuntimeError as exc:
+                raise CommandError(str(exc))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs import bulk
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "Stream an employer's job posts out as CSV or JSON Lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employer', required=True, help='Username of the employer.')
+        parser.add_argument('--format', choices=bulk.FORMATS, default='csv')
+        parser.add_argument('--output', help='File to write to (default: stdout).')
+        parser.add_argument('--chunk-size', type=int, default=bulk.DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            employer = User.objects.get(username=options['employer'], role=User.IS_EMPLOYER)
+        except User.DoesNotExist:
+            raise CommandError('No employer named %r' % options['employer'])
+
+        chunks = bulk.export_jobs(employer, options['format'], options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as out:
+                out.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
@@ -0,0 +1,40 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs import bulk
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Bulk-create job posts for an employer from a CSV or JSON Lines file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for stdin.")
+        parser.add_argument('--employer', required=True, help='Username of the employer.')
+        parser.add_argument('--format', choices=bulk.FORMATS,
+                            help='Defaults to the file extension.')
+        parser.add_argument('--batch-size', type=int, default=bulk.DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            employer = User.objects.get(username=options['employer'], role=User.IS_EMPLOYER)
+        except User.DoesNotExist:
+            raise CommandError('No employer named %r' % options['employer'])
+
+        path = options['path']
+        fmt = options['format'] or path.rsplit('.', 1)[-1].lower()
+        if fmt not in bulk.FORMATS:
+            raise CommandError('Cannot tell the format of %r; pass --format' % path)
+
+        if path == '-':
+            report = bulk.import_jobs(employer, sys.stdin, fmt, options['batch_size'])
+        else:
+            with open(path, newline='', encoding='utf-8-sig') as stream:
+                report = bulk.import_jobs(employer, stream, fmt, options['batch_size'])
+
+        for error in report['errors']:
+            self.stderr.write('line %d: %s' % (error['line'], json.dumps(error['errors'])))
+        self.stdout.write('Created %d job posts, %d rows rejected.' % (
+            report['created'], len(report['errors'])))
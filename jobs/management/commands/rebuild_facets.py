@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from jobs import facets
+
+
+class Command(BaseCommand):
+    help = (
+        'Recount the search facet summary table from JobPost. Signals keep it '
+        'current; run this after bulk changes that bypass them.'
+    )
+
+    def handle(self, *args, **options):
+        rows = facets.rebuild()
+        self.stdout.write('Rebuilt %d facet rows' % rows)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from jobs import recommend
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the recommendation vectors of every job. The task worker '
+        'keeps them current; run this after changes that bypass the signals.'
+    )
+
+    def handle(self, *args, **options):
+        count = recommend.rebuild_vectors()
+        self.stdout.write('Rebuilt %d job vectors' % count)
@@ -0,0 +1,86 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs import benchmark
+from jobs.loadgen import gunicorn_server
+
+
+class Command(BaseCommand):
+    help = (
+        'Request every route in jobs/urls.py and users/urls.py and report throughput, '
+        'latency percentiles and query counts, optionally against a saved baseline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=('client', 'http'), default='client',
+                            help='In-process test client, or HTTP load against gunicorn.')
+        parser.add_argument('--routes', help='Comma-separated route labels (default: all).')
+        parser.add_argument('--iterations', type=int, default=50, help='Client mode: requests per route.')
+        parser.add_argument('--warmup', type=int, default=3, help='Client mode: untimed requests per route.')
+        parser.add_argument('--concurrency', type=int, default=8, help='HTTP mode: concurrent clients.')
+        parser.add_argument('--duration', type=float, default=5.0, help='HTTP mode: seconds per route.')
+        parser.add_argument('--processes', type=int, default=0,
+                            help='HTTP mode: spread the clients over this many processes.')
+        parser.add_argument('--url', help='HTTP mode: benchmark this server instead of starting gunicorn.')
+        parser.add_argument('--server-mode', choices=('wsgi', 'asgi'), default='wsgi')
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument('--baseline', help='Compare against this baseline JSON; fail on regressions.')
+        parser.add_argument('--save-baseline', help='Write the results to this file.')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='Allowed relative p95/throughput change (default 0.2).')
+
+    def handle(self, *args, **options):
+        missing = benchmark.uncovered_routes()
+        if missing:
+            self.stderr.write('Not benchmarked: %s' % ', '.join(sorted(missing)))
+        try:
+            fixtures = benchmark.Fixtures()
+        except LookupError as exc:
+            raise CommandError(str(exc))
+        labels = set(options['routes'].split(',')) if options['routes'] else None
+
+        if options['mode'] == 'client':
+            results = benchmark.run_client(
+                fixtures, labels, iterations=options['iterations'], warmup=options['warmup'])
+        elif options['url']:
+            results = self.run_http(options['url'], fixtures, labels, options)
+        else:
+            try:
+                server = gunicorn_server(settings.BASE_DIR, options['server_mode'],
+                                         options['workers'], options['threads'])
+                with server as base_url:
+                    results = self.run_http(base_url, fixtures, labels, options)
+            except RuntimeError as exc:
+                raise CommandError(str(exc))
+
+        self.stdout.write('%-20s %9s %9s %9s %9s %8s  %s' % (
+            'route', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'queries', 'statuses'))
+        for label, result in results.items():
+            self.stdout.write('%-20s %9.1f %9.1f %9.1f %9.1f %8s  %s' % (
+                label, result['rps'], result['p50_ms'], result['p95_ms'], result['p99_ms'],
+                '-' if result['queries'] is None else result['queries'], result['statuses']))
+
+        report = {'mode': options['mode'], 'routes': results}
+        if options['save_baseline']:
+            with open(options['save_baseline'], 'w') as fh:
+                json.dump(report, fh, indent=2, sort_keys=True)
+        if options['baseline']:
+            with open(options['baseline']) as fh:
+                baseline = json.load(fh)
+            if baseline.get('mode') != options['mode']:
+                raise CommandError('Baseline was recorded in %s mode' % baseline.get('mode'))
+            regressions = benchmark.compare(results, baseline, tolerance=options['tolerance'])
+            if regressions:
+                for line in regressions:
+                    self.stderr.write(line)
+                raise CommandError('%d regression(s) against %s' % (len(regressions), options['baseline']))
+            self.stdout.write('No regressions against %s' % options['baseline'])
+
+    def run_http(self, base_url, fixtures, labels, options):
+        return benchmark.run_http(
+            base_url, fixtures, labels, concurrency=options['concurrency'],
+            duration=options['duration'], processes=options['processes'],
+        )
@@ -0,0 +1,257 @@
+import bisect
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connections, router, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from jobs import facets, page_cache, recommend, stats
+from jobs.db import delete_rows
+from jobs.models import Application, JobPost
+from users.models import User
+
+PREFIX = 'seed-'
+PASSWORD = 'seed-password'
+
+CATEGORIES = {'tech': 40, 'health': 20, 'biz': 20, 'edu': 10, 'other': 10}
+ROLES = {
+    'tech': ['Backend Developer', 'Frontend Engineer', 'Data Engineer', 'DevOps Engineer', 'QA Analyst'],
+    'health': ['Staff Nurse', 'Pharmacist', 'Lab Technician', 'Physiotherapist'],
+    'biz': ['Account Manager', 'Business Analyst', 'Sales Executive', 'Financial Analyst'],
+    'edu': ['Mathematics Teacher', 'Lecturer', 'Curriculum Designer'],
+    'other': ['Office Administrator', 'Logistics Coordinator', 'Content Writer'],
+}
+LEVELS = ['Junior', '', '', 'Senior', 'Lead']
+# Listed roughly by size; picked with Zipf-like weights below
+CITIES = [
+    'Bengaluru', 'Mumbai', 'Delhi', 'Pune', 'Hyderabad', 'Chennai', 'Kolkata',
+    'Ahmedabad', 'Jaipur', 'Remote', 'Chandigarh', 'Kochi', 'Indore', 'Lucknow',
+    'Nagpur', 'Coimbatore', 'Bhopal', 'Surat', 'Mysuru', 'Noida',
+]
+CITY_WEIGHTS = [1 / (rank + 1) for rank in range(len(CITIES))]
+
+
+# Filled in by auto_now/auto_now_add on insert; set back to the generated
+# values afterwards
+TIMESTAMPS = {
+    JobPost: ['created_at', 'updated_at'],
+    Application: ['applied_at'],
+}
+
+
+def cumulative(weights):
+    total, out = 0, []
+    for weight in weights:
+        total += weight
+        out.append(total)
+    return out
+
+
+class Seeder:
+    def __init__(self, prefix=PREFIX, batch_size=5000, seed=None):
+        self.prefix = prefix
+        self.batch_size = batch_size
+        self.random = random.Random(seed)
+        self.now = timezone.now()
+
+    def create_users(self, count, role, name):
+        # Hashing is deliberately slow; every seeded account shares one hash.
+        password = make_password(PASSWORD)
+        users = (
+            User(
+                username='%s%s%d' % (self.prefix, name, i), password=password, role=role,
+                email='%s%d@example.com' % (name, i),
+                company_name='Seed Company %d' % i if role == User.IS_EMPLOYER else None,
+            )
+            for i in range(count)
+        )
+        self.bulk_create(User, users)
+        return list(
+            User.objects.filter(username__startswith=self.prefix + name)
+            .order_by('pk').values_list('pk', flat=True)
+        )
+
+    def bulk_create(self, model, objects):
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                self.insert(model, batch)
+                batch = []
+        if batch:
+            self.insert(model, batch)
+
+    def insert(self, model, batch):
+        fields = [model._meta.get_field(name) for name in TIMESTAMPS.get(model, [])]
+        # bulk_create() overwrites them with the current time
+        timestamps = [[getattr(obj, field.attname) for field in fields] for obj in batch]
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+            if fields:
+                self.backdate(model, fields, batch, timestamps)
+
+    def backdate(self, model, fields, objects, timestamps):
+        connection = connections[router.db_for_write(model)]
+        quote = connection.ops.quote_name
+        sql = 'UPDATE %s SET %s WHERE %s = %%s' % (
+            quote(model._meta.db_table),
+            ', '.join('%s = %%s' % quote(field.column) for field in fields),
+            quote(model._meta.pk.column),
+        )
+        params = [
+            [field.get_db_prep_value(value, connection) for field, value in zip(fields, values)] + [obj.pk]
+            for obj, values in zip(objects, timestamps)
+        ]
+        for obj, values in zip(objects, timestamps):
+            for field, value in zip(fields, values):
+                setattr(obj, field.attname, value)
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, params)
+
+    def make_job(self, employer_id, company_name):
+        rnd = self.random
+        category = rnd.choices(list(CATEGORIES), weights=list(CATEGORIES.values()))[0]
+        title = ('%s %s' % (rnd.choice(LEVELS), rnd.choice(ROLES[category]))).strip()
+        # Most postings are recent; a long tail goes back two years.
+        created_at = self.now - timedelta(days=min(rnd.expovariate(1 / 90), 730),
+                                          seconds=rnd.randrange(86400))
+        age_days = (self.now - created_at).days
+        salary_min = int(rnd.lognormvariate(4.0, 0.5))
+        job = JobPost(
+            employer_id=employer_id,
+            title=title,
+            category=category,
+            description='%s role. %s' % (title, 'We are hiring. ' * rnd.randint(3, 30)),
+            location=rnd.choices(CITIES, weights=CITY_WEIGHTS)[0],
+            salary_min=salary_min,
+            salary_max=salary_min + int(salary_min * rnd.uniform(0.1, 0.6)),
+            is_active=rnd.random() < (0.95 if age_days < 60 else 0.4),
+            created_at=created_at,
+            updated_at=created_at,
+        )
+        job.set_company_name(company_name)
+        job.set_location(job.location)
+        return job
+
+    def create_jobs(self, employer_ids, count):
+        # A few employers post most of the jobs (Pareto-distributed activity).
+        employer_weights = cumulative(self.random.paretovariate(1.2) for _ in employer_ids)
+        company_names = dict(User.objects.filter(pk__in=employer_ids).values_list('pk', 'company_name'))
+        jobs = []
+
+        def generate():
+            for _ in range(count):
+                employer_id = self.random.choices(employer_ids, cum_weights=employer_weights)[0]
+                job = self.make_job(employer_id, company_names[employer_id])
+                jobs.append((job, job.created_at))
+                yield job
+
+        self.bulk_create(JobPost, generate())
+        return [(job.pk, created_at) for job, created_at in jobs]
+
+    def create_applications(self, seeker_ids, jobs, count):
+        """About ``count`` applications; popular and recent jobs attract more."""
+        if not jobs or not seeker_ids:
+            return 0
+        rnd = self.random
+        job_weights = cumulative(
+            rnd.paretovariate(1.5) / (1 + (self.now - created_at).days / 30)
+            for _, created_at in jobs
+        )
+        per_seeker = count / len(seeker_ids)
+        created = 0
+
+        def generate():
+            nonlocal created
+            for seeker_id in seeker_ids:
+                if created >= count:
+                    return
+                wanted = min(len(jobs), int(rnd.expovariate(1 / per_seeker)) if per_seeker else 0)
+                picked = set()
+                for _ in range(wanted):
+                    index = bisect.bisect(job_weights, rnd.random() * job_weights[-1])
+                    picked.add(min(index, len(jobs) - 1))
+                for index in picked:
+                    job_id, created_at = jobs[index]
+                    window = max(1, int((self.now - created_at).total_seconds()))
+                    applied_at = created_at + timedelta(seconds=rnd.randrange(min(window, 30 * 86400)))
+                    created += 1
+                    yield Application(
+                        job_id=job_id, applicant_id=seeker_id, applied_at=applied_at,
+                        status=rnd.choices(['APPLIED', 'REVIEWED', 'REJECTED'], weights=[80, 15, 5])[0],
+                    )
+
+        self.bulk_create(Application, generate())
+        return created
+
+    def refresh_counters(self):
+        # bulk_create bypasses the signals that maintain these.
+        counts = (
+            Application.objects.filter(job=OuterRef('pk'))
+            .order_by().values('job').annotate(n=Count('id')).values('n')
+        )
+        JobPost.objects.filter(employer__username__startswith=self.prefix).update(
+            applications_count=Coalesce(Subquery(counts), 0)
+        )
+        facets.rebuild()
+        recommend.rebuild_vectors()
+        stats.invalidate(stats.TOTAL_JOBS, stats.TOTAL_EMPLOYERS)
+        page_cache.bump(page_cache.LIST_VERSION)
+
+    def clear(self):
+        users = User.objects.filter(username__startswith=self.prefix)
+        # Raw deletes skip the per-row signals; counters are refreshed after.
+        delete_rows(Application.objects.filter(applicant__in=users))
+        delete_rows(Application.objects.filter(job__employer__in=users))
+        delete_rows(JobPost.objects.filter(employer__in=users))
+        users.delete()
+        facets.rebuild()
+        recommend.rebuild_vectors()
+        stats.invalidate(stats.TOTAL_JOBS, stats.TOTAL_EMPLOYERS)
+        page_cache.bump(page_cache.LIST_VERSION)
+
+    def run(self, employers, seekers, jobs, applications):
+        employer_ids = self.create_users(employers, User.IS_EMPLOYER, 'employer')
+        seeker_ids = self.create_users(seekers, User.IS_JOB_SEEKER, 'seeker')
+        job_rows = self.create_jobs(employer_ids, jobs)
+        created = self.create_applications(seeker_ids, job_rows, applications)
+        self.refresh_counters()
+        return {'employers': len(employer_ids), 'seekers': len(seeker_ids),
+                'jobs': len(job_rows), 'applications': created}
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed employers, seekers, job posts and applications with realistic '
+        'distributions for benchmarking. Seeded accounts use the password %r.' % PASSWORD
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employers', type=int, default=500)
+        parser.add_argument('--seekers', type=int, default=20000)
+        parser.add_argument('--jobs', type=int, default=100000)
+        parser.add_argument('--applications', type=int, default=500000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, help='Random seed, for repeatable data sets.')
+        parser.add_argument('--prefix', default=PREFIX, help='Username prefix of seeded accounts.')
+        parser.add_argument('--clear', action='store_true',
+                            help='Delete previously seeded rows (same prefix) first.')
+
+    def handle(self, *args, **options):
+        seeder = Seeder(prefix=options['prefix'], batch_size=options['batch_size'], seed=options['seed'])
+        if options['clear']:
+            seeder.clear()
+        started = time.perf_counter()
+        result = seeder.run(
+            options['employers'], options['seekers'], options['jobs'], options['applications'],
+        )
+        self.stdout.write(
+            'Seeded %(employers)d employers, %(seekers)d seekers, %(jobs)d jobs and '
+            '%(applications)d applications' % result
+            + ' in %.1fs' % (time.perf_counter() - started)
+        )
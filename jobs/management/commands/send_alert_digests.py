@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from jobs import alerts
+
+
+class Command(BaseCommand):
+    help = 'Email every seeker the saved-search matches they have not been sent yet, one digest each.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Users per transaction.')
+        parser.add_argument('--max-jobs', type=int, help='Postings listed per saved search.')
+        parser.add_argument('--schedule', action='store_true',
+                            help='Queue the recurring digest task for the run_tasks worker instead.')
+
+    def handle(self, *args, **options):
+        if options['schedule']:
+            queued = alerts.schedule()
+            self.stdout.write('Scheduled the digest task' if queued else 'The digest task is already queued')
+            return
+        emails, matches = alerts.send_digests(batch_size=options['batch_size'], max_jobs=options['max_jobs'])
+        self.stdout.write('Sent %d digests covering %d matches' % (emails, matches))
@@ -0,0 +1,136 @@
+import multiprocessing
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.db.models import Count
+from django.test import RequestFactory
+
+from jobs.loadgen import percentile
+from jobs.models import Application, JobPost
+from jobs.views import apply_to_job
+from users.models import User
+
+PREFIX = 'stress-apply-'
+
+
+def _apply(job_id, user):
+    """POST to apply_to_job as ``user``; returns the latency in seconds."""
+    request = RequestFactory().post('/jobs/job/%d/apply/' % job_id)
+    request.user = user
+    request._messages = CookieStorage(request)
+
+    started = time.perf_counter()
+    try:
+        response = apply_to_job(request, pk=job_id)
+    finally:
+        elapsed = time.perf_counter() - started
+        # Same connection handling as a real request under CONN_MAX_AGE
+        close_old_connections()
+    if response.status_code != 302:
+        raise RuntimeError('apply_to_job returned %s' % response.status_code)
+    return elapsed
+
+
+def _run_threads(pairs, threads):
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(lambda pair: _apply(*pair), pairs))
+
+
+def _run_process(args):
+    return _run_threads(*args)
+
+
+def setup_fixtures(jobs, seekers):
+    employer, _ = User.objects.get_or_create(
+        username=PREFIX + 'employer', defaults={'role': User.IS_EMPLOYER}
+    )
+    job_ids = [
+        JobPost.objects.create(
+            employer=employer, title='Stress test %d' % i, description='-', location='-'
+        ).pk
+        for i in range(jobs)
+    ]
+    user_ids = [
+        User.objects.get_or_create(username='%sseeker%d' % (PREFIX, i))[0].pk
+        for i in range(seekers)
+    ]
+    return job_ids, user_ids
+
+
+def run(jobs=5, seekers=20, repeat=10, threads=32, processes=0):
+    """
+    Fire ``repeat`` simultaneous applies for every (job, seeker) pair and
+    check that exactly one Application row exists per pair afterwards.
+    """
+    job_ids, user_ids = setup_fixtures(jobs, seekers)
+    # Loaded once up front, so the timed applies don't include user lookups
+    users = User.objects.in_bulk(user_ids)
+    pairs = [(job_id, users[user_id]) for job_id in job_ids for user_id in user_ids] * repeat
+    random.shuffle(pairs)
+
+    started = time.perf_counter()
+    if processes:
+        chunks = [(pairs[i::processes], threads) for i in range(processes)]
+        # Forked children must not inherit open database connections.
+        connections.close_all()
+        with multiprocessing.get_context('fork').Pool(processes) as pool:
+            latencies = [value for chunk in pool.map(_run_process, chunks) for value in chunk]
+    else:
+        latencies = _run_threads(pairs, threads)
+    wall = time.perf_counter() - started
+
+    rows = (
+        Application.objects.filter(job_id__in=job_ids, applicant_id__in=user_ids)
+        .values('job', 'applicant').annotate(n=Count('id'))
+    )
+    duplicates = sum(1 for row in rows if row['n'] != 1)
+    return {
+        'requests': len(latencies),
+        'pairs': len(job_ids) * len(user_ids),
+        'rows': sum(row['n'] for row in rows),
+        'duplicates': duplicates,
+        'wall_s': wall,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+
+def cleanup():
+    JobPost.objects.filter(employer__username=PREFIX + 'employer').delete()
+    User.objects.filter(username__startswith=PREFIX).delete()
+
+
+class Command(BaseCommand):
+    help = 'Fire concurrent applies at apply_to_job and verify one Application per (job, seeker).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=5)
+        parser.add_argument('--seekers', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=10,
+                            help='Simultaneous applies per (job, seeker) pair.')
+        parser.add_argument('--threads', type=int, default=32)
+        parser.add_argument('--processes', type=int, default=0,
+                            help='Worker processes, each running --threads threads.')
+        parser.add_argument('--keep', action='store_true', help='Keep the generated rows.')
+
+    def handle(self, *args, **options):
+        try:
+            stats = run(
+                jobs=options['jobs'], seekers=options['seekers'], repeat=options['repeat'],
+                threads=options['threads'], processes=options['processes'],
+            )
+        finally:
+            if not options['keep']:
+                cleanup()
+
+        self.stdout.write(
+            '%(requests)d applies over %(pairs)d pairs in %(wall_s).2fs: '
+            '%(rows)d rows, p50 %(p50_ms).1fms, p99 %(p99_ms).1fms' % stats
+        )
+        if stats['duplicates'] or stats['rows'] != stats['pairs']:
+            raise CommandError('%d pairs do not have exactly one application' % stats['duplicates'])
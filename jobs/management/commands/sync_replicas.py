@@ -0,0 +1,48 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+def sync_replica(alias, source='default'):
+    """
+    Copy the ``source`` SQLite database into the SQLite file of replica
+    ``alias`` with the online backup API, so readers never see a torn copy.
+    """
+    primary, replica = connections[source], connections[alias]
+    if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+        raise CommandError(
+            '%s: only SQLite replicas can be copied; use the database\'s own replication' % alias
+        )
+    primary.ensure_connection()
+    target = sqlite3.connect(str(replica.settings_dict['NAME']))
+    try:
+        primary.connection.backup(target)
+    finally:
+        target.close()
+
+
+class Command(BaseCommand):
+    help = (
+        'Copy the primary SQLite database into the SQLite files configured as '
+        'replicas (DATABASE_REPLICA_URLS), once or every --every seconds, to '
+        'try replica routing locally.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--every', type=float,
+                            help='Keep copying at this interval (seconds), like a lagging replica.')
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError('No replicas configured; set DATABASE_REPLICA_URLS.')
+        while True:
+            for alias in settings.DATABASE_REPLICAS:
+                started = time.perf_counter()
+                sync_replica(alias)
+                self.stdout.write('Copied default to %s in %.2fs' % (alias, time.perf_counter() - started))
+            if not options['every']:
+                return
+            time.sleep(options['every'])
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.11 on 2026-10-17 17:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_jobpost_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['applicant', '-applied_at'], name='jobs_app_applicant_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='jobs_active_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['employer', '-created_at'], name='jobs_employer_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['category', 'salary_min'], name='jobs_category_salary_idx'),
+        ),
+    ]
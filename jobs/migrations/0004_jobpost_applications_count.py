@@ -0,0 +1,31 @@
+# Generated by Django 4.2.11 on 2026-10-17 17:53
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_applications_count(apps, schema_editor):
+    JobPost = apps.get_model('jobs', 'JobPost')
+    Application = apps.get_model('jobs', 'Application')
+    counts = (
+        Application.objects.filter(job=OuterRef('pk'))
+        .order_by().values('job').annotate(n=Count('id')).values('n')
+    )
+    JobPost.objects.update(applications_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpost',
+            name='applications_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_applications_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.11 on 2026-10-17 17:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_jobpost_applications_count'),
+    ]
+
+    # The named constraint replaces unique_together from 0001_initial, and is
+    # added first so (job, applicant) stays unique at every step. That also
+    # means there are no duplicates to clean up before creating it.
+    operations = [
+        migrations.AddConstraint(
+            model_name='application',
+            constraint=models.UniqueConstraint(fields=('job', 'applicant'), name='jobs_app_unique_job_applicant'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='application',
+            unique_together=set(),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.11 on 2026-10-17 17:55
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    JobPost = apps.get_model('jobs', 'JobPost')
+    JobPost.objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_application_unique_job_applicant'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpost',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.11 on 2026-10-17 18:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_company_names(apps, schema_editor):
+    JobPost = apps.get_model('jobs', 'JobPost')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    employers = User.objects.filter(pk__in=JobPost.objects.values('employer'))
+    for pk, name in employers.values_list('pk', 'company_name').iterator():
+        # Same normalization as jobs.models.normalize_company_name
+        JobPost.objects.filter(employer_id=pk).update(
+            company_name=name or '', company_key=' '.join((name or '').split()).casefold(),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_jobpost_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpost',
+            name='company_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='jobpost',
+            name='company_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['company_key'], name='jobs_company_key_idx'),
+        ),
+        migrations.RunPython(backfill_company_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.11 on 2026-10-17 18:11
+
+from django.db import migrations, models
+from django.db.models import Case, Count, IntegerField, Value, When
+
+# jobs.models.SALARY_BANDS at the time of this migration
+SALARY_BANDS = (0, 25, 50, 75, 100, 150, 200)
+
+
+def populate_facet_counts(apps, schema_editor):
+    JobPost = apps.get_model('jobs', 'JobPost')
+    JobFacetCount = apps.get_model('jobs', 'JobFacetCount')
+    band = Case(
+        *[When(salary_min__gte=edge, then=Value(edge)) for edge in reversed(SALARY_BANDS)],
+        output_field=IntegerField(),
+    )
+    grouped = (
+        JobPost.objects.filter(is_active=True).order_by().annotate(band=band)
+        .values_list('category', 'band', 'location').annotate(n=Count('id'))
+    )
+    JobFacetCount.objects.bulk_create([
+        JobFacetCount(category=category, salary_band=edge, location=location, count=n)
+        for category, edge, location, n in grouped.iterator()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_jobpost_company_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=20)),
+                ('salary_band', models.PositiveIntegerField()),
+                ('location', models.CharField(max_length=100)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['location'], name='jobs_location_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='jobfacetcount',
+            constraint=models.UniqueConstraint(fields=('category', 'salary_band', 'location'), name='jobs_facet_unique_key'),
+        ),
+        migrations.RunPython(populate_facet_counts, migrations.RunPython.noop),
+    ]
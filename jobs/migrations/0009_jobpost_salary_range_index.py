@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from jobs import salary_range
+
+
+def install_salary_index(apps, schema_editor):
+    salary_range.install(schema_editor.connection)
+
+
+def uninstall_salary_index(apps, schema_editor):
+    salary_range.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_facet_counts'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_salary_index, uninstall_salary_index),
+    ]
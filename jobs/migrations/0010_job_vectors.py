@@ -0,0 +1,51 @@
+# Generated by Django 4.2.11 on 2026-10-17 18:24
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def populate_job_vectors(apps, schema_editor):
+    # term_counts() is a pure function of the text, so it is safe to use here
+    from jobs.recommend import term_counts
+
+    JobPost = apps.get_model('jobs', 'JobPost')
+    JobVector = apps.get_model('jobs', 'JobVector')
+    now = timezone.now()
+    batch = []
+    fields = ('id', 'title', 'description', 'category', 'location', 'salary_min', 'is_active')
+    for pk, title, description, category, location, salary_min, is_active in (
+        JobPost.objects.values_list(*fields).iterator(chunk_size=2000)
+    ):
+        terms, counts = term_counts(title, description)
+        batch.append(JobVector(
+            job_id=pk, terms=terms.tobytes(), counts=counts.tobytes(), category=category,
+            location=location, salary_min=salary_min, is_active=is_active, updated_at=now,
+        ))
+        if len(batch) >= 2000:
+            JobVector.objects.bulk_create(batch)
+            batch = []
+    JobVector.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_jobpost_salary_range_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobVector',
+            fields=[
+                ('job_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('terms', models.BinaryField(default=b'')),
+                ('counts', models.BinaryField(default=b'')),
+                ('category', models.CharField(blank=True, default='', max_length=20)),
+                ('location', models.CharField(blank=True, default='', max_length=100)),
+                ('salary_min', models.PositiveIntegerField(default=0)),
+                ('is_active', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+        ),
+        migrations.RunPython(populate_job_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.11 on 2026-10-17 18:28
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('jobs', '0010_job_vectors'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedJobPost',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200)),
+                ('category', models.CharField(choices=[('tech', 'Technology'), ('health', 'Healthcare'), ('biz', 'Business'), ('edu', 'Education'), ('other', 'Other')], default='other', max_length=20)),
+                ('description', models.TextField()),
+                ('location', models.CharField(max_length=100)),
+                ('salary_min', models.PositiveIntegerField(default=0)),
+                ('salary_max', models.PositiveIntegerField(default=0)),
+                ('is_active', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('applications_count', models.PositiveIntegerField(default=0)),
+                ('company_name', models.CharField(blank=True, default='', max_length=100)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('employer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedApplication',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('applied_at', models.DateTimeField()),
+                ('status', models.CharField(default='APPLIED', max_length=20)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('applicant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='applications', to='jobs.archivedjobpost')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='archivedjobpost',
+            index=models.Index(fields=['employer', '-created_at'], name='jobs_archived_employer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedapplication',
+            index=models.Index(fields=['applicant', '-applied_at'], name='jobs_archived_app_idx'),
+        ),
+    ]
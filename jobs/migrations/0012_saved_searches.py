@@ -0,0 +1,61 @@
+# Generated by Django 4.2.11 on 2026-10-17 18:42
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('jobs', '0011_archive_tables'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('query', models.CharField(blank=True, default='', max_length=500)),
+                ('keywords', models.CharField(blank=True, default='', max_length=200)),
+                ('category', models.CharField(blank=True, default='', max_length=20)),
+                ('company_key', models.CharField(blank=True, default='', max_length=100)),
+                ('location', models.CharField(blank=True, default='', max_length=100)),
+                ('salary_min', models.PositiveIntegerField(blank=True, null=True)),
+                ('salary_from', models.PositiveIntegerField(blank=True, null=True)),
+                ('salary_to', models.PositiveIntegerField(blank=True, null=True)),
+                ('salary_mode', models.CharField(blank=True, default='', max_length=10)),
+                ('anchor', models.CharField(max_length=210)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AlertMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('notified_at', models.DateTimeField(blank=True, null=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='jobs.jobpost')),
+                ('saved_search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='jobs.savedsearch')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='savedsearch',
+            index=models.Index(fields=['anchor', 'category', 'location', 'company_key', 'salary_min', 'keywords', 'salary_from', 'salary_to', 'salary_mode'], name='jobs_savedsearch_match_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='savedsearch',
+            index=models.Index(fields=['user', '-created_at'], name='jobs_savedsearch_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alertmatch',
+            index=models.Index(condition=models.Q(('notified_at__isnull', True)), fields=['saved_search'], name='jobs_alertmatch_pending_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='alertmatch',
+            constraint=models.UniqueConstraint(fields=('saved_search', 'job'), name='jobs_alertmatch_unique'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.11 on 2026-10-17 18:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_saved_searches'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='application',
+            name='status',
+            field=models.CharField(choices=[('APPLIED', 'Applied'), ('REVIEWED', 'Reviewed'), ('SHORTLISTED', 'Shortlisted'), ('REJECTED', 'Rejected'), ('HIRED', 'Hired')], default='APPLIED', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='archivedapplication',
+            name='status',
+            field=models.CharField(choices=[('APPLIED', 'Applied'), ('REVIEWED', 'Reviewed'), ('SHORTLISTED', 'Shortlisted'), ('REJECTED', 'Rejected'), ('HIRED', 'Hired')], default='APPLIED', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'status', '-applied_at', '-id'], name='jobs_app_job_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', '-applied_at', '-id'], name='jobs_app_job_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.11 on 2026-10-17 18:52
+
+from django.db import migrations, models
+
+from jobs import gazetteer, geo
+
+
+def backfill_coordinates(apps, schema_editor):
+    JobPost = apps.get_model('jobs', 'JobPost')
+    # Location texts are left as typed; only the places the gazetteer knows
+    # get their city and coordinates.
+    for location in JobPost.objects.order_by().values_list('location', flat=True).distinct().iterator():
+        place = gazetteer.lookup(location)
+        if place is not None:
+            JobPost.objects.filter(location=location).update(
+                city_key=place.key, latitude=place.latitude, longitude=place.longitude,
+            )
+
+
+def install_geo_index(apps, schema_editor):
+    geo.install(schema_editor.connection)
+
+
+def uninstall_geo_index(apps, schema_editor):
+    geo.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_application_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpost',
+            name='city_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='jobpost',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobpost',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_coordinates, migrations.RunPython.noop),
+        migrations.RunPython(install_geo_index, uninstall_geo_index),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.11 on 2026-10-17 19:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+import jobs.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0014_jobpost_geo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobPostSearch',
+            fields=[
+                ('job', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='jobs.jobpost')),
+                ('document', jobs.models.FTSDocumentField(db_column='jobs_jobpost_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'jobs_jobpost_fts',
+                'managed': False,
+            },
+        ),
+    ]
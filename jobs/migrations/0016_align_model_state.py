@@ -0,0 +1,50 @@
+# Generated by Django 4.2.11 on 2026-10-17 19:09
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('jobs', '0015_jobpostsearch'),
+    ]
+
+    # The models had drifted from 0001_initial before the indexing work
+    # (related_names and category choices changed, salaries became
+    # positive-only); this records those changes on their own. The
+    # applications' cover_letter column is kept, archived along with them.
+    operations = [
+        migrations.AddField(
+            model_name='archivedapplication',
+            name='cover_letter',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='applicant',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='jobpost',
+            name='category',
+            field=models.CharField(choices=[('tech', 'Technology'), ('health', 'Healthcare'), ('biz', 'Business'), ('edu', 'Education'), ('other', 'Other')], default='other', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='jobpost',
+            name='employer',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='jobpost',
+            name='salary_max',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='jobpost',
+            name='salary_min',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,117 @@
+# Generated by Django 4.2.11 on 2026-10-17 22:30
+
+from django.db import migrations, models
+from django.db.models import Case, Count, IntegerField, Value, When
+from django.http import QueryDict
+
+from jobs import gazetteer
+
+# jobs.models.SALARY_BANDS at the time of this migration
+SALARY_BANDS = (0, 25, 50, 75, 100, 150, 200)
+
+
+def rebuild_facets(apps, field):
+    """Same as facets.rebuild(), grouping jobs by ``field``."""
+    JobPost = apps.get_model('jobs', 'JobPost')
+    JobFacetCount = apps.get_model('jobs', 'JobFacetCount')
+    band = Case(
+        *[When(salary_min__gte=edge, then=Value(edge)) for edge in reversed(SALARY_BANDS)],
+        output_field=IntegerField(),
+    )
+    grouped = (
+        JobPost.objects.filter(is_active=True).order_by().annotate(band=band)
+        .values_list('category', 'band', field).annotate(n=Count('id'))
+    )
+    rows = [
+        JobFacetCount(category=category, salary_band=edge, city_key=key, count=n)
+        for category, edge, key, n in grouped.iterator()
+    ]
+    JobFacetCount.objects.all().delete()
+    JobFacetCount.objects.bulk_create(rows, batch_size=1000)
+
+
+def fill_city_keys(apps, schema_editor):
+    # 0014 keyed only the places the gazetteer knows; the rest are keyed by
+    # their normalized text. Location texts are left as typed.
+    JobPost = apps.get_model('jobs', 'JobPost')
+    SavedSearch = apps.get_model('jobs', 'SavedSearch')
+    for location in list(JobPost.objects.filter(city_key='').values_list('location', flat=True).distinct()):
+        JobPost.objects.filter(city_key='', location=location).update(city_key=gazetteer.location_key(location))
+
+    # Saved searches held the location filter's text
+    for location in list(SavedSearch.objects.exclude(city_key='').values_list('city_key', flat=True).distinct()):
+        key = gazetteer.location_key(location)
+        if key != location:
+            searches = SavedSearch.objects.filter(city_key=location)
+            searches.filter(anchor='l:' + location).update(anchor='l:' + key)
+            searches.update(city_key=key)
+
+    rebuild_facets(apps, 'city_key')
+
+
+def restore_locations(apps, schema_editor):
+    JobPost = apps.get_model('jobs', 'JobPost')
+    SavedSearch = apps.get_model('jobs', 'SavedSearch')
+    JobPost.objects.filter(latitude__isnull=True).exclude(city_key='').update(city_key='')
+
+    for search in SavedSearch.objects.exclude(city_key='').only('query', 'city_key', 'anchor').iterator():
+        location = QueryDict(search.query).get('location', '').strip()
+        if search.anchor == 'l:' + search.city_key:
+            search.anchor = 'l:' + location
+        search.city_key = location
+        search.save(update_fields=['city_key', 'anchor'])
+
+    rebuild_facets(apps, 'location')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0016_align_model_state'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='jobfacetcount',
+            name='jobs_facet_unique_key',
+        ),
+        migrations.RemoveIndex(
+            model_name='jobpost',
+            name='jobs_location_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='savedsearch',
+            name='jobs_savedsearch_match_idx',
+        ),
+        migrations.RenameField(
+            model_name='jobfacetcount',
+            old_name='location',
+            new_name='city_key',
+        ),
+        migrations.RenameField(
+            model_name='savedsearch',
+            old_name='location',
+            new_name='city_key',
+        ),
+        migrations.RunPython(fill_city_keys, restore_locations),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['city_key'], name='jobs_city_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='savedsearch',
+            index=models.Index(
+                fields=[
+                    'anchor', 'category', 'city_key', 'company_key', 'salary_min',
+                    'keywords', 'salary_from', 'salary_to', 'salary_mode',
+                ],
+                name='jobs_savedsearch_match_idx',
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='jobfacetcount',
+            constraint=models.UniqueConstraint(
+                fields=('category', 'salary_band', 'city_key'), name='jobs_facet_unique_key',
+            ),
+        ),
+    ]
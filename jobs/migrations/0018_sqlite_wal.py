@@ -0,0 +1,26 @@
+# Generated by Django 4.2.11 on 2026-10-17 23:10
+
+from django.db import migrations
+
+
+def set_journal_mode(mode):
+    def operation(apps, schema_editor):
+        # Stored in the database file, so once is enough; SQLite can't switch
+        # in or out of WAL inside a transaction.
+        if schema_editor.connection.vendor == 'sqlite':
+            with schema_editor.connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode = %s' % mode)
+    return operation
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0017_city_keys'),
+    ]
+
+    operations = [
+        # Readers never block the writer; see core/backends/sqlite3.
+        migrations.RunPython(set_journal_mode('WAL'), set_journal_mode('DELETE')),
+    ]
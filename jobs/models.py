@@ -1,6 +1,23 @@
 from django.db import models
 from django.conf import settings
 
+from . import gazetteer
+
+
+# Lower edges (in K) of the salary bands the search sidebar counts jobs in
+SALARY_BANDS = (0, 25, 50, 75, 100, 150, 200)
+
+
+def salary_band(salary_min):
+    """Lower edge of the band ``salary_min`` falls in."""
+    return max(edge for edge in SALARY_BANDS if edge <= (salary_min or 0))
+
+
+def normalize_company_name(name):
+    """Lookup key for company filters: case-folded, whitespace collapsed."""
+    return ' '.join((name or '').split()).casefold()
+
+
 class JobPost(models.Model):
     CATEGORY_CHOICES = (
         ('tech', 'Technology'),
@@ -22,12 +39,289 @@ class JobPost(models.Model):
     
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Denormalized COUNT of applications, maintained by the task worker (tasks.py)
+    applications_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Copy of employer.company_name (renames are queued by signals.py) so listings
+    # can show and filter by company without joining users_user.
+    company_name = models.CharField(max_length=100, blank=True, default='', editable=False)
+    company_key = models.CharField(max_length=100, blank=True, default='', editable=False)
+
+    # Canonical city of ``location`` (its normalized text for places the
+    # bundled gazetteer doesn't know) and its coordinates, if known; see
+    # set_location. Facets, the location filter and alerts group by the key;
+    # geo.py indexes the coordinates for radius searches.
+    city_key = models.CharField(max_length=100, blank=True, default='', editable=False)
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Public listing: WHERE is_active ORDER BY created_at DESC, id DESC.
+            # Partial, because Django emits a bare `WHERE is_active` that a
+            # leading is_active column could not be searched with.
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(is_active=True),
+                name='jobs_active_recent_idx',
+            ),
+            # Employer dashboard
+            models.Index(fields=['employer', '-created_at'], name='jobs_employer_recent_idx'),
+            # Category + salary filters
+            models.Index(fields=['category', 'salary_min'], name='jobs_category_salary_idx'),
+            # Company filter (prefix range on the normalized name)
+            models.Index(fields=['company_key'], name='jobs_company_key_idx'),
+            # Location filter (the sidebar's location facet)
+            models.Index(fields=['city_key'], name='jobs_city_key_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember where the row is counted in JobFacetCount, so signals.py
+        # can move it when a save changes category, salary or location.
+        if not instance.get_deferred_fields():
+            instance._stored_facet_key = instance.facet_key()
+        return instance
+
+    def facet_key(self):
+        """(category, salary band, city key) of an active job, else None."""
+        if not self.is_active:
+            return None
+        return (self.category, salary_band(self.salary_min), self.city_key)
+
+    def set_company_name(self, name):
+        self.company_name = name or ''
+        self.company_key = normalize_company_name(name)
+
+    def set_location(self, location):
+        """Store ``location`` as typed, with its city key and coordinates if known."""
+        place = gazetteer.lookup(location)
+        self.location = location
+        if place is None:
+            self.city_key, self.latitude, self.longitude = gazetteer.normalize(location), None, None
+        else:
+            self.city_key, self.latitude, self.longitude = place.key, place.latitude, place.longitude
+
+    def save(self, *args, **kwargs):
+        # Later renames are pushed to existing rows by signals.py; bulk_create
+        # callers must call set_company_name() and set_location() themselves.
+        if self._state.adding and self.employer_id and not self.company_name:
+            self.set_company_name(self.employer.company_name)
+        if kwargs.get('update_fields') is None:
+            self.set_location(self.location)
+        super().save(*args, **kwargs)
+
+class FTSDocumentField(models.TextField):
+    """An FTS5 table's hidden column named after the table, which MATCH queries run against."""
+
+
+@FTSDocumentField.register_lookup
+class FTSMatch(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return '%s MATCH %s' % (lhs, rhs), lhs_params + rhs_params
+
+
+class JobPostSearch(models.Model):
+    """
+    The SQLite FTS5 index of JobPost (created by search.install, not by
+    migrations), so ranked searches can join it once and read bm25() from
+    its ``rank`` column. Read-only; absent on other databases.
+    """
+    job = models.OneToOneField(
+        JobPost, primary_key=True, db_column='rowid', db_constraint=False,
+        related_name='search_index', on_delete=models.DO_NOTHING,
+    )
+    document = FTSDocumentField(db_column='jobs_jobpost_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'jobs_jobpost_fts'
+
+class JobFacetCount(models.Model):
+    """
+    Number of active jobs per (category, salary band, city key); see facets.py.
+    Kept up to date through the task queue and rebuilt by rebuild_facets.
+    """
+    category = models.CharField(max_length=20)
+    salary_band = models.PositiveIntegerField()
+    city_key = models.CharField(max_length=100)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['category', 'salary_band', 'city_key'], name='jobs_facet_unique_key',
+            ),
+        ]
+
+    def __str__(self):
+        return '%s/%s/%s: %d' % (self.category, self.salary_band, self.city_key, self.count)
+
+class JobVector(models.Model):
+    """
+    Precomputed recommendation features of one job; see recommend.py. Rows
+    are rewritten by the task worker when a job changes and kept (emptied,
+    inactive) when it is deleted, so every process's in-memory index can
+    catch up by reading the rows changed since its last refresh.
+    """
+    job_id = models.BigIntegerField(primary_key=True)
+    # Hashed term ids (int32) and their counts (float32), as raw arrays
+    terms = models.BinaryField(default=b'')
+    counts = models.BinaryField(default=b'')
+    category = models.CharField(max_length=20, blank=True, default='')
+    location = models.CharField(max_length=100, blank=True, default='')
+    salary_min = models.PositiveIntegerField(default=0)
+    is_active = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return 'Vector of job %s' % self.job_id
+
 class Application(models.Model):
+    APPLIED = 'APPLIED'
+    REVIEWED = 'REVIEWED'
+    SHORTLISTED = 'SHORTLISTED'
+    REJECTED = 'REJECTED'
+    HIRED = 'HIRED'
+    STATUS_CHOICES = (
+        (APPLIED, 'Applied'),
+        (REVIEWED, 'Reviewed'),
+        (SHORTLISTED, 'Shortlisted'),
+        (REJECTED, 'Rejected'),
+        (HIRED, 'Hired'),
+    )
+
     job = models.ForeignKey(JobPost, related_name='applications', on_delete=models.CASCADE)
     applicant = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     applied_at = models.DateTimeField(auto_now_add=True)
-    status = models.CharField(max_length=20, default='APPLIED')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=APPLIED)
+    cover_letter = models.TextField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            # Seeker dashboard
+            models.Index(fields=['applicant', '-applied_at'], name='jobs_app_applicant_recent_idx'),
+            # Applicant tracking: one job's applications, newest first, by
+            # status (and the per-status counts) or all of them
+            models.Index(fields=['job', 'status', '-applied_at', '-id'], name='jobs_app_job_status_idx'),
+            models.Index(fields=['job', '-applied_at', '-id'], name='jobs_app_job_recent_idx'),
+        ]
+        constraints = [
+            # One application per seeker per job; apply_to_job relies on this
+            # instead of checking first.
+            models.UniqueConstraint(fields=['job', 'applicant'], name='jobs_app_unique_job_applicant'),
+        ]
+
+class ArchivedJobPost(models.Model):
+    """
+    A JobPost moved out of jobs_jobpost by archive.py, keeping its id. Only
+    the dashboards' history views read these.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    employer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    title = models.CharField(max_length=200)
+    category = models.CharField(max_length=20, choices=JobPost.CATEGORY_CHOICES, default='other')
+    description = models.TextField()
+    location = models.CharField(max_length=100)
+    salary_min = models.PositiveIntegerField(default=0)
+    salary_max = models.PositiveIntegerField(default=0)
+    is_active = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    applications_count = models.PositiveIntegerField(default=0)
+    company_name = models.CharField(max_length=100, blank=True, default='')
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['employer', '-created_at'], name='jobs_archived_employer_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+class ArchivedApplication(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    job = models.ForeignKey(ArchivedJobPost, related_name='applications', on_delete=models.CASCADE)
+    applicant = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    applied_at = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES, default=Application.APPLIED)
+    cover_letter = models.TextField(blank=True, null=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['applicant', '-applied_at'], name='jobs_archived_app_idx'),
+        ]
+
+class SavedSearch(models.Model):
+    """
+    A seeker's saved JobFilter query. New postings are matched against it by
+    alerts.py and the matches mailed out in digests.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='saved_searches', on_delete=models.CASCADE)
+    name = models.CharField(max_length=100)
+    # The job list querystring it was saved from, for the "show results" link
+    query = models.CharField(max_length=500, blank=True, default='')
+
+    # The query's criteria, parsed once when it is saved (alerts.criteria)
+    keywords = models.CharField(max_length=200, blank=True, default='')
+    category = models.CharField(max_length=20, blank=True, default='')
+    company_key = models.CharField(max_length=100, blank=True, default='')
+    city_key = models.CharField(max_length=100, blank=True, default='')
+    salary_min = models.PositiveIntegerField(null=True, blank=True)
+    salary_from = models.PositiveIntegerField(null=True, blank=True)
+    salary_to = models.PositiveIntegerField(null=True, blank=True)
+    salary_mode = models.CharField(max_length=10, blank=True, default='')
+
+    # The one term new postings look this search up by (alerts.anchor_term)
+    anchor = models.CharField(max_length=210)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Matching a posting: anchor lookups, with every column it checks
+            # included so the table itself is never read
+            models.Index(
+                fields=[
+                    'anchor', 'category', 'city_key', 'company_key', 'salary_min',
+                    'keywords', 'salary_from', 'salary_to', 'salary_mode',
+                ],
+                name='jobs_savedsearch_match_idx',
+            ),
+            models.Index(fields=['user', '-created_at'], name='jobs_savedsearch_user_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+class AlertMatch(models.Model):
+    """A posting that matched a SavedSearch; notified_at is set once it went out in a digest."""
+    saved_search = models.ForeignKey(SavedSearch, related_name='matches', on_delete=models.CASCADE)
+    job = models.ForeignKey(JobPost, related_name='+', on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    notified_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Digest runs: what is still to be sent
+            models.Index(
+                fields=['saved_search'],
+                condition=models.Q(notified_at__isnull=True),
+                name='jobs_alertmatch_pending_idx',
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['saved_search', 'job'], name='jobs_alertmatch_unique'),
+        ]
@@ -0,0 +1,153 @@
+# File: job_board_project_final/jobs/page_cache.py
+#
+# Whole-page cache for anonymous visitors.
+#
+# Cache keys include version counters (one for the listing, one per JobPost)
+# that signals.py bumps on every save/delete, so an edit makes the old entries
+# unreachable instead of having to find and delete them. Responses carry an
+# ETag and Last-Modified so browsers can revalidate with a 304.
+#
+# Misses are rendered from the primary database: a page read from a lagging
+# replica right after a bump would be cached under the new version.
+
+import hashlib
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from core.metrics import render_timer
+from core.routers import primary_reads
+
+LIST_VERSION = 'pages:jobs:version'
+
+
+def job_version_key(pk):
+    return 'pages:job:%s:version' % pk
+
+
+def get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # A fresh, never-used value: if the counter was evicted we must not
+        # fall back to a number that old page entries were stored under.
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def bump_many(keys):
+    """bump() for many keys in one cache round trip."""
+    # A fresh time_ns() is past any value the counters were incremented to,
+    # like the one bump() falls back to.
+    version = time.time_ns()
+    cache.set_many({key: version for key in keys}, None)
+
+
+class AnonymousPageCacheMixin:
+    """
+    Serve GET/HEAD requests from anonymous visitors out of the cache.
+
+    Views list the version keys their content depends on in
+    ``get_cache_version_keys`` and may return a datetime from
+    ``get_last_modified``.
+    """
+    page_cache_timeout = None
+
+    def get_cache_version_keys(self):
+        return [LIST_VERSION]
+
+    def get_last_modified(self, response):
+        return None
+
+    def is_page_cacheable(self, request):
+        return (
+            request.method in ('GET', 'HEAD')
+            and not request.user.is_authenticated
+            # Flash messages are rendered into the page
+            and 'messages' not in request.COOKIES
+        )
+
+    def get_page_cache_key(self, request):
+        versions = [str(get_version(key)) for key in self.get_cache_version_keys()]
+        params = sorted(request.GET.lists())
+        raw = '|'.join([request.path, repr(params)] + versions)
+        return 'pages:' + hashlib.md5(raw.encode()).hexdigest()
+
+    def lookup_page(self, request):
+        key = self.get_page_cache_key(request)
+        return key, cache.get(key)
+
+    def store_page(self, key, response):
+        """Cache a rendered 200 response; returns the entry or None."""
+        if response.status_code != 200 or not hasattr(response, 'render'):
+            return None
+        with render_timer(self.request):
+            response.render()
+        last_modified = self.get_last_modified(response)
+        entry = {
+            'content': response.content,
+            'content_type': response['Content-Type'],
+            'etag': '"%s"' % key.split(':')[1],
+            'last_modified': int(last_modified.timestamp()) if last_modified else None,
+        }
+        cache.set(key, entry, self.page_cache_timeout or settings.PAGE_CACHE_TTL)
+        return entry
+
+    def page_response(self, request, entry, response=None):
+        conditional = get_conditional_response(
+            request, etag=entry['etag'], last_modified=entry['last_modified'],
+        )
+        if conditional is not None:
+            response = conditional
+        elif response is None:
+            response = HttpResponse(entry['content'], content_type=entry['content_type'])
+
+        response['ETag'] = entry['etag']
+        if entry['last_modified']:
+            response['Last-Modified'] = http_date(entry['last_modified'])
+        patch_vary_headers(response, ['Cookie'])
+        patch_cache_control(response, max_age=0, must_revalidate=True)
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self._adispatch(request, *args, **kwargs)
+        if not self.is_page_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key, entry = self.lookup_page(request)
+        response = None
+        if entry is None:
+            with primary_reads():
+                response = super().dispatch(request, *args, **kwargs)
+                entry = self.store_page(key, response)
+            if entry is None:
+                return response
+        return self.page_response(request, entry, response)
+
+    async def _adispatch(self, request, *args, **kwargs):
+        # Same flow for async views; cache and session access stay in a thread.
+        if not await sync_to_async(self.is_page_cacheable)(request):
+            return await super().dispatch(request, *args, **kwargs)
+
+        key, entry = await sync_to_async(self.lookup_page)(request)
+        response = None
+        if entry is None:
+            with primary_reads():
+                response = await super().dispatch(request, *args, **kwargs)
+                entry = await sync_to_async(self.store_page)(key, response)
+            if entry is None:
+                return response
+        return self.page_response(request, entry, response)
@@ -0,0 +1,167 @@
+# File: job_board_project_final/jobs/pagination.py
+#
+# Keyset ("cursor") pagination. Instead of OFFSET, every page remembers the
+# ordering values of its first/last row and the next query seeks straight past
+# them, so page 5,000 costs the same index range scan as page 1.
+
+import base64
+import datetime
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import InvalidPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder truncates datetimes to milliseconds, which would make
+    # the cursor land between rows created in the same millisecond.
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def querystring_without_cursor(query_dict):
+    """The current filters, for building next/previous page links."""
+    params = query_dict.copy()
+    params.pop('cursor', None)
+    return params.urlencode()
+
+
+def _split(ordering):
+    """'-created_at' -> ('created_at', True)"""
+    return [(field.lstrip('-'), field.startswith('-')) for field in ordering]
+
+
+class CursorPage:
+    def __init__(self, paginator, object_list, has_next, has_previous):
+        self.paginator = paginator
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if self._has_next:
+            return self.paginator.encode(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if self._has_previous:
+            return self.paginator.encode(self.object_list[0], reverse=True)
+
+
+class CursorPaginator:
+    """
+    Paginates ``queryset`` by ``ordering``, which must end in a unique column
+    (normally the primary key) so that every row has a distinct position.
+    """
+
+    def __init__(self, queryset, per_page, ordering=('-created_at', '-id')):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self.keys = _split(self.ordering)
+
+    # --- Cursor encoding ---
+
+    def encode(self, obj, reverse=False):
+        """Cursor pointing at ``obj`` (a model instance or a .values() dict)."""
+        if isinstance(obj, dict):
+            values = [obj[name] for name, _ in self.keys]
+        else:
+            values = [getattr(obj, name) for name, _ in self.keys]
+        payload = json.dumps({'v': values, 'r': reverse}, cls=_CursorEncoder)
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            values, reverse = payload['v'], bool(payload['r'])
+            if len(values) != len(self.keys):
+                raise ValueError
+            return [self._to_python(name, value) for (name, _), value in zip(self.keys, values)], reverse
+        except (ValueError, TypeError, KeyError, ValidationError):
+            raise InvalidCursor('Invalid cursor')
+
+    def _to_python(self, name, value):
+        try:
+            field = self.queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Annotations (e.g. search_rank) are stored as plain JSON values.
+            return value
+        return field.to_python(value)
+
+    # --- Querying ---
+
+    def _seek(self, values, reverse):
+        """
+        Rows strictly after ``values`` in the (possibly reversed) ordering:
+        (a > x) OR (a = x AND b > y) OR ...
+
+        The leading ``a >= x`` is redundant logically but gives the database
+        a range to seek on instead of filtering the whole index.
+        """
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(self.keys, values):
+            lookup = 'lt' if descending != reverse else 'gt'
+            condition |= equal & Q(**{'%s__%s' % (name, lookup): value})
+            equal &= Q(**{name: value})
+
+        first, descending = self.keys[0]
+        bound = 'lte' if descending != reverse else 'gte'
+        return Q(**{'%s__%s' % (first, bound): values[0]}) & condition
+
+    def page_queryset(self, cursor=None):
+        """The ordered (and, past page one, seeked) queryset a page reads from."""
+        values, reverse = self.decode(cursor) if cursor else (None, False)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [field[1:] if field.startswith('-') else '-' + field for field in ordering]
+
+        queryset = self.queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, reverse))
+        return queryset
+
+    def page(self, cursor=None):
+        queryset = self.page_queryset(cursor)
+        return self._make_page(list(queryset[:self.per_page + 1]), cursor)
+
+    async def apage(self, cursor=None):
+        queryset = self.page_queryset(cursor)
+        return self._make_page([row async for row in queryset[:self.per_page + 1]], cursor)
+
+    def _make_page(self, rows, cursor):
+        reverse = bool(cursor) and self.decode(cursor)[1]
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if reverse:
+            rows.reverse()
+            return CursorPage(self, rows, has_next=True, has_previous=has_more)
+        return CursorPage(self, rows, has_next=has_more, has_previous=bool(cursor))
@@ -0,0 +1,346 @@
+# File: job_board_project_final/jobs/recommend.py
+#
+# "Recommended for you" on the seeker dashboard: active jobs scored against
+# the jobs a seeker applied to, by
+#
+#   text      TF-IDF cosine similarity of title + description
+#   category  share of the seeker's applications in the job's category
+#   location  share of the seeker's applications in the job's location
+#   salary    closeness of salary_min to the seeker's median (log scale)
+#
+# Each job's hashed term counts live in JobVector, rewritten by the task
+# worker whenever a job is saved or deleted (tasks.py). Every process keeps
+# all vectors in memory as one sparse matrix plus numpy arrays of the other
+# features, so a request scores the whole catalogue with a few vectorized
+# operations and never reads JobPost beyond the top K rows it shows.
+#
+# The in-memory index is log-structured: a large CSC "main" matrix built
+# once, plus a small "delta" matrix of rows that changed since, both picked
+# up by re-reading JobVector rows updated since the last refresh. Rows in
+# main that a delta row replaces are masked out. Once the delta holds more
+# than RECOMMEND_DELTA_LIMIT rows, main is rebuilt (which also refreshes
+# the IDF weights). Refreshes read from the primary: rows a lagging replica
+# hasn't got yet would fall outside the next refresh's SYNC_OVERLAP window.
+
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import timedelta
+
+import numpy as np
+from scipy import sparse
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.routers import primary_reads
+from .models import Application, JobPost, JobVector
+from .search import tokenize
+
+DIMENSION = 2 ** 18
+TITLE_WEIGHT = 3
+# Terms of the seeker profile used for the text score
+QUERY_TERMS = 64
+# Applications the seeker profile is built from (most recent first)
+PROFILE_APPLICATIONS = 50
+WEIGHTS = {'text': 0.55, 'category': 0.2, 'location': 0.15, 'salary': 0.1}
+# Rows re-read on every refresh, for transactions that committed late
+SYNC_OVERLAP = timedelta(seconds=60)
+
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from has have in is it of on or our the this to we will with '
+    'you your role job work team are who'.split()
+)
+CATEGORIES = [value for value, _ in JobPost.CATEGORY_CHOICES]
+
+
+def term_counts(title, description):
+    """Hashed term ids and counts of a job's text; title words count extra."""
+    counts = Counter()
+    for weight, text in ((TITLE_WEIGHT, title), (1, description)):
+        for token in tokenize(text):
+            if token not in STOP_WORDS and len(token) > 1:
+                counts[zlib.crc32(token.encode()) & (DIMENSION - 1)] += weight
+    terms = np.array(sorted(counts), dtype=np.int32)
+    values = np.array([counts[term] for term in terms.tolist()], dtype=np.float32)
+    return terms, values
+
+
+def vector_for(job):
+    terms, values = term_counts(job.title, job.description)
+    return JobVector(
+        job_id=job.pk, terms=terms.tobytes(), counts=values.tobytes(),
+        category=job.category, location=job.location, salary_min=job.salary_min,
+        is_active=job.is_active,
+    )
+
+
+def update_vectors(job_ids):
+    """Recompute the vectors of ``job_ids``; deleted jobs leave an empty, inactive row."""
+    job_ids = set(job_ids)
+    vectors = [vector_for(job) for job in JobPost.objects.filter(pk__in=job_ids)]
+    vectors += [JobVector(job_id=pk) for pk in job_ids - {vector.job_id for vector in vectors}]
+    now = timezone.now()
+    for vector in vectors:
+        vector.updated_at = now
+    JobVector.objects.bulk_create(
+        vectors, update_conflicts=True, unique_fields=['job_id'],
+        update_fields=['terms', 'counts', 'category', 'location', 'salary_min', 'is_active', 'updated_at'],
+    )
+
+
+def rebuild_vectors(batch_size=2000):
+    """Recompute every vector from JobPost, for rows written around the signals. Returns the count."""
+    total = 0
+    batch = []
+    jobs = JobPost.objects.only(
+        'id', 'title', 'description', 'category', 'location', 'salary_min', 'is_active',
+    ).order_by('pk')
+    with transaction.atomic():
+        JobVector.objects.exclude(job_id__in=JobPost.objects.values('pk')).delete()
+        for job in jobs.iterator(chunk_size=batch_size):
+            batch.append(job.pk)
+            if len(batch) >= batch_size:
+                update_vectors(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            update_vectors(batch)
+            total += len(batch)
+    return total
+
+
+def _stack(rows):
+    """CSR matrix of hashed term counts, one row per (terms bytes, counts bytes)."""
+    indptr = [0]
+    indices, data = [], []
+    for terms, counts in rows:
+        term_array = np.frombuffer(bytes(terms), dtype=np.int32)
+        indices.append(term_array)
+        data.append(np.frombuffer(bytes(counts), dtype=np.float32))
+        indptr.append(indptr[-1] + len(term_array))
+    return sparse.csr_matrix(
+        (np.concatenate(data) if data else np.zeros(0, np.float32),
+         np.concatenate(indices) if indices else np.zeros(0, np.int32),
+         np.array(indptr)),
+        shape=(len(rows), DIMENSION),
+    )
+
+
+def _tfidf(counts, idf):
+    """Sublinear TF times IDF, L2-normalized per row."""
+    matrix = counts.copy()
+    matrix.data = 1 + np.log(matrix.data)
+    matrix = sparse.csr_matrix(matrix.multiply(idf.reshape(1, -1)))
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.csr_matrix(sparse.diags(1 / norms) @ matrix, dtype=np.float32)
+
+
+FIELDS = ('job_id', 'terms', 'counts', 'category', 'location', 'salary_min', 'is_active', 'updated_at')
+
+
+class Snapshot:
+    """Immutable view of the index that requests score against."""
+
+    def __init__(self, main, delta, job_ids, categories, locations, salaries, active, location_codes, idf, rows):
+        self.main = main
+        self.delta = delta
+        self.job_ids = job_ids
+        self.categories = categories
+        self.locations = locations
+        self.salaries = salaries
+        self.active = active
+        self.location_codes = location_codes
+        self.idf = idf
+        # job id -> row of its current vector
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def text_scores(self, query):
+        """Cosine similarity of every row to the L2-normalized ``query`` (a dict term -> weight)."""
+        terms = np.fromiter(query, dtype=np.int32, count=len(query))
+        weights = np.fromiter(query.values(), dtype=np.float32, count=len(query))
+        scores = np.empty(len(self), dtype=np.float32)
+        split = self.main.shape[0]
+        scores[:split] = self.main[:, terms] @ weights
+        scores[split:] = self.delta[:, terms] @ weights
+        return scores
+
+
+class RecommendationIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.snapshot = None
+        self._checked_at = 0.0
+
+    # --- Loading ---
+
+    def _features(self, vectors):
+        """Per-row numpy arrays of the non-text features."""
+        for v in vectors:
+            self._location_codes.setdefault(v['location'], len(self._location_codes))
+        return (
+            np.array([v['job_id'] for v in vectors], dtype=np.int64),
+            np.array([
+                CATEGORIES.index(v['category']) if v['category'] in CATEGORIES else -1 for v in vectors
+            ], dtype=np.int8),
+            np.array([self._location_codes[v['location']] for v in vectors], dtype=np.int32),
+            np.array([v['salary_min'] for v in vectors], dtype=np.float32),
+            np.array([v['is_active'] for v in vectors], dtype=bool),
+        )
+
+    def _build(self):
+        """(Re)build main from every JobVector row, with fresh IDF weights."""
+        vectors = list(JobVector.objects.order_by('job_id').values(*FIELDS).iterator(chunk_size=2000))
+        counts = _stack([(v['terms'], v['counts']) for v in vectors])
+        self._location_codes = {}
+        self._main_features = self._features(vectors)
+        active = self._main_features[-1]
+        document_frequency = np.bincount(counts[active].indices, minlength=DIMENSION)
+        self._idf = (np.log((1 + active.sum()) / (1 + document_frequency)) + 1).astype(np.float32)
+        self._main = sparse.csc_matrix(_tfidf(counts, self._idf))
+        self._main_rows = {v['job_id']: row for row, v in enumerate(vectors)}
+        self._versions = {v['job_id']: v['updated_at'] for v in vectors}
+        self._delta = {}
+        self._publish()
+
+    def _publish(self):
+        delta = list(self._delta.values())
+        delta_features = self._features(delta)
+        job_ids, categories, locations, salaries, active = [
+            np.concatenate([main, extra]) for main, extra in zip(self._main_features, delta_features)
+        ]
+        rows = dict(self._main_rows)
+        offset = len(self._main_rows)
+        for i, v in enumerate(delta):
+            # The main row of a changed job is masked out
+            if v['job_id'] in self._main_rows:
+                active[self._main_rows[v['job_id']]] = False
+            rows[v['job_id']] = offset + i
+        self.snapshot = Snapshot(
+            main=self._main,
+            delta=sparse.csc_matrix(_tfidf(_stack([(v['terms'], v['counts']) for v in delta]), self._idf)),
+            job_ids=job_ids, categories=categories, locations=locations, salaries=salaries,
+            active=active, location_codes=dict(self._location_codes), idf=self._idf, rows=rows,
+        )
+
+    def refresh(self, force=False):
+        """Load on first use, then apply JobVector changes at most every RECOMMEND_REFRESH_SECONDS."""
+        due = force or time.monotonic() - self._checked_at >= settings.RECOMMEND_REFRESH_SECONDS
+        if self.snapshot is not None and not due:
+            return self.snapshot
+        # While one thread refreshes, the others keep serving the old snapshot
+        if not self._lock.acquire(blocking=self.snapshot is None or force):
+            return self.snapshot
+        try:
+            started = timezone.now()
+            with primary_reads():
+                self._sync()
+            self._synced_at = started
+            self._checked_at = time.monotonic()
+            return self.snapshot
+        finally:
+            self._lock.release()
+
+    def _sync(self):
+        """Build the index, or apply the JobVector rows changed since the last sync."""
+        if self.snapshot is None:
+            self._build()
+        else:
+            changed = JobVector.objects.filter(updated_at__gte=self._synced_at - SYNC_OVERLAP)
+            fresh = [v for v in changed.values(*FIELDS) if self._versions.get(v['job_id']) != v['updated_at']]
+            for v in fresh:
+                self._versions[v['job_id']] = v['updated_at']
+                self._delta[v['job_id']] = v
+            if len(self._delta) > settings.RECOMMEND_DELTA_LIMIT:
+                self._build()
+            elif fresh:
+                self._publish()
+
+    def reset(self):
+        with self._lock:
+            self.snapshot = None
+            self._checked_at = 0.0
+
+    # --- Scoring ---
+
+    def recommend(self, profile, k=10):
+        """
+        Job ids of the ``k`` best active jobs for a seeker ``profile``: the
+        JobVector rows (dicts) of the jobs they applied to.
+        """
+        snapshot = self.refresh()
+        if not profile or not len(snapshot):
+            return []
+
+        scores = np.zeros(len(snapshot), dtype=np.float32)
+        query = Counter()
+        for v in profile:
+            terms = np.frombuffer(bytes(v['terms']), dtype=np.int32)
+            if not len(terms):
+                continue
+            weights = (1 + np.log(np.frombuffer(bytes(v['counts']), dtype=np.float32))) * snapshot.idf[terms]
+            weights /= np.linalg.norm(weights) or 1
+            query.update(dict(zip(terms.tolist(), weights.tolist())))
+        if query:
+            top_terms = dict(query.most_common(QUERY_TERMS))
+            norm = np.sqrt(sum(weight * weight for weight in top_terms.values()))
+            scores += WEIGHTS['text'] * snapshot.text_scores(
+                {term: weight / norm for term, weight in top_terms.items()}
+            )
+
+        applied = len(profile)
+        category_share = np.zeros(len(CATEGORIES) + 1, dtype=np.float32)
+        for v in profile:
+            if v['category'] in CATEGORIES:
+                category_share[CATEGORIES.index(v['category'])] += 1 / applied
+        # Code -1 (unknown category) lands on the extra zero slot
+        scores += WEIGHTS['category'] * category_share[snapshot.categories]
+
+        location_share = np.zeros(len(snapshot.location_codes) + 1, dtype=np.float32)
+        for v in profile:
+            code = snapshot.location_codes.get(v['location'])
+            if code is not None:
+                location_share[code] += 1 / applied
+        scores += WEIGHTS['location'] * location_share[snapshot.locations]
+
+        salaries = [v['salary_min'] for v in profile if v['salary_min']]
+        if salaries:
+            preferred = np.log1p(np.median(salaries))
+            scores += WEIGHTS['salary'] * np.exp(-np.abs(np.log1p(snapshot.salaries) - preferred))
+
+        scores[~snapshot.active] = -np.inf
+        applied_rows = [snapshot.rows[v['job_id']] for v in profile if v['job_id'] in snapshot.rows]
+        scores[applied_rows] = -np.inf
+
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return snapshot.job_ids[best].tolist()
+
+
+index = RecommendationIndex()
+
+
+def recommended_jobs(user, k=5):
+    """The ``k`` jobs to recommend to ``user``, best first; empty without applications."""
+    applied = (
+        Application.objects.filter(applicant=user).order_by('-applied_at')
+        .values('job_id')[:PROFILE_APPLICATIONS]
+    )
+    profile = list(JobVector.objects.filter(job_id__in=applied).values(
+        'job_id', 'terms', 'counts', 'category', 'location', 'salary_min',
+    ))
+    # A few extra in case this process hasn't seen a deactivation yet
+    job_ids = index.recommend(profile, k=k + 5)
+    if not job_ids:
+        return []
+    jobs = JobPost.objects.filter(pk__in=job_ids, is_active=True).in_bulk()
+    return [jobs[pk] for pk in job_ids if pk in jobs][:k]
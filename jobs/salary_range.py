@@ -0,0 +1,201 @@
+# File: job_board_project_final/jobs/salary_range.py
+#
+# Salary range filtering: match a job's [salary_min, salary_max] range
+# against a requested [low, high] range in one of three modes.
+#
+#   overlap   the two ranges share at least one value
+#   within    the job's range lies inside the requested one
+#   contains  the job's range covers the whole requested one
+#
+# A two-column predicate like `salary_min <= high AND salary_max >= low`
+# can't be answered from a b-tree, so each job's range is indexed as one
+# value:
+#
+# SQLite:   an R*Tree virtual table (jobs_jobpost_salary_rtree) kept in sync
+#           by triggers on jobs_jobpost, like the FTS5 index in search.py.
+# Postgres: a GiST expression index on int4range(salary_min, salary_max, '[]').
+# Anything else falls back to plain column comparisons.
+#
+# A salary_max below salary_min (e.g. left at 0) is treated as salary_min
+# everywhere, so such a job is a single-value range.
+
+from django.db import OperationalError, connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
+
+RTREE_TABLE = 'jobs_jobpost_salary_rtree'
+PG_INDEX = 'jobs_jobpost_salary_gist'
+
+MODES = (
+    ('overlap', 'Overlaps my range'),
+    ('within', 'Within my range'),
+    ('contains', 'Covers my whole range'),
+)
+# Stand-in for an open upper end; salaries are PositiveIntegerFields
+UNBOUNDED = 2 ** 31 - 1
+
+# Must stay the same expression as the indexed one, otherwise Postgres will
+# not use the GiST index.
+PG_RANGE = (
+    "int4range(\"jobs_jobpost\".\"salary_min\", "
+    "GREATEST(\"jobs_jobpost\".\"salary_min\", \"jobs_jobpost\".\"salary_max\"), '[]')"
+)
+PG_OPERATORS = {'overlap': '&&', 'within': '<@', 'contains': '@>'}
+
+# Conditions on the R*Tree's (lo, hi) columns per mode, and their params
+RTREE_CONDITIONS = {
+    'overlap': ('lo <= %s AND hi >= %s', ('high', 'low')),
+    'within': ('lo >= %s AND hi <= %s', ('low', 'high')),
+    'contains': ('lo <= %s AND hi >= %s', ('low', 'high')),
+}
+
+RTREE_TRIGGERS = {
+    'jobs_jobpost_salary_ai': (
+        "CREATE TRIGGER IF NOT EXISTS jobs_jobpost_salary_ai AFTER INSERT ON jobs_jobpost BEGIN "
+        "INSERT INTO jobs_jobpost_salary_rtree(id, lo, hi) "
+        "VALUES (new.id, new.salary_min, max(new.salary_min, new.salary_max)); END"
+    ),
+    'jobs_jobpost_salary_ad': (
+        "CREATE TRIGGER IF NOT EXISTS jobs_jobpost_salary_ad AFTER DELETE ON jobs_jobpost BEGIN "
+        "DELETE FROM jobs_jobpost_salary_rtree WHERE id = old.id; END"
+    ),
+    'jobs_jobpost_salary_au': (
+        "CREATE TRIGGER IF NOT EXISTS jobs_jobpost_salary_au "
+        "AFTER UPDATE OF salary_min, salary_max ON jobs_jobpost BEGIN "
+        "UPDATE jobs_jobpost_salary_rtree "
+        "SET lo = new.salary_min, hi = max(new.salary_min, new.salary_max) WHERE id = new.id; END"
+    ),
+}
+
+# alias -> 'rtree' | 'postgres' | None, resolved once per process
+_backends = {}
+
+
+def range_backend(using='default'):
+    """Return which range index is available on the given database."""
+    if using not in _backends:
+        connection = connections[using]
+        backend = None
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                    [RTREE_TABLE],
+                )
+                if cursor.fetchone():
+                    backend = 'rtree'
+        elif connection.vendor == 'postgresql':
+            backend = 'postgres'
+        _backends[using] = backend
+    return _backends[using]
+
+
+def install(connection):
+    """
+    Create the range index for ``connection`` if it is missing. Safe to run
+    repeatedly; see search.install() for why it also runs after migrate.
+    """
+    _backends.pop(connection.alias, None)
+
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            try:
+                cursor.execute(
+                    'CREATE VIRTUAL TABLE IF NOT EXISTS %s USING rtree_i32(id, lo, hi)' % RTREE_TABLE
+                )
+            except OperationalError:
+                # SQLite built without R*Tree: stay on the column fallback.
+                return
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'jobs_jobpost'"
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            if existing.issuperset(RTREE_TRIGGERS):
+                return
+            for sql in RTREE_TRIGGERS.values():
+                cursor.execute(sql)
+            # Rows written while the triggers were missing are not indexed.
+            cursor.execute('DELETE FROM %s' % RTREE_TABLE)
+            cursor.execute(
+                'INSERT INTO %s(id, lo, hi) '
+                'SELECT id, salary_min, max(salary_min, salary_max) FROM jobs_jobpost' % RTREE_TABLE
+            )
+
+    elif connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE INDEX IF NOT EXISTS %s ON jobs_jobpost USING GIST ((%s))'
+                % (PG_INDEX, PG_RANGE.replace('"jobs_jobpost".', ''))
+            )
+
+
+def uninstall(connection):
+    _backends.pop(connection.alias, None)
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for name in RTREE_TRIGGERS:
+                cursor.execute('DROP TRIGGER IF EXISTS %s' % name)
+            cursor.execute('DROP TABLE IF EXISTS %s' % RTREE_TABLE)
+        elif connection.vendor == 'postgresql':
+            cursor.execute('DROP INDEX IF EXISTS %s' % PG_INDEX)
+
+
+def install_after_migrate(sender, using='default', **kwargs):
+    connection = connections[using]
+    # Not after migrating back past the migration that adds the index
+    if ('jobs', '0009_jobpost_salary_range_index') in MigrationRecorder(connection).applied_migrations():
+        install(connection)
+
+
+def filter_range(queryset, low=None, high=None, mode='overlap'):
+    """
+    Jobs whose salary range relates to [low, high] as ``mode`` says.
+    A missing ``low``/``high`` leaves that end of the requested range open.
+    """
+    if mode not in RTREE_CONDITIONS:
+        raise ValueError('Unknown salary range mode %r' % mode)
+    low = 0 if low is None else max(0, int(low))
+    backend = range_backend(queryset.db)
+
+    if backend == 'postgres':
+        # NULL is an open upper bound for int4range
+        match = RawSQL(
+            "%s %s int4range(%%s, %%s, '[]')" % (PG_RANGE, PG_OPERATORS[mode]),
+            (min(low, UNBOUNDED - 1), None if high is None else min(UNBOUNDED - 1, int(high))),
+            output_field=BooleanField(),
+        )
+        return queryset.filter(match)
+
+    high = UNBOUNDED if high is None else min(UNBOUNDED, int(high))
+    if backend == 'rtree':
+        condition, names = RTREE_CONDITIONS[mode]
+        bounds = {'low': low, 'high': high}
+        matched_ids = RawSQL(
+            'SELECT id FROM %s WHERE %s' % (RTREE_TABLE, condition),
+            tuple(bounds[name] for name in names),
+        )
+        return queryset.filter(id__in=matched_ids)
+
+    queryset = queryset.annotate(salary_top=Greatest('salary_min', 'salary_max'))
+    if mode == 'overlap':
+        return queryset.filter(Q(salary_min__lte=high) & Q(salary_top__gte=low))
+    if mode == 'within':
+        return queryset.filter(Q(salary_min__gte=low) & Q(salary_top__lte=high))
+    return queryset.filter(Q(salary_min__lte=low) & Q(salary_top__gte=high))
+
+
+def in_range(salary_min, salary_max, low=None, high=None, mode='overlap'):
+    """filter_range() for one job's salaries, in Python (saved-search alerts use it)."""
+    if mode not in RTREE_CONDITIONS:
+        raise ValueError('Unknown salary range mode %r' % mode)
+    low = 0 if low is None else max(0, int(low))
+    high = UNBOUNDED if high is None else min(UNBOUNDED, int(high))
+    top = max(salary_min, salary_max)
+    if mode == 'overlap':
+        return salary_min <= high and top >= low
+    if mode == 'within':
+        return salary_min >= low and top <= high
+    return salary_min <= low and top >= high
@@ -0,0 +1,190 @@
+# File: job_board_project_final/jobs/search.py
+#
+# Full-text search over JobPost title/description/location.
+#
+# SQLite:   an FTS5 virtual table (jobs_jobpost_fts) kept in sync by triggers
+#           on jobs_jobpost, joined through the JobPostSearch model and
+#           ranked with bm25().
+# Postgres: a GIN expression index on to_tsvector(...), ranked with ts_rank().
+# Anything else (or a database created before the index existed) falls back to
+# the old icontains scan, so callers never need to care which one is active.
+
+import re
+
+from django.db import OperationalError, connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models import BooleanField, F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'jobs_jobpost_fts'
+PG_INDEX = 'jobs_jobpost_search_gin'
+
+# Must stay the same expression as the indexed one, otherwise Postgres will
+# not use the GIN index.
+PG_DOCUMENT = (
+    "to_tsvector('english', "
+    "coalesce(\"jobs_jobpost\".\"title\", '') || ' ' || "
+    "coalesce(\"jobs_jobpost\".\"description\", '') || ' ' || "
+    "coalesce(\"jobs_jobpost\".\"location\", ''))"
+)
+
+FTS_TRIGGERS = {
+    'jobs_jobpost_fts_ai': (
+        "CREATE TRIGGER IF NOT EXISTS jobs_jobpost_fts_ai AFTER INSERT ON jobs_jobpost BEGIN "
+        "INSERT INTO jobs_jobpost_fts(rowid, title, description, location) "
+        "VALUES (new.id, new.title, new.description, new.location); END"
+    ),
+    'jobs_jobpost_fts_ad': (
+        "CREATE TRIGGER IF NOT EXISTS jobs_jobpost_fts_ad AFTER DELETE ON jobs_jobpost BEGIN "
+        "INSERT INTO jobs_jobpost_fts(jobs_jobpost_fts, rowid, title, description, location) "
+        "VALUES ('delete', old.id, old.title, old.description, old.location); END"
+    ),
+    'jobs_jobpost_fts_au': (
+        "CREATE TRIGGER IF NOT EXISTS jobs_jobpost_fts_au "
+        "AFTER UPDATE OF title, description, location ON jobs_jobpost BEGIN "
+        "INSERT INTO jobs_jobpost_fts(jobs_jobpost_fts, rowid, title, description, location) "
+        "VALUES ('delete', old.id, old.title, old.description, old.location); "
+        "INSERT INTO jobs_jobpost_fts(rowid, title, description, location) "
+        "VALUES (new.id, new.title, new.description, new.location); END"
+    ),
+}
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# alias -> 'fts5' | 'postgres' | None, resolved once per process
+_backends = {}
+
+
+def tokenize(value):
+    return [token.lower() for token in TOKEN_RE.findall(value or '')]
+
+
+def search_backend(using='default'):
+    """Return which search backend is available on the given database."""
+    if using not in _backends:
+        connection = connections[using]
+        backend = None
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                    [FTS_TABLE],
+                )
+                if cursor.fetchone():
+                    backend = 'fts5'
+        elif connection.vendor == 'postgresql':
+            backend = 'postgres'
+        _backends[using] = backend
+    return _backends[using]
+
+
+def install(connection):
+    """
+    Create the search index for ``connection`` if it is missing.
+
+    Safe to run repeatedly: it is called from the migration that introduced
+    the index and again after every ``migrate``, because SQLite drops the
+    triggers whenever a migration rebuilds jobs_jobpost.
+    """
+    _backends.pop(connection.alias, None)
+
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            try:
+                cursor.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS %s USING fts5("
+                    "title, description, location, "
+                    "content='jobs_jobpost', content_rowid='id', "
+                    "tokenize='unicode61 remove_diacritics 2')" % FTS_TABLE
+                )
+            except OperationalError:
+                # SQLite built without FTS5: stay on the icontains fallback.
+                return
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'jobs_jobpost'"
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            if existing.issuperset(FTS_TRIGGERS):
+                return
+            for sql in FTS_TRIGGERS.values():
+                cursor.execute(sql)
+            # Rows written while the triggers were missing are not indexed.
+            cursor.execute("INSERT INTO %s(%s) VALUES ('rebuild')" % (FTS_TABLE, FTS_TABLE))
+
+    elif connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE INDEX IF NOT EXISTS %s ON jobs_jobpost USING GIN ((%s))'
+                % (PG_INDEX, PG_DOCUMENT.replace('"jobs_jobpost".', ''))
+            )
+
+
+def uninstall(connection):
+    _backends.pop(connection.alias, None)
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for name in FTS_TRIGGERS:
+                cursor.execute('DROP TRIGGER IF EXISTS %s' % name)
+            cursor.execute('DROP TABLE IF EXISTS %s' % FTS_TABLE)
+        elif connection.vendor == 'postgresql':
+            cursor.execute('DROP INDEX IF EXISTS %s' % PG_INDEX)
+
+
+def install_after_migrate(sender, using='default', **kwargs):
+    connection = connections[using]
+    # Not after migrating back past the migration that adds the index
+    if ('jobs', '0002_jobpost_search_index') in MigrationRecorder(connection).applied_migrations():
+        install(connection)
+
+
+def fts5_query(value):
+    # Quote every token so user input can never be parsed as FTS5 syntax,
+    # and make the last one a prefix match for search-as-you-type.
+    tokens = tokenize(value)
+    if not tokens:
+        return ''
+    terms = ['"%s"' % token for token in tokens]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def search(queryset, value, rank=True):
+    """
+    Filter ``queryset`` down to posts matching ``value`` and, unless ``rank``
+    is false, annotate each row with ``search_rank`` (lower is better on
+    every backend).
+    """
+    backend = search_backend(queryset.db)
+
+    if backend == 'fts5':
+        match = fts5_query(value)
+        if not match:
+            return queryset
+        # One join against the index: FTS5 computes bm25() for each match
+        # as it goes, where a per-row rank subquery re-ran the whole MATCH.
+        queryset = queryset.filter(search_index__document__match=match)
+        if not rank:
+            return queryset
+        return queryset.annotate(search_rank=F('search_index__rank'))
+
+    if backend == 'postgres':
+        match = RawSQL(
+            "%s @@ plainto_tsquery('english', %%s)" % PG_DOCUMENT,
+            (value,),
+            output_field=BooleanField(),
+        )
+        ts_rank = RawSQL(
+            "-ts_rank(%s, plainto_tsquery('english', %%s))" % PG_DOCUMENT,
+            (value,),
+            output_field=FloatField(),
+        )
+        queryset = queryset.filter(match)
+        return queryset.annotate(search_rank=ts_rank) if rank else queryset
+
+    queryset = queryset.filter(
+        Q(title__icontains=value) |
+        Q(description__icontains=value) |
+        Q(location__icontains=value)
+    )
+    return queryset.annotate(search_rank=Value(0.0)) if rank else queryset
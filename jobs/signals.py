@@ -0,0 +1,145 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from tasks.queue import enqueue, enqueue_many
+from users.models import User
+from .models import Application, JobPost, normalize_company_name
+from . import page_cache, stats
+
+# Counter, facet and company-name maintenance and employer emails run in the
+# task worker (handlers in tasks.py). Cache versions and the homepage stats
+# stay inline: they are cheap, and a stale page right after an edit is not.
+
+
+# --- Denormalized applicant counts and employer notifications ---
+
+@receiver(post_save, sender=Application)
+def count_new_application(sender, instance, created, **kwargs):
+    if created:
+        enqueue_many([
+            ('jobs.count_applications', {'job_id': instance.job_id, 'delta': 1}),
+            ('jobs.notify_employer', {'application_id': instance.pk}),
+        ])
+
+
+@receiver(post_delete, sender=Application)
+def count_deleted_application(sender, instance, **kwargs):
+    enqueue('jobs.count_applications', {'job_id': instance.job_id, 'delta': -1})
+
+
+# --- Saved-search alerts ---
+
+@receiver(post_save, sender=JobPost)
+def queue_alert_matching(sender, instance, created, **kwargs):
+    # New postings and postings going live. Connected before move_facet_count,
+    # which overwrites _stored_facet_key (None while the job was inactive).
+    published = created or getattr(instance, '_stored_facet_key', None) is None
+    if instance.is_active and published:
+        enqueue('jobs.match_alerts', {'job_ids': [instance.pk]})
+
+
+# --- Search facet counts ---
+
+@receiver(pre_save, sender=JobPost)
+def load_stored_facet_key(sender, instance, **kwargs):
+    # Instances loaded with deferred fields (or built by hand) don't know
+    # which facet row they are counted in yet.
+    if not instance._state.adding and not hasattr(instance, '_stored_facet_key'):
+        stored = JobPost.objects.filter(pk=instance.pk).first()
+        instance._stored_facet_key = stored.facet_key() if stored else None
+
+
+@receiver(post_save, sender=JobPost)
+def move_facet_count(sender, instance, created, **kwargs):
+    old_key = None if created else instance._stored_facet_key
+    new_key = instance.facet_key()
+    if old_key != new_key:
+        enqueue('jobs.adjust_facets', {'old': old_key, 'new': new_key})
+    instance._stored_facet_key = new_key
+
+
+@receiver(post_delete, sender=JobPost)
+def remove_facet_count(sender, instance, **kwargs):
+    old_key = getattr(instance, '_stored_facet_key', instance.facet_key())
+    if old_key is not None:
+        enqueue('jobs.adjust_facets', {'old': old_key, 'new': None})
+
+
+# --- Recommendation vectors ---
+
+VECTOR_FIELDS = {'title', 'description', 'category', 'location', 'salary_min', 'is_active'}
+
+
+@receiver(post_save, sender=JobPost)
+def queue_job_vector(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or VECTOR_FIELDS.intersection(update_fields):
+        enqueue('jobs.update_job_vectors', {'job_ids': [instance.pk]})
+
+
+@receiver(post_delete, sender=JobPost)
+def queue_deleted_job_vector(sender, instance, **kwargs):
+    enqueue('jobs.update_job_vectors', {'job_ids': [instance.pk]})
+
+
+# --- Homepage stats cache ---
+
+@receiver(post_save, sender=JobPost)
+def count_new_job(sender, instance, created, **kwargs):
+    if created:
+        stats.adjust(stats.TOTAL_JOBS, 1)
+
+
+@receiver(post_delete, sender=JobPost)
+def count_deleted_job(sender, instance, **kwargs):
+    stats.adjust(stats.TOTAL_JOBS, -1)
+
+
+@receiver(post_save, sender=User)
+def count_employer(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        if instance.role == User.IS_EMPLOYER:
+            stats.adjust(stats.TOTAL_EMPLOYERS, 1)
+    elif update_fields is None or 'role' in update_fields:
+        # The role may have changed and we don't know the old one.
+        stats.invalidate(stats.TOTAL_EMPLOYERS)
+
+
+@receiver(post_delete, sender=User)
+def count_deleted_employer(sender, instance, **kwargs):
+    if instance.role == User.IS_EMPLOYER:
+        stats.adjust(stats.TOTAL_EMPLOYERS, -1)
+
+
+# --- Denormalized company names ---
+
+def sync_company_name(employer_id, name):
+    """Copy an employer's company name onto their posts; returns the rows changed."""
+    name, key = name or '', normalize_company_name(name)
+    stale = JobPost.objects.filter(employer_id=employer_id).exclude(company_name=name, company_key=key)
+    pks = list(stale.values_list('pk', flat=True))
+    if pks:
+        # The rendered pages change, so updated_at (Last-Modified) moves too.
+        JobPost.objects.filter(pk__in=pks).update(
+            company_name=name, company_key=key, updated_at=timezone.now(),
+        )
+        page_cache.bump(page_cache.LIST_VERSION)
+        page_cache.bump_many(page_cache.job_version_key(pk) for pk in pks)
+    return len(pks)
+
+
+@receiver(post_save, sender=User)
+def update_company_name(sender, instance, created, update_fields=None, **kwargs):
+    if created or instance.role != User.IS_EMPLOYER:
+        return
+    if update_fields is None or 'company_name' in update_fields:
+        enqueue('jobs.sync_company_name', {'employer_id': instance.pk})
+
+
+# --- Anonymous page cache versions ---
+
+@receiver(post_save, sender=JobPost)
+@receiver(post_delete, sender=JobPost)
+def bump_page_versions(sender, instance, **kwargs):
+    page_cache.bump(page_cache.LIST_VERSION)
+    page_cache.bump(page_cache.job_version_key(instance.pk))
@@ -0,0 +1,69 @@
+# File: job_board_project_final/jobs/stats.py
+#
+# Homepage counters served from the cache. Signals (see signals.py) nudge the
+# cached values up/down as rows are created/deleted; anything the signals
+# can't see (bulk_create, queryset.update, another worker's locmem cache) is
+# corrected by the TTL. Misses are counted on the primary, so a lagging
+# replica's numbers aren't cached for the whole TTL.
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.routers import primary_reads
+
+TOTAL_JOBS = 'stats:total_jobs'
+TOTAL_EMPLOYERS = 'stats:total_employers'
+
+
+def _count(key):
+    from users.models import User
+    from .models import JobPost
+
+    with primary_reads():
+        if key == TOTAL_JOBS:
+            return JobPost.objects.count()
+        return User.objects.filter(role=User.IS_EMPLOYER).count()
+
+
+def homepage_stats():
+    """{'total_jobs': ..., 'total_employers': ...}, from the DB only on a cache miss."""
+    values = cache.get_many([TOTAL_JOBS, TOTAL_EMPLOYERS])
+    for key in (TOTAL_JOBS, TOTAL_EMPLOYERS):
+        if key not in values:
+            values[key] = _count(key)
+            cache.set(key, values[key], settings.HOMEPAGE_STATS_TTL)
+    return {
+        'total_jobs': values[TOTAL_JOBS],
+        'total_employers': values[TOTAL_EMPLOYERS],
+    }
+
+
+async def ahomepage_stats():
+    """Async twin of homepage_stats() for the ASGI views."""
+    from users.models import User
+    from .models import JobPost
+
+    values = await cache.aget_many([TOTAL_JOBS, TOTAL_EMPLOYERS])
+    with primary_reads():
+        if TOTAL_JOBS not in values:
+            values[TOTAL_JOBS] = await JobPost.objects.acount()
+            await cache.aset(TOTAL_JOBS, values[TOTAL_JOBS], settings.HOMEPAGE_STATS_TTL)
+        if TOTAL_EMPLOYERS not in values:
+            values[TOTAL_EMPLOYERS] = await User.objects.filter(role=User.IS_EMPLOYER).acount()
+            await cache.aset(TOTAL_EMPLOYERS, values[TOTAL_EMPLOYERS], settings.HOMEPAGE_STATS_TTL)
+    return {
+        'total_jobs': values[TOTAL_JOBS],
+        'total_employers': values[TOTAL_EMPLOYERS],
+    }
+
+
+def adjust(key, delta):
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # Not cached right now; the next read recounts.
+        pass
+
+
+def invalidate(*keys):
+    cache.delete_many(keys or [TOTAL_JOBS, TOTAL_EMPLOYERS])
@@ -0,0 +1,108 @@
+# File: job_board_project_final/jobs/tasks.py
+#
+# Background handlers for the side effects of JobPost/Application writes.
+# signals.py queues them (see tasks/queue.py) so apply and post requests
+# return without doing this work inline.
+#
+# The counter handlers are batched: a burst of applications to one job
+# becomes a single UPDATE, and facet moves are summed into one adjust().
+
+from collections import Counter
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.urls import reverse
+
+from tasks.queue import task
+from users.models import User
+from .models import Application, JobPost
+from . import alerts, archive, facets, recommend
+
+
+@task('jobs.count_applications', batch=True)
+def count_applications(payloads):
+    """Apply ``{'job_id', 'delta'}`` changes to JobPost.applications_count."""
+    deltas = Counter()
+    for payload in payloads:
+        deltas[payload['job_id']] += payload['delta']
+    for job_id, delta in deltas.items():
+        if delta:
+            JobPost.objects.filter(pk=job_id).update(
+                applications_count=Greatest(F('applications_count') + delta, 0)
+            )
+
+
+@task('jobs.adjust_facets', batch=True)
+def adjust_facets(payloads):
+    """Apply ``{'old': key, 'new': key}`` moves to the facet summary table."""
+    deltas = Counter()
+    for payload in payloads:
+        if payload['old']:
+            deltas[tuple(payload['old'])] -= 1
+        if payload['new']:
+            deltas[tuple(payload['new'])] += 1
+    facets.adjust(deltas)
+
+
+@task('jobs.update_job_vectors', batch=True)
+def update_job_vectors(payloads):
+    """Recompute the recommendation vectors of ``{'job_ids': [...]}``."""
+    recommend.update_vectors({pk for payload in payloads for pk in payload['job_ids']})
+
+
+@task('jobs.sync_company_name', batch=True)
+def sync_company_names(payloads):
+    """Copy the current company name of each ``{'employer_id'}`` onto their posts."""
+    from .signals import sync_company_name
+
+    employer_ids = {payload['employer_id'] for payload in payloads}
+    # Read the name now rather than at enqueue time, so renames can't land
+    # out of order.
+    for pk, name in User.objects.filter(pk__in=employer_ids).values_list('pk', 'company_name'):
+        sync_company_name(pk, name)
+
+
+@task('jobs.notify_employer', batch=True)
+def notify_employers(payloads):
+    """Email employers about new ``{'application_id'}`` applications."""
+    applications = (
+        Application.objects.filter(pk__in=[payload['application_id'] for payload in payloads])
+        .select_related('job__employer', 'applicant')
+    )
+    messages = []
+    for application in applications:
+        employer = application.job.employer
+        if not employer.email:
+            continue
+        messages.append(EmailMessage(
+            subject='New application for %s' % application.job.title,
+            body='%s applied for "%s".\n\nReview your applicants at %s\n' % (
+                application.applicant.get_full_name() or application.applicant.username,
+                application.job.title,
+                settings.SITE_URL + reverse('employer_dashboard'),
+            ),
+            to=[employer.email],
+        ))
+    if messages:
+        # One SMTP connection for the whole batch
+        get_connection().send_messages(messages)
+
+
+@task('jobs.match_alerts', batch=True)
+def match_alerts(payloads):
+    """Match the postings in ``{'job_ids': [...]}`` against the saved searches."""
+    alerts.match_jobs({pk for payload in payloads for pk in payload['job_ids']})
+
+
+@task('jobs.send_alert_digests', max_attempts=1, atomic=False)
+def send_alert_digests():
+    """Periodic alert digests; each batch of users commits on its own (see alerts.py)."""
+    alerts.run_scheduled()
+
+
+@task('jobs.archive_jobs', max_attempts=1, atomic=False)
+def archive_jobs():
+    """Periodic archive run; batches commit one by one (see archive.py)."""
+    archive.run_scheduled()
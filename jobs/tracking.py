@@ -0,0 +1,51 @@
+# File: job_board_project_final/jobs/tracking.py
+#
+# Applicant tracking: moving a job's applications through the hiring
+# statuses in bulk.
+#
+# A transition is one UPDATE per batch of ids, with the job and the allowed
+# "from" statuses in its WHERE clause, so ownership and the state machine
+# are enforced by the same statement that writes: ids of other jobs, or of
+# applications already past that step, are simply not counted. Nothing is
+# loaded and no per-row signals fire. Batches commit one by one, so
+# rejecting tens of thousands of applicants never holds the write lock for
+# long.
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Application
+
+# action -> (label, new status, statuses it can move from)
+TRANSITIONS = {
+    'review': ('Mark reviewed', Application.REVIEWED, (Application.APPLIED,)),
+    'shortlist': ('Shortlist', Application.SHORTLISTED, (Application.APPLIED, Application.REVIEWED)),
+    'reject': ('Reject', Application.REJECTED, (
+        Application.APPLIED, Application.REVIEWED, Application.SHORTLISTED,
+    )),
+    'hire': ('Hire', Application.HIRED, (Application.SHORTLISTED,)),
+}
+
+
+def transition(job, action, application_ids=None, status=None, batch_size=None):
+    """
+    Apply ``action`` to the given applications of ``job``, or, without ids,
+    to all of its applications (only those in ``status``, if given).
+    Returns how many changed.
+    """
+    _, new_status, allowed = TRANSITIONS[action]
+    if status is not None:
+        allowed = tuple(value for value in allowed if value == status)
+    batch_size = batch_size or settings.APPLICATION_STATUS_BATCH_SIZE
+    movable = Application.objects.filter(job=job, status__in=allowed)
+    if application_ids is None:
+        # Read off the (job, status, applied_at) index; rows that move on in
+        # the meantime are skipped by the UPDATE's own status check.
+        application_ids = movable.values_list('pk', flat=True)
+
+    ids = sorted(set(application_ids))
+    changed = 0
+    for start in range(0, len(ids), batch_size):
+        with transaction.atomic():
+            changed += movable.filter(pk__in=ids[start:start + batch_size]).update(status=new_status)
+    return changed
@@ -1,16 +1,37 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+# In ASGI mode the read-heavy pages are served by their async versions
+if settings.ASYNC_VIEWS:
+    JobListView = async_views.AsyncJobListView
+    JobDetailView = async_views.AsyncJobDetailView
+    SeekerDashboardView = async_views.AsyncSeekerDashboardView
+else:
+    JobListView = views.JobListView
+    JobDetailView = views.JobDetailView
+    SeekerDashboardView = views.SeekerDashboardView
 
 urlpatterns = [
     # Public
-    path('', views.JobListView.as_view(), name='job_list'),
-    path('job/<int:pk>/', views.JobDetailView.as_view(), name='job_detail'),
+    path('', JobListView.as_view(), name='job_list'),
+    path('job/<int:pk>/', JobDetailView.as_view(), name='job_detail'),
+    path('api/', views.job_api, name='job_api'),
     
     # Seeker
-    path('seeker/dashboard/', views.SeekerDashboardView.as_view(), name='seeker_dashboard'),
+    path('seeker/dashboard/', SeekerDashboardView.as_view(), name='seeker_dashboard'),
     path('job/<int:pk>/apply/', views.apply_to_job, name='apply_to_job'),
+    path('seeker/searches/', views.SavedSearchListView.as_view(), name='saved_searches'),
+    path('seeker/searches/save/', views.save_search, name='saved_search_create'),
+    path('seeker/searches/<int:pk>/delete/', views.delete_saved_search, name='saved_search_delete'),
     
     # Employer
     path('employer/dashboard/', views.EmployerDashboardView.as_view(), name='employer_dashboard'),
     path('employer/job/create/', views.JobCreateView.as_view(), name='job_create'),
+    path('employer/job/<int:pk>/edit/', views.JobUpdateView.as_view(), name='job_update'),
+    path('employer/job/<int:pk>/toggle/', views.job_toggle_active, name='job_toggle_active'),
+    path('employer/job/<int:pk>/applicants/', views.ApplicantTrackingView.as_view(), name='applicant_tracking'),
+    path('employer/job/<int:pk>/applicants/status/', views.application_bulk_status, name='application_bulk_status'),
+    path('employer/jobs/import/', views.job_import, name='job_import'),
+    path('employer/jobs/export/', views.job_export, name='job_export'),
 ]
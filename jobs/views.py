@@ -1,11 +1,24 @@
-from django.views.generic import ListView, DetailView, CreateView, TemplateView
+import io
+import json
+
+from django.views.generic import ListView, DetailView, CreateView, UpdateView, TemplateView
 from django.shortcuts import get_object_or_404, redirect
-from django.urls import reverse_lazy
+from django.http import Http404, HttpResponseForbidden, JsonResponse, QueryDict, StreamingHttpResponse
+from django.views.decorators.http import require_GET, require_POST
+from django.core.serializers.json import DjangoJSONEncoder
+from django.urls import reverse, reverse_lazy
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
-from .models import JobPost, Application
-from users.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+from .models import AlertMatch, Application, ArchivedApplication, ArchivedJobPost, JobPost, SavedSearch
 from .forms import JobPostForm
+from .filters import JobFilter
+from .pagination import CursorPaginator, InvalidCursor, querystring_without_cursor
+from .page_cache import AnonymousPageCacheMixin, job_version_key
+from . import alerts, bulk, facets, recommend, stats, tracking
 
 # --- Homepage ---
 class HomepageView(TemplateView):
@@ -13,24 +26,152 @@ class HomepageView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         try:
-            context['total_jobs'] = JobPost.objects.count()
-            context['total_employers'] = User.objects.filter(role=2).count()
+            # Served from the cache; see stats.py
+            context.update(stats.homepage_stats())
         except:
             context['total_jobs'] = 0
             context['total_employers'] = 0
         return context
 
 # --- Job List & Detail ---
-class JobListView(ListView):
+class JobListView(AnonymousPageCacheMixin, ListView):
     model = JobPost
     template_name = 'jobs/job_list.html'
     context_object_name = 'job_posts'
+    paginate_by = 20
+
     def get_queryset(self):
-        return JobPost.objects.filter(is_active=True).order_by('-created_at')
+        queryset = JobPost.objects.filter(is_active=True)
+        self.filter = JobFilter(self.request.GET, queryset=queryset)
+        return self.filter.qs
+
+    def paginate_queryset(self, queryset, page_size):
+        # Keyset pagination on the filter's ordering instead of OFFSET pages
+        paginator = CursorPaginator(queryset, page_size, ordering=self.filter.get_ordering())
+        try:
+            page = paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404('Invalid cursor')
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['filter'] = self.filter
+        context['facets'] = facets.facet_counts(self.filter)
+        context['querystring'] = querystring_without_cursor(self.request.GET)
+        return context
+
+    def get_last_modified(self, response):
+        return max((job.updated_at for job in response.context_data['job_posts']), default=None)
 
-class JobDetailView(DetailView):
+class JobDetailView(AnonymousPageCacheMixin, DetailView):
     model = JobPost
     template_name = 'jobs/job_detail.html'
+    context_object_name = 'job'
+
+    def get_cache_version_keys(self):
+        return [job_version_key(self.kwargs['pk'])]
+
+    def get_last_modified(self, response):
+        return self.object.updated_at
+
+# --- JSON API ---
+
+# Public name -> ORM path. Only the requested columns are ever SELECTed.
+API_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'category': 'category',
+    'description': 'description',
+    'location': 'location',
+    'salary_min': 'salary_min',
+    'salary_max': 'salary_max',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+    'company': 'company_name',
+}
+API_DEFAULT_FIELDS = [name for name in API_FIELDS if name != 'description']
+API_DEFAULT_LIMIT = 50
+API_MAX_LIMIT = 1000
+
+def job_api(request):
+    """
+    GET /jobs/api/?fields=id,title&limit=100&cursor=...&<JobFilter params>
+
+    Rows are streamed out as they come off a server-side iterator, so memory
+    stays flat however large ``limit`` is.
+    """
+    fields = request.GET.get('fields')
+    fields = [name.strip() for name in fields.split(',') if name.strip()] if fields else API_DEFAULT_FIELDS
+    unknown = [name for name in fields if name not in API_FIELDS]
+    if unknown:
+        return JsonResponse({'error': 'Unknown fields: %s' % ', '.join(unknown)}, status=400)
+
+    try:
+        limit = min(int(request.GET.get('limit', API_DEFAULT_LIMIT)), API_MAX_LIMIT)
+    except ValueError:
+        return JsonResponse({'error': 'limit must be an integer'}, status=400)
+    if limit < 1:
+        return JsonResponse({'error': 'limit must be positive'}, status=400)
+
+    filterset = JobFilter(request.GET, queryset=JobPost.objects.filter(is_active=True))
+    if not filterset.is_valid():
+        return JsonResponse({'errors': filterset.errors}, status=400)
+
+    paginator = CursorPaginator(filterset.qs, limit, ordering=filterset.get_ordering())
+    try:
+        queryset = paginator.page_queryset(request.GET.get('cursor'))
+    except InvalidCursor:
+        return JsonResponse({'error': 'Invalid cursor'}, status=400)
+
+    # The cursor needs the ordering columns even when they aren't requested.
+    key_names = [name for name, _ in paginator.keys]
+    columns = list(dict.fromkeys([API_FIELDS[name] for name in fields] + key_names))
+    rows = queryset.values(*columns)[:limit + 1]
+    # The response streams after the request's database routing has ended;
+    # keep reading from the database it picked (a replica, for a GET)
+    rows = rows.using(rows.db)
+
+    def encode(row, count):
+        item = {name: row[API_FIELDS[name]] for name in fields}
+        return (',' if count else '') + json.dumps(item, cls=DjangoJSONEncoder)
+
+    def footer(last):
+        # ``last`` is the final row shown when another page exists, else None
+        next_url = None
+        if last is not None:
+            params = request.GET.copy()
+            params['cursor'] = paginator.encode(last)
+            next_url = request.build_absolute_uri('?' + params.urlencode())
+        return '], "next": %s}' % json.dumps(next_url)
+
+    def stream():
+        yield '{"results": ['
+        last, count = None, 0
+        for row in rows.iterator(chunk_size=500):
+            if count == limit:
+                break
+            yield encode(row, count)
+            last, count = row, count + 1
+        else:
+            last = None
+        yield footer(last)
+
+    async def astream():
+        # Under ASGI a sync iterator would be read into memory before sending
+        yield '{"results": ['
+        last, count = None, 0
+        async for row in rows.aiterator(chunk_size=500):
+            if count == limit:
+                break
+            yield encode(row, count)
+            last, count = row, count + 1
+        else:
+            last = None
+        yield footer(last)
+
+    content = astream() if settings.ASYNC_VIEWS else stream()
+    return StreamingHttpResponse(content, content_type='application/json')
 
 # --- SEEKER ACTIONS (This fixes your AttributeError) ---
 
@@ -38,46 +179,277 @@ def apply_to_job(request, pk):
     """Handles the application logic when a user clicks 'Apply'."""
     if not request.user.is_authenticated:
         return redirect('login')
-        
-    job = get_object_or_404(JobPost, pk=pk)
-    
+
     # Ensure only Job Seekers (Role 1) can apply
     if request.user.role != 1:
         messages.error(request, "Only job seekers can apply for jobs.")
         return redirect('job_detail', pk=pk)
 
-    # Prevent double applications
-    already_applied = Application.objects.filter(job=job, applicant=request.user).exists()
-    if already_applied:
+    # The unique constraint drops double applications, so concurrent clicks
+    # can't race a separate exists() check. The post_save tasks (counter,
+    # employer email) are queued in the same transaction as the row.
+    try:
+        with transaction.atomic():
+            Application.objects.create(job_id=pk, applicant=request.user)
+    except IntegrityError:
+        # Either the pair already exists or the job doesn't
+        get_object_or_404(JobPost.objects.only('pk'), pk=pk)
         messages.info(request, "You have already applied for this position.")
     else:
-        Application.objects.create(job=job, applicant=request.user)
         messages.success(request, "Application submitted successfully!")
-        
+
     return redirect('seeker_dashboard')
 
+def include_archived(request):
+    return request.GET.get('include_archived') == '1'
+
+def archived_applications(user):
+    return (
+        ArchivedApplication.objects.filter(applicant=user)
+        .select_related('job').order_by('-applied_at')
+    )
+
 class SeekerDashboardView(LoginRequiredMixin, ListView):
     model = Application
     template_name = 'jobs/seeker_dashboard.html'
     context_object_name = 'applications'
     def get_queryset(self):
-        return Application.objects.filter(applicant=self.request.user).order_by('-applied_at')
+        return (
+            Application.objects.filter(applicant=self.request.user)
+            .select_related('job').order_by('-applied_at')
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['recommended_jobs'] = recommend.recommended_jobs(self.request.user)
+        # Applications to archived postings, only when asked for
+        context['include_archived'] = include_archived(self.request)
+        if context['include_archived']:
+            context['archived_applications'] = archived_applications(self.request.user)
+        return context
+
+# --- Saved searches ---
+
+class SavedSearchListView(LoginRequiredMixin, ListView):
+    model = SavedSearch
+    template_name = 'jobs/saved_searches.html'
+    context_object_name = 'saved_searches'
+
+    def get_queryset(self):
+        return (
+            SavedSearch.objects.filter(user=self.request.user)
+            .annotate(unsent=Count('matches', filter=Q(matches__notified_at__isnull=True)))
+            .order_by('-created_at')
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['recent_matches'] = (
+            AlertMatch.objects.filter(saved_search__user=self.request.user, job__is_active=True)
+            .select_related('job', 'saved_search').order_by('-created_at')[:20]
+        )
+        return context
+
+@require_POST
+def save_search(request):
+    """Save the job list filters in ``query`` as an alert called ``name``."""
+    if not request.user.is_authenticated:
+        return redirect('login')
+    if request.user.role != 1:
+        messages.error(request, "Only job seekers can save searches.")
+        return redirect('job_list')
+
+    name = request.POST.get('name', '').strip()
+    query = querystring_without_cursor(QueryDict(request.POST.get('query', '')))
+    fields = alerts.criteria(QueryDict(query))
+    if not name or len(name) > 100 or len(query) > 500 or fields is None:
+        messages.error(request, "Give the search a name (up to 100 characters) and valid filters.")
+        return redirect('saved_searches')
+    if SavedSearch.objects.filter(user=request.user).count() >= settings.SAVED_SEARCH_LIMIT:
+        messages.error(request, "You can keep up to %d saved searches." % settings.SAVED_SEARCH_LIMIT)
+        return redirect('saved_searches')
+
+    SavedSearch.objects.create(user=request.user, name=name, query=query, **fields)
+    messages.success(request, "Search saved. New matching jobs will be emailed to you.")
+    return redirect('saved_searches')
+
+@require_POST
+def delete_saved_search(request, pk):
+    if not request.user.is_authenticated:
+        return redirect('login')
+    deleted, _ = SavedSearch.objects.filter(pk=pk, user=request.user).delete()
+    if not deleted:
+        raise Http404('No saved search matches the given query.')
+    messages.success(request, "Saved search deleted.")
+    return redirect('saved_searches')
 
 # --- EMPLOYER ACTIONS ---
 
 class EmployerDashboardView(LoginRequiredMixin, ListView):
     model = JobPost
     template_name = 'jobs/employer_dashboard.html'
-    context_object_name = 'jobs'
+    context_object_name = 'posted_jobs'
     def get_queryset(self):
+        # Per-row applicant counts come from the denormalized applications_count
         return JobPost.objects.filter(employer=self.request.user).order_by('-created_at')
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # All three dashboard totals in one aggregate query
+        context.update(JobPost.objects.filter(employer=self.request.user).aggregate(
+            total_jobs=Count('id'),
+            active_jobs=Count('id', filter=Q(is_active=True)),
+            total_applications=Coalesce(Sum('applications_count'), 0),
+        ))
+        context['include_archived'] = include_archived(self.request)
+        if context['include_archived']:
+            context['archived_jobs'] = (
+                ArchivedJobPost.objects.filter(employer=self.request.user).order_by('-created_at')
+            )
+        return context
+
 class JobCreateView(LoginRequiredMixin, CreateView):
     model = JobPost
     form_class = JobPostForm
-    template_name = 'jobs/job_form.html'
+    template_name = 'jobs/job_post_form.html'
     success_url = reverse_lazy('employer_dashboard')
 
     def form_valid(self, form):
         form.instance.employer = self.request.user
         return super().form_valid(form)
+
+class JobUpdateView(LoginRequiredMixin, UpdateView):
+    model = JobPost
+    form_class = JobPostForm
+    template_name = 'jobs/job_post_form.html'
+    success_url = reverse_lazy('employer_dashboard')
+
+    def get_queryset(self):
+        # Employers can only edit their own postings
+        return JobPost.objects.filter(employer=self.request.user)
+
+# --- Applicant tracking ---
+
+class ApplicantTrackingView(LoginRequiredMixin, ListView):
+    model = Application
+    template_name = 'jobs/applicant_tracking.html'
+    context_object_name = 'applications'
+    paginate_by = 50
+
+    def get_queryset(self):
+        self.job = get_object_or_404(JobPost, pk=self.kwargs['pk'], employer=self.request.user)
+        self.status = self.request.GET.get('status', '')
+        queryset = Application.objects.filter(job=self.job).select_related('applicant')
+        if self.status in dict(Application.STATUS_CHOICES):
+            queryset = queryset.filter(status=self.status)
+        else:
+            self.status = ''
+        return queryset
+
+    def paginate_queryset(self, queryset, page_size):
+        # Keyset pagination, so the last page of a posting with tens of
+        # thousands of applicants reads no more rows than the first
+        paginator = CursorPaginator(queryset, page_size, ordering=('-applied_at', '-id'))
+        try:
+            page = paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404('Invalid cursor')
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        counts = dict(
+            Application.objects.filter(job=self.job).order_by()
+            .values_list('status').annotate(n=Count('id'))
+        )
+        context.update(
+            job=self.job,
+            status=self.status,
+            status_counts=[(value, label, counts.get(value, 0)) for value, label in Application.STATUS_CHOICES],
+            total_count=sum(counts.values()),
+            transitions=[(action, label) for action, (label, _, _) in tracking.TRANSITIONS.items()],
+            querystring=querystring_without_cursor(self.request.GET),
+        )
+        return context
+
+@require_POST
+def application_bulk_status(request, pk):
+    """
+    Apply a tracking action to the ticked applications, or with scope=all to
+    every application of the posting in ``status``.
+    """
+    if not request.user.is_authenticated:
+        return redirect('login')
+    job = get_object_or_404(JobPost, pk=pk, employer=request.user)
+    action = request.POST.get('action')
+    status = request.POST.get('status', '')
+    tracking_url = reverse('applicant_tracking', kwargs={'pk': job.pk})
+    if status in dict(Application.STATUS_CHOICES):
+        tracking_url += '?status=' + status
+    else:
+        status = None
+
+    if action not in tracking.TRANSITIONS:
+        messages.error(request, "Choose what to do with the selected applications.")
+        return redirect(tracking_url)
+    if request.POST.get('scope') == 'all':
+        changed = tracking.transition(job, action, status=status)
+    else:
+        ids = [int(value) for value in request.POST.getlist('applications') if value.isdecimal()]
+        if not ids:
+            messages.error(request, "Select at least one application.")
+            return redirect(tracking_url)
+        changed = tracking.transition(job, action, application_ids=ids)
+    messages.success(request, "%d application%s updated." % (changed, '' if changed == 1 else 's'))
+    return redirect(tracking_url)
+
+@require_POST
+def job_toggle_active(request, pk):
+    if not request.user.is_authenticated:
+        return redirect('login')
+    job = get_object_or_404(JobPost, pk=pk, employer=request.user)
+    job.is_active = not job.is_active
+    # Through save() so the signals update facets, vectors, caches and alerts
+    job.save(update_fields=['is_active', 'updated_at'])
+    messages.success(request, '"%s" is now %s.' % (job.title, 'active' if job.is_active else 'inactive'))
+    return redirect('employer_dashboard')
+
+# --- Bulk import / export ---
+
+@require_POST
+def job_import(request):
+    """Upload a CSV/JSONL file of postings; responds with a per-row report."""
+    if not request.user.is_authenticated:
+        return redirect('login')
+    if request.user.role != 2:
+        return HttpResponseForbidden("Only employers can import jobs.")
+
+    upload = request.FILES.get('file')
+    if upload is None:
+        return JsonResponse({'error': 'No file uploaded'}, status=400)
+    fmt = request.POST.get('format') or upload.name.rsplit('.', 1)[-1].lower()
+    if fmt not in bulk.FORMATS:
+        return JsonResponse({'error': 'format must be one of %s' % ', '.join(bulk.FORMATS)}, status=400)
+    try:
+        batch_size = int(request.POST.get('batch_size', bulk.DEFAULT_BATCH_SIZE))
+    except ValueError:
+        return JsonResponse({'error': 'batch_size must be an integer'}, status=400)
+
+    stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+    report = bulk.import_jobs(request.user, stream, fmt, batch_size=max(1, batch_size))
+    return JsonResponse(report, status=200 if report['created'] or not report['errors'] else 400)
+
+@require_GET
+def job_export(request):
+    if not request.user.is_authenticated:
+        return redirect('login')
+    if request.user.role != 2:
+        return HttpResponseForbidden("Only employers can export jobs.")
+
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in bulk.FORMATS:
+        return JsonResponse({'error': 'format must be one of %s' % ', '.join(bulk.FORMATS)}, status=400)
+    content_type = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    response = StreamingHttpResponse(bulk.export_jobs(request.user, fmt), content_type=content_type)
+    response['Content-Disposition'] = 'attachment; filename="jobs.%s"' % fmt
+    return response
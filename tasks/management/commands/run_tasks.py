@@ -0,0 +1,62 @@
+import os
+import signal
+import socket
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from tasks.models import Task
+from tasks.queue import run_pending
+
+
+class Command(BaseCommand):
+    help = (
+        'Run queued background tasks (notifications, counters, denormalized '
+        'copies). Loops until stopped; --once drains the queue and exits.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit once nothing is due.')
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='Tasks claimed per round; batch handlers get up to this many payloads.')
+        parser.add_argument('--sleep', type=float, default=1.0,
+                            help='Seconds to wait when the queue is empty.')
+        parser.add_argument('--purge-failed', action='store_true',
+                            help='Delete tasks that ran out of retries, then exit.')
+
+    def handle(self, *args, **options):
+        if options['purge_failed']:
+            deleted, _ = Task.objects.filter(status=Task.FAILED).delete()
+            self.stdout.write('Deleted %d failed tasks' % deleted)
+            return
+
+        if isinstance(caches['default'], LocMemCache):
+            # Handlers bump page cache versions, which in a process-local cache
+            # only this process sees. Everything else they do is in the DB.
+            self.stderr.write(
+                'The cache is LocMem, so cached pages will not see task changes '
+                'until PAGE_CACHE_TTL expires; set CACHE_BACKEND and CACHE_LOCATION '
+                '(file-based or redis) to share it with the web processes.'
+            )
+
+        worker = '%s:%d' % (socket.gethostname(), os.getpid())
+        stopping = []
+        # Finish the current round on SIGTERM (e.g. a deploy), then exit
+        signal.signal(signal.SIGTERM, lambda *args: stopping.append(True))
+
+        total_ok = total_failed = 0
+        while not stopping:
+            close_old_connections()
+            succeeded, failed = run_pending(limit=options['batch_size'], worker=worker)
+            total_ok += succeeded
+            total_failed += failed
+            if succeeded or failed:
+                self.stdout.write('%d done, %d failed' % (succeeded, failed))
+                continue
+            if options['once']:
+                break
+            time.sleep(options['sleep'])
+        self.stdout.write('Stopped after %d tasks (%d failed)' % (total_ok + total_failed, total_failed))
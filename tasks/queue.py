@@ -0,0 +1,234 @@
+# File: job_board_project_final/tasks/queue.py
+#
+# A small task queue stored in the database, so side effects of a request
+# (emails, counters, denormalized copies) run in a worker process instead of
+# the request, without a broker.
+#
+#   @task('jobs.notify_employer')            register a handler in <app>/tasks.py
+#   enqueue('jobs.notify_employer', {...})    queue a call (JSON payload)
+#   enqueue_many([(name, payload), ...])      several calls, one INSERT
+#   enqueue_on_commit(name, {...})            queue it once the transaction commits
+#   run_pending()                             run what is due; run_tasks loops on it
+#
+# enqueue() writes the row inside the caller's transaction (an outbox): a
+# worker sees the task exactly when the change that caused it commits, and a
+# rollback takes it away again. That is what an on_commit hook would give,
+# minus the window where the process dies after COMMIT but before the hook
+# ran, so the signal handlers use it. enqueue_on_commit() is the hook version,
+# for callers whose transaction is on another database than the queue's.
+#
+# Handlers registered with batch=True receive a list of payloads, so a burst
+# of same-type tasks (e.g. counter deltas) is applied in one go. Failures
+# are retried with exponential backoff and left as 'failed' rows after
+# max_attempts. Successful rows are deleted in the same transaction as the
+# handler's own writes (unless it is registered with atomic=False).
+#
+# While a worker runs the tasks it claimed, a heartbeat thread refreshes
+# their locked_at every TASKS_LOCK_TIMEOUT / 3 seconds. A claim older than
+# TASKS_LOCK_TIMEOUT therefore means the worker died, however long a task
+# takes.
+
+import logging
+import random
+import threading
+import traceback
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import DatabaseError, connections, router, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+# name -> Handler
+registry = {}
+
+
+class Handler:
+    def __init__(self, name, func, batch, max_attempts, atomic):
+        self.name = name
+        self.func = func
+        self.batch = batch
+        self.max_attempts = max_attempts
+        self.atomic = atomic
+
+    def __call__(self, payloads):
+        if self.batch:
+            self.func(payloads)
+        else:
+            for payload in payloads:
+                self.func(**payload)
+
+
+def task(name, batch=False, max_attempts=None, atomic=True):
+    """
+    Register the decorated function as handler ``name``. Plain handlers are
+    called with the payload as keyword arguments; batch handlers with a list
+    of payloads. Long-running handlers that commit their own work in steps
+    pass atomic=False to run outside the task's transaction.
+    """
+    def register(func):
+        if name in registry:
+            raise ValueError('Task %r is already registered' % name)
+        registry[name] = Handler(
+            name, func, batch, max_attempts or settings.TASKS_MAX_ATTEMPTS, atomic,
+        )
+        return func
+    return register
+
+
+def enqueue(name, payload=None, delay=None):
+    """Queue a call of handler ``name``; ``delay`` (seconds) postpones it."""
+    return enqueue_many([(name, payload)], delay=delay)[0]
+
+
+def enqueue_many(calls, delay=None):
+    """Queue several ``(name, payload)`` calls with a single INSERT."""
+    run_after = timezone.now()
+    if delay:
+        run_after += timedelta(seconds=delay)
+    tasks = []
+    for name, payload in calls:
+        if name not in registry:
+            raise KeyError('No task registered as %r' % name)
+        tasks.append(Task(name=name, payload=payload or {}, run_after=run_after))
+    return Task.objects.bulk_create(tasks)
+
+
+def enqueue_on_commit(name, payload=None, delay=None, using=None):
+    """Like enqueue(), but only once the transaction on ``using`` commits."""
+    if name not in registry:
+        raise KeyError('No task registered as %r' % name)
+    transaction.on_commit(partial(enqueue, name, payload, delay), using=using)
+
+
+def backoff(attempts):
+    """Seconds to wait before retry number ``attempts``, with jitter."""
+    delay = min(settings.TASKS_BACKOFF_MAX_SECONDS, settings.TASKS_BACKOFF_SECONDS * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _claim(limit, token):
+    """Mark up to ``limit`` due tasks as ours and return them, oldest first."""
+    using = router.db_for_write(Task)
+    now = timezone.now()
+    # Running rows whose worker stopped updating them are picked up again
+    due = (
+        Q(status=Task.PENDING, run_after__lte=now)
+        | Q(status=Task.RUNNING, locked_at__lt=now - timedelta(seconds=settings.TASKS_LOCK_TIMEOUT))
+    )
+    tasks = Task.objects.using(using)
+    with transaction.atomic(using=using):
+        candidates = tasks.filter(due).order_by('run_after', 'pk')
+        if connections[using].features.has_select_for_update_skip_locked:
+            ids = list(candidates.select_for_update(skip_locked=True).values_list('pk', flat=True)[:limit])
+        else:
+            # One UPDATE ... WHERE pk IN (SELECT ...) statement; SQLite
+            # serializes writers, so two workers can't claim the same row.
+            ids = candidates.values('pk')[:limit]
+        tasks.filter(due, pk__in=ids).update(
+            status=Task.RUNNING, locked_by=token, locked_at=now, attempts=F('attempts') + 1,
+        )
+    return list(tasks.filter(status=Task.RUNNING, locked_by=token).order_by('run_after', 'pk'))
+
+
+@contextmanager
+def _heartbeat(token):
+    """Keep the claims of worker ``token`` fresh while the block runs."""
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(settings.TASKS_LOCK_TIMEOUT / 3):
+                try:
+                    Task.objects.filter(status=Task.RUNNING, locked_by=token).update(locked_at=timezone.now())
+                except DatabaseError:
+                    # e.g. SQLite's write lock is held by the task; try next beat
+                    logger.warning('Heartbeat for %s failed', token, exc_info=True)
+        finally:
+            connections.close_all()
+
+    thread = threading.Thread(target=beat, name='tasks-heartbeat', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _fail(task, error):
+    handler = registry.get(task.name)
+    max_attempts = handler.max_attempts if handler else 1
+    task.last_error = error
+    task.locked_by, task.locked_at = '', None
+    if task.attempts >= max_attempts:
+        task.status = Task.FAILED
+        logger.error('Task %s failed for good after %d attempts', task, task.attempts)
+    else:
+        task.status = Task.PENDING
+        task.run_after = timezone.now() + timedelta(seconds=backoff(task.attempts))
+    task.save(update_fields=['status', 'run_after', 'last_error', 'locked_by', 'locked_at'])
+
+
+def _run(handler, group):
+    """Run ``group`` (tasks of one handler); False if the handler raised."""
+    try:
+        with transaction.atomic() if handler.atomic else nullcontext():
+            handler([task.payload for task in group])
+            Task.objects.filter(pk__in=[task.pk for task in group]).delete()
+    except Exception:
+        if len(group) == 1:
+            _fail(group[0], traceback.format_exc())
+        return False
+    return True
+
+
+def run_pending(limit=100, worker='worker'):
+    """
+    Run up to ``limit`` due tasks, grouping batch handlers' tasks into one
+    call. Returns ``(succeeded, failed)``.
+    """
+    token = '%s:%s' % (worker, uuid.uuid4().hex[:12])
+    claimed = _claim(limit, token)
+    if not claimed:
+        return 0, 0
+    with _heartbeat(token):
+        return _run_claimed(claimed)
+
+
+def _run_claimed(claimed):
+    groups = OrderedDict()
+    for task in claimed:
+        groups.setdefault(task.name, []).append(task)
+
+    succeeded = failed = 0
+    for name, group in groups.items():
+        handler = registry.get(name)
+        if handler is None:
+            for task in group:
+                _fail(task, 'No task registered as %r' % name)
+            failed += len(group)
+            continue
+        batches = [group] if handler.batch else [[task] for task in group]
+        for batch in batches:
+            if _run(handler, batch):
+                succeeded += len(batch)
+                continue
+            if len(batch) == 1:
+                failed += 1
+                continue
+            # One bad payload shouldn't hold back the rest: retry one by one
+            for task in batch:
+                if _run(handler, [task]):
+                    succeeded += 1
+                else:
+                    failed += 1
+    return succeeded, failed
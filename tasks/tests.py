@@ -0,0 +1,124 @@
+import io
+import time
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .models import Task
+from .queue import enqueue, enqueue_many, enqueue_on_commit, run_pending, task
+
+calls = []
+
+
+@task('tests.record', batch=True)
+def record(payloads):
+    if any(payload.get('fail') for payload in payloads):
+        raise ValueError('bad payload')
+    calls.append(sorted(payload['n'] for payload in payloads))
+
+
+@task('tests.plain', max_attempts=2)
+def plain(n):
+    if n < 0:
+        raise ValueError('negative')
+    calls.append(n)
+
+
+@task('tests.slow', atomic=False)
+def slow():
+    # What a second worker would see while this runs
+    calls.append(Task.objects.get().locked_at)
+    time.sleep(0.5)
+    calls.append(Task.objects.get().locked_at)
+
+
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_batches_same_type_tasks(self):
+        enqueue_many([('tests.record', {'n': n}) for n in range(3)] + [('tests.plain', {'n': 7})])
+        self.assertEqual(run_pending(), (4, 0))
+        self.assertEqual(calls, [[0, 1, 2], 7])
+        self.assertFalse(Task.objects.exists())
+
+    def test_bad_payload_only_fails_itself(self):
+        enqueue_many([('tests.record', {'n': 1}), ('tests.record', {'n': 2, 'fail': True})])
+        self.assertEqual(run_pending(), (1, 1))
+        self.assertEqual(calls, [[1]])
+        failed = Task.objects.get()
+        self.assertEqual((failed.status, failed.attempts), (Task.PENDING, 1))
+        self.assertIn('bad payload', failed.last_error)
+
+    @override_settings(TASKS_BACKOFF_SECONDS=60)
+    def test_retries_with_backoff_then_gives_up(self):
+        enqueue('tests.plain', {'n': -1})
+        self.assertEqual(run_pending(), (0, 1))
+        retry = Task.objects.get()
+        self.assertGreaterEqual(retry.run_after, timezone.now() + timedelta(seconds=25))
+        # Not due yet
+        self.assertEqual(run_pending(), (0, 0))
+
+        Task.objects.update(run_after=timezone.now())
+        self.assertEqual(run_pending(), (0, 1))
+        self.assertEqual(Task.objects.get().status, Task.FAILED)
+        self.assertEqual(run_pending(), (0, 0))
+
+    def test_delay_and_stale_claims(self):
+        enqueue('tests.plain', {'n': 1}, delay=60)
+        self.assertEqual(run_pending(), (0, 0))
+        # Claimed by a worker that died long ago
+        Task.objects.update(
+            status=Task.RUNNING, locked_by='gone', run_after=timezone.now(),
+            locked_at=timezone.now() - timedelta(hours=1),
+        )
+        self.assertEqual(run_pending(), (1, 0))
+        self.assertEqual(calls, [1])
+
+    def test_unknown_names_are_rejected(self):
+        with self.assertRaises(KeyError):
+            enqueue('tests.missing')
+        with self.assertRaises(KeyError):
+            enqueue_on_commit('tests.missing')
+
+    def test_enqueue_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                enqueue_on_commit('tests.plain', {'n': 4})
+                self.assertFalse(Task.objects.exists())
+        self.assertEqual(run_pending(), (1, 0))
+        self.assertEqual(calls, [4])
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+class RunTasksCommandTests(TransactionTestCase):
+    # The command closes stale connections between rounds, like a request
+    # would, which a TestCase transaction can't survive.
+    def setUp(self):
+        calls.clear()
+
+    def test_drains_queue_once(self):
+        enqueue('tests.plain', {'n': 3})
+        out = io.StringIO()
+        call_command('run_tasks', once=True, stdout=out)
+        self.assertIn('Stopped after 1 tasks (0 failed)', out.getvalue())
+        self.assertEqual(calls, [3])
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_runs_on_a_local_cache(self):
+        enqueue('tests.plain', {'n': 5})
+        err = io.StringIO()
+        call_command('run_tasks', once=True, stdout=io.StringIO(), stderr=err)
+        self.assertIn('The cache is LocMem', err.getvalue())
+        self.assertEqual(calls, [5])
+
+    @override_settings(TASKS_LOCK_TIMEOUT=0.3)
+    def test_heartbeat_keeps_long_tasks_claimed(self):
+        enqueue('tests.slow')
+        self.assertEqual(run_pending(), (1, 0))
+        claimed_at, still_claimed_at = calls
+        self.assertGreater(still_claimed_at, claimed_at)
+        self.assertGreater(still_claimed_at, timezone.now() - timedelta(seconds=0.3))
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        from .backends import evict_user
+        from .models import User
+        # Creation too: a reused primary key must not find an old entry
+        post_save.connect(evict_user, sender=User, dispatch_uid='users.evict_user')
+        post_delete.connect(evict_user, sender=User, dispatch_uid='users.evict_user')
@@ -0,0 +1,81 @@
+# File: job_board_project_final/users/backends.py
+#
+# Authentication backend that keeps recently seen users in a per-process
+# LRU cache, so AuthenticationMiddleware doesn't SELECT users_user on every
+# logged-in request.
+#
+# Every lookup gets a fresh User instance built from the cached column
+# values, so nothing a view sets on request.user leaks into another request.
+# Saves and deletes of a User evict it in this process (see apps.py); other
+# processes see the change within AUTH_USER_CACHE_TTL seconds, which also
+# bounds how long a password change or deactivation takes to log out
+# sessions served by other workers.
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+
+class UserCache:
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, pk):
+        with self._lock:
+            entry = self._entries.get(pk)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[pk]
+                return None
+            self._entries.move_to_end(pk)
+            return entry[1]
+
+    def set(self, pk, value):
+        with self._lock:
+            self._entries[pk] = (time.monotonic() + settings.AUTH_USER_CACHE_TTL, value)
+            self._entries.move_to_end(pk)
+            while len(self._entries) > settings.AUTH_USER_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def discard(self, pk):
+        with self._lock:
+            self._entries.pop(pk, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+user_cache = UserCache()
+
+
+def evict_user(sender, instance, **kwargs):
+    user_cache.discard(instance.pk)
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend whose get_user() is served from ``user_cache``."""
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        cached = user_cache.get(user_id)
+        if cached is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                values = [getattr(user, field.attname) for field in UserModel._meta.concrete_fields]
+                user_cache.set(user_id, (user._state.db, values))
+            return user
+
+        db, values = cached
+        names = [field.attname for field in UserModel._meta.concrete_fields]
+        user = UserModel.from_db(db, names, values)
+        return user if self.user_can_authenticate(user) else None
@@ -1,3 +1,87 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
-# Create your tests here.
+from .backends import CachedModelBackend, UserCache, user_cache
+from .models import User
+
+
+class CachedAuthTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('sam', password='x', email='sam@example.com')
+
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.client.force_login(self.user)
+
+    def auth_queries(self, path):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return [q['sql'] for q in queries if 'django_session' in q['sql'] or 'FROM "users_user"' in q['sql']]
+
+    def test_steady_state_needs_no_auth_queries(self):
+        for name in ('profile', 'seeker_dashboard'):
+            path = reverse(name)
+            self.auth_queries(path)
+            self.assertEqual(self.auth_queries(path), [], name)
+
+    def test_profile_makes_no_queries_at_all(self):
+        path = reverse('profile')
+        self.client.get(path)
+        with self.assertNumQueries(0):
+            self.client.get(path)
+
+    def test_saves_are_seen_immediately(self):
+        path = reverse('profile')
+        self.client.get(path)
+        self.user.email = 'new@example.com'
+        self.user.save()
+        self.assertContains(self.client.get(path), 'new@example.com')
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(path).status_code, 302)
+
+    def test_each_lookup_is_a_fresh_instance(self):
+        backend = CachedModelBackend()
+        first = backend.get_user(self.user.pk)
+        first.username = 'changed'
+        second = backend.get_user(self.user.pk)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.username, 'sam')
+        self.assertFalse(second._state.adding)
+
+
+class UserCacheTests(TestCase):
+    @override_settings(AUTH_USER_CACHE_SIZE=2)
+    def test_least_recently_used_is_dropped(self):
+        entries = UserCache()
+        entries.set(1, 'a')
+        entries.set(2, 'b')
+        entries.get(1)
+        entries.set(3, 'c')
+        self.assertEqual((entries.get(1), entries.get(2), entries.get(3)), ('a', None, 'c'))
+
+    @override_settings(AUTH_USER_CACHE_TTL=-1)
+    def test_entries_expire(self):
+        entries = UserCache()
+        entries.set(1, 'a')
+        self.assertIsNone(entries.get(1))
+        self.assertEqual(len(entries), 0)
+
+
+class SignUpTests(TestCase):
+    def test_employer_signup(self):
+        response = self.client.get(reverse('employer_signup'))
+        self.assertEqual(response.context['form']['role'].value(), User.IS_EMPLOYER)
+        response = self.client.post(reverse('employer_signup'), {
+            'username': 'acme', 'password1': 'a-long-Passw0rd', 'password2': 'a-long-Passw0rd',
+            'role': User.IS_EMPLOYER, 'email': 'hr@acme.test', 'company_name': 'Acme',
+        })
+        self.assertRedirects(response, reverse('login'))
+        self.assertEqual(User.objects.get(username='acme').role, User.IS_EMPLOYER)
@@ -10,5 +10,9 @@ class JobSeekerSignUpView(CreateView):
     template_name = 'users/seeker_signup.html'
     success_url = reverse_lazy('login')
 
+class EmployerSignUpView(JobSeekerSignUpView):
+    template_name = 'users/employer_signup.html'
+    initial = {'role': User.IS_EMPLOYER}
+
 class ProfileView(LoginRequiredMixin, TemplateView):
     template_name = 'users/profile.html'